@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+近似最近邻索引 - 基于 NumPy 的倒排文件索引 (IVF-Flat)
+用球面 k-means 把嵌入划分为 nlist 个簇，查询时只扫描与查询最接近的 nprobe 个簇，
+nprobe 越大召回率越高、延迟越大；索引与嵌入缓存放在一起，持久化到磁盘
+"""
+
+import json
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+# 索引文件（位于嵌入缓存的模型子目录中）
+INDEX_DIRNAME = 'ivf'
+DEFAULT_NPROBE = 8
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    分数最高的前k个下标，按分数降序（同分按下标升序）
+
+    先用 argpartition 在 O(n) 内选出候选，只对这k个排序。近似搜索与 paper_filter 的精确排序共用此函数，
+    同分论文的顺序因此一致。
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+def spherical_kmeans(vectors: np.ndarray, nlist: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """
+    球面 k-means：向量和质心都已 L2 归一化，按内积分配
+
+    Args:
+        vectors: (n, dim) 归一化向量
+        nlist: 簇数
+        iterations: 迭代次数
+        seed: 随机种子
+
+    Returns:
+        (nlist, dim) 归一化质心
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        counts = np.bincount(assign, minlength=nlist)
+        # 按簇排序后分段求和，比 np.add.at 快得多
+        order = np.argsort(assign, kind='stable')
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums = np.zeros_like(centroids)
+        sums[counts > 0] = np.add.reduceat(vectors[order], starts[counts > 0], axis=0)
+        # 空簇重新随机取一个点作为质心
+        empty = counts == 0
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = sums / np.where(norms > 0, norms, 1.0)
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """
+    IVF-Flat 索引
+
+    向量按所属簇重新排列并连续存储，每个簇对应 [offsets[c], offsets[c + 1]) 一段，
+    ids 记录重排后每一行在原嵌入矩阵中的行号。只覆盖建索引时的前 n_rows 行，
+    之后追加到嵌入缓存的行在查询时精确扫描。
+    """
+
+    def __init__(self, centroids: np.ndarray, offsets: np.ndarray, ids: np.ndarray, vectors: np.ndarray):
+        self.centroids = centroids
+        self.offsets = offsets
+        self.ids = ids
+        self.vectors = vectors
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, matrix: np.ndarray, nlist: Optional[int] = None, iterations: int = 10,
+              sample: Optional[int] = None, seed: int = 0) -> 'IVFIndex':
+        """
+        在嵌入矩阵上建索引
+
+        Args:
+            matrix: (n, dim) 归一化嵌入
+            nlist: 簇数，默认约为 4 * sqrt(n)
+            iterations: k-means 迭代次数
+            sample: 训练质心时最多使用的样本数，默认每个簇 64 个
+            seed: 随机种子
+
+        Returns:
+            IVFIndex 对象
+        """
+        matrix = np.asarray(matrix, dtype=np.float32)
+        n = len(matrix)
+        if n == 0:
+            raise ValueError("嵌入矩阵为空，无法建立索引")
+        nlist = max(1, min(nlist or int(4 * np.sqrt(n)), n))
+
+        rng = np.random.default_rng(seed)
+        train = matrix[np.sort(rng.choice(n, min(n, sample or 64 * nlist), replace=False))]
+        centroids = spherical_kmeans(train, nlist, iterations, seed)
+
+        # 分块分配，避免一次性生成 n x nlist 的大矩阵
+        assign = np.concatenate([np.argmax(matrix[start:start + 65536] @ centroids.T, axis=1)
+                                 for start in range(0, n, 65536)])
+        ids = np.argsort(assign, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=nlist))])
+        return cls(centroids, offsets.astype(np.int64), ids.astype(np.int64), matrix[ids])
+
+    def search(self, query: np.ndarray, k: int, nprobe: int = DEFAULT_NPROBE,
+               matrix: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        查询与 query 内积最大的 k 个向量
+
+        Args:
+            query: (dim,) 归一化查询向量
+            k: 返回数量
+            nprobe: 扫描的簇数，等于 nlist 时为精确搜索
+            matrix: 完整嵌入矩阵；提供时其中第 n_rows 行之后（建索引后新增）的行也会被精确扫描
+
+        Returns:
+            (分数数组, 原矩阵行号数组)，按分数降序
+        """
+        query = np.asarray(query, dtype=np.float32)
+        probe = top_k_indices(self.centroids @ query, nprobe)
+        # 每个簇在 vectors 中是连续的一段，按段读取
+        segments = [(self.offsets[c], self.offsets[c + 1]) for c in probe]
+        scores = np.concatenate([np.zeros(0, dtype=np.float32)] +
+                                [self.vectors[start:end] @ query for start, end in segments])
+        rows = np.concatenate([np.zeros(0, dtype=np.int64)] + [self.ids[start:end] for start, end in segments])
+        if matrix is not None and len(matrix) > self.n_rows:
+            tail = np.asarray(matrix[self.n_rows:])
+            scores = np.concatenate([scores, tail @ query])
+            rows = np.concatenate([rows, np.arange(self.n_rows, len(matrix))])
+
+        # 按行号排列候选，同分时与精确搜索一样按行号升序
+        order = np.argsort(rows, kind='stable')
+        scores, rows = scores[order], rows[order]
+        best = top_k_indices(scores, k)
+        return scores[best], rows[best]
+
+    def save(self, path: str):
+        """保存到目录 path（meta.json 最后写入，写入中途失败时旧索引视为不存在）"""
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, 'meta.json')
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        np.save(os.path.join(path, 'centroids.npy'), self.centroids)
+        np.save(os.path.join(path, 'offsets.npy'), self.offsets)
+        np.save(os.path.join(path, 'ids.npy'), self.ids)
+        np.save(os.path.join(path, 'vectors.npy'), self.vectors)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'nlist': self.nlist, 'n_rows': self.n_rows}, f)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['IVFIndex']:
+        """从目录 path 加载（向量以内存映射方式打开），不存在时返回 None"""
+        if not os.path.exists(os.path.join(path, 'meta.json')):
+            return None
+        return cls(np.load(os.path.join(path, 'centroids.npy')),
+                   np.load(os.path.join(path, 'offsets.npy')),
+                   np.load(os.path.join(path, 'ids.npy')),
+                   np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r'))
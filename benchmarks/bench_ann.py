@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+近似最近邻索引基准测试
+在合成的聚簇嵌入（或已有的嵌入缓存）上比较 IVF 索引与精确搜索的 recall@k 和查询延迟，
+扫描不同的 nprobe 以观察召回率与延迟的权衡
+
+用法: python benchmarks/bench_ann.py [--papers 100000] [--dim 384] [--nprobe 1 4 8 16 32]
+      python benchmarks/bench_ann.py --cache-dir .embedding_cache
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ann_index import IVFIndex  # noqa: E402
+from embedding_store import EmbeddingStore, normalize_rows  # noqa: E402
+
+
+def add_noise(vectors: np.ndarray, scale: float, rng) -> np.ndarray:
+    """加上范数约为 scale 的高斯噪声后重新归一化"""
+    noise = rng.standard_normal(vectors.shape).astype(np.float32) * (scale / np.sqrt(vectors.shape[1]))
+    return normalize_rows(vectors + noise)
+
+
+def synthetic_embeddings(n: int, dim: int, topics: int = 500, spread: float = 0.8, seed: int = 0) -> np.ndarray:
+    """围绕若干“主题”中心生成的归一化向量，模拟论文摘要嵌入的聚簇结构"""
+    rng = np.random.default_rng(seed)
+    centers = normalize_rows(rng.standard_normal((topics, dim)))
+    return add_noise(centers[rng.integers(0, topics, n)], spread, rng)
+
+
+def exact_search(matrix: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    scores = matrix @ query
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较 IVF 近似搜索与精确搜索")
+    parser.add_argument('--papers', type=int, default=100_000, help="合成嵌入数量")
+    parser.add_argument('--dim', type=int, default=384, help="合成嵌入维度")
+    parser.add_argument('--cache-dir', default=None, help="改用已有嵌入缓存目录中的嵌入")
+    parser.add_argument('--model', default='paraphrase-MiniLM-L6-v2', help="嵌入缓存对应的模型名")
+    parser.add_argument('--nlist', type=int, default=None)
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 4, 8, 16, 32, 64])
+    parser.add_argument('--spread', type=float, default=1.2, help="合成嵌入围绕主题中心的噪声范数，越大越难")
+    parser.add_argument('--query-noise', type=float, default=1.0, help="查询相对语料向量的噪声范数")
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.cache_dir:
+        matrix = np.asarray(EmbeddingStore(args.cache_dir, args.model).matrix)
+    else:
+        matrix = synthetic_embeddings(args.papers, args.dim, spread=args.spread)
+    print(f"嵌入: {matrix.shape[0]} x {matrix.shape[1]}")
+
+    # 查询取语料中向量加噪声，模拟与部分论文相近的研究兴趣
+    rng = np.random.default_rng(1)
+    picks = rng.integers(0, len(matrix), args.queries)
+    queries = add_noise(matrix[picks], args.query_noise, rng)
+
+    start = time.perf_counter()
+    index = IVFIndex.build(matrix, args.nlist)
+    print(f"建索引: {time.perf_counter() - start:.2f} 秒, {index.nlist} 个簇")
+
+    latencies, truth = [], []
+    for query in queries:
+        start = time.perf_counter()
+        truth.append(set(exact_search(matrix, query, args.k).tolist()))
+        latencies.append(time.perf_counter() - start)
+    exact_ms = statistics.median(latencies) * 1000
+    print(f"{'精确搜索':<14} recall@{args.k} 1.000   p50 {exact_ms:7.2f} ms")
+
+    for nprobe in args.nprobe:
+        latencies, hits = [], 0
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            _, rows = index.search(query, args.k, nprobe)
+            latencies.append(time.perf_counter() - start)
+            hits += len(expected & set(rows.tolist()))
+        p50 = statistics.median(latencies) * 1000
+        print(f"nprobe={nprobe:<7} recall@{args.k} {hits / (args.k * len(queries)):.3f}   "
+              f"p50 {p50:7.2f} ms   加速 {exact_ms / p50:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
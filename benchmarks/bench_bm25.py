@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+BM25 倒排索引基准测试
+把真实摘要的句子随机重组成大规模合成语料，测量建索引、加载和单条查询的耗时，
+并与逐文档计算 BM25 的朴素实现对比（同时校验两者分数一致）
+
+用法: python benchmarks/bench_bm25.py [--papers 100000]
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bm25_index import BM25_B, BM25_K1, TITLE_BOOST, BM25Index, extract_terms  # noqa: E402
+
+PAPERS_FILE = os.path.join(ROOT, 'ndss_papers_2025.json')
+QUERIES = [
+    "zero-knowledge proofs, chameleon hash functions, public key cryptography",
+    "fuzzing network protocol implementations",
+    "side channel attacks on trusted execution environments",
+    "large language model jailbreak",
+]
+
+
+def synthetic_corpus(papers: int, seed: int = 0):
+    """把真实标题和摘要拆成句子后随机重组，按原篇幅生成 (标题, 摘要) 列表"""
+    with open(PAPERS_FILE, 'r', encoding='utf-8') as f:
+        source = json.load(f)
+    titles = [p.get('title', '') for p in source]
+    sentences = [s for p in source for s in p.get('abstract', '').split('. ') if s]
+    rng = np.random.default_rng(seed)
+    documents = []
+    for i in range(papers):
+        count = max(1, source[i % len(source)].get('abstract', '').count('. ') + 1)
+        picks = rng.integers(0, len(sentences), count)
+        documents.append((titles[rng.integers(0, len(titles))], '. '.join(sentences[j] for j in picks)))
+    return documents
+
+
+def naive_scores(documents, query: str) -> np.ndarray:
+    """逐文档计算 BM25（不使用倒排表）"""
+    counts = []
+    for title, abstract in documents:
+        counter = Counter()
+        for term in extract_terms(title):
+            counter[term] += TITLE_BOOST
+        for term in extract_terms(abstract):
+            counter[term] += 1.0
+        counts.append(counter)
+    lengths = np.array([sum(c.values()) for c in counts])
+    avg_length = lengths.mean()
+    scores = np.zeros(len(documents))
+    for term in set(extract_terms(query)):
+        df = sum(1 for c in counts if term in c)
+        idf = math.log(1.0 + (len(documents) - df + 0.5) / (df + 0.5))
+        for i, c in enumerate(counts):
+            tf = c.get(term, 0.0)
+            if tf:
+                scores[i] += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * lengths[i] / avg_length))
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量 BM25 倒排索引的建索引和查询耗时")
+    parser.add_argument('--papers', type=int, default=100_000, help="合成论文数量")
+    parser.add_argument('--naive-papers', type=int, default=5_000, help="朴素实现对比使用的论文数量")
+    args = parser.parse_args()
+
+    documents = synthetic_corpus(args.papers)
+    print(f"合成语料: {len(documents)} 篇")
+
+    start = time.perf_counter()
+    index = BM25Index.build(documents)
+    print(f"建索引 {time.perf_counter() - start:8.2f} s   词项 {len(index.vocabulary)}   倒排项 {len(index.doc_ids)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'corpus.bm25.npz')
+        index.save(path)
+        start = time.perf_counter()
+        index = BM25Index.load(path)
+        print(f"加载   {time.perf_counter() - start:8.2f} s   文件 {os.path.getsize(path) / 2**20:.1f} MiB")
+
+    latencies = []
+    for _ in range(10):
+        for query in QUERIES:
+            start = time.perf_counter()
+            index.scores(query)
+            latencies.append(time.perf_counter() - start)
+    print(f"查询   p50 {statistics.median(latencies) * 1000:7.2f} ms   max {max(latencies) * 1000:7.2f} ms")
+
+    subset = documents[:args.naive_papers]
+    small = BM25Index.build(subset)
+    start = time.perf_counter()
+    expected = naive_scores(subset, QUERIES[0])
+    naive_time = time.perf_counter() - start
+    start = time.perf_counter()
+    got = small.scores(QUERIES[0])
+    index_time = time.perf_counter() - start
+    print(f"{len(subset)} 篇上对比: 朴素实现 {naive_time * 1000:.1f} ms, 倒排索引 {index_time * 1000:.2f} ms, "
+          f"最大误差 {np.abs(expected - got).max():.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+级联模式基准测试
+不使用嵌入缓存（即未缓存语料的情形），比较完整流程与不同候选数的级联模式的耗时，
+以及完整流程的前k篇落在级联候选中的比例（候选召回率）和两者前k篇的重合率
+
+用法: python benchmarks/bench_cascade.py [--model paraphrase-MiniLM-L6-v2] [--candidates 25 50 100 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from paper_filter import PaperFilter  # noqa: E402
+
+PAPERS_FILE = os.path.join(ROOT, 'ndss_papers_2025.json')
+INTERESTS = [
+    "zero-knowledge proofs, chameleon hash functions, public key cryptography",
+    "fuzzing network protocol implementations",
+    "side channel attacks on trusted execution environments",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较级联模式与完整流程的耗时和召回率")
+    parser.add_argument('--model', default='paraphrase-MiniLM-L6-v2')
+    parser.add_argument('--input', default=PAPERS_FILE)
+    parser.add_argument('--candidates', type=int, nargs='+', default=[25, 50, 100, 200])
+    parser.add_argument('--top-k', type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = PaperFilter(args.model, cache_dir=None)
+    papers = baseline.load_papers_from_json(args.input)
+    baseline.model  # 预先加载模型，不计入耗时
+
+    rows = []
+    start = time.perf_counter()
+    for interest in INTERESTS:
+        baseline.filter_and_rank(interest, papers, top_k=args.top_k)
+    rows.append(('完整流程', len(papers), time.perf_counter() - start, 1.0, 1.0))
+
+    for size in args.candidates:
+        cascade = PaperFilter(args.model, cache_dir=None, cascade=size)
+        cascade._model = baseline.model
+        cascade.corpus_file = baseline.corpus_file
+        start = time.perf_counter()
+        for interest in INTERESTS:
+            cascade.filter_and_rank(interest, papers, top_k=args.top_k)
+        elapsed = time.perf_counter() - start
+
+        recall, overlap, candidates = [], [], []
+        for interest in INTERESTS:
+            stats = cascade.evaluate_cascade([interest], papers, args.top_k)
+            recall.append(stats['candidate_recall'])
+            overlap.append(stats['top_k_overlap'])
+            candidates.append(stats['candidates'])
+        rows.append((f'级联 {size}', sum(candidates) / len(candidates), elapsed,
+                     sum(recall) / len(recall), sum(overlap) / len(overlap)))
+
+    print(f"\n{len(papers)} 篇论文, {len(INTERESTS)} 个研究兴趣, 前{args.top_k}篇, 不使用嵌入缓存")
+    for name, candidates, elapsed, recall, overlap in rows:
+        print(f"{name:<10} 语义打分 {candidates:7.0f} 篇   耗时 {elapsed:7.2f} s   "
+              f"候选召回率 {recall:.3f}   前{args.top_k}重合 {overlap:.3f}")
+
+
+if __name__ == '__main__':
+    main()
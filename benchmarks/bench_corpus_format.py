@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+二进制语料格式基准测试
+生成大规模合成语料（带分数字段的 JSON 数组）并转换为 .ndssbin，在各自全新的子进程中比较
+json.load 与内存映射打开在几种典型访问下的耗时和峰值内存：只打开、随机读取一篇、
+查看器只读标题和链接、筛选器构造 PaperTable 并遍历全部摘要
+
+文件刚写出，两种格式都在页缓存中，比较的是解析与解码的开销而不是磁盘读取；
+内存映射读到的文件页也计入常驻内存
+用法: python benchmarks/bench_corpus_format.py [--papers 100000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PAPERS_FILE = os.path.join(ROOT, 'ndss_papers_2025.json')
+
+TASKS = {
+    'open': '只打开',
+    'random': '随机读取 1 篇',
+    'viewer': '标题和链接',
+    'table': 'PaperTable + 全部摘要',
+}
+
+
+def write_corpus(directory: str, papers: int) -> str:
+    """写出带分数字段的合成 JSON 语料（与筛选结果的格式相同）"""
+    with open(PAPERS_FILE, 'r', encoding='utf-8') as f:
+        source = json.load(f)
+    path = os.path.join(directory, 'corpus.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[\n')
+        for i in range(papers):
+            paper = dict(source[i % len(source)])
+            paper['title'] = f"{paper.get('title', '')} #{i}"
+            paper['url'] = f"{paper.get('url', '')}?v={i}"
+            paper['similarity_score'] = (i * 7919 % 1000) / 1000
+            paper['rule_score'] = (i * 104729 % 1000) / 100
+            paper['final_score'] = (i % 997) / 997
+            f.write(('    ' if i == 0 else ',\n    ') + json.dumps(paper, ensure_ascii=False))
+        f.write('\n]\n')
+    return path
+
+
+def memory_kib(field: str) -> int:
+    """/proc/self/status 中的 VmRSS（当前常驻内存）或 VmHWM（峰值），单位 KiB
+
+    ru_maxrss 会跨 fork + exec 继承父进程（转换语料时）的峰值，这里改用 VmHWM，并在计时前清零。
+    """
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    return 0
+
+
+def reset_peak():
+    """把 VmHWM 重置为当前常驻内存（Linux 4.0+）"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def run_task(fmt: str, task: str, path: str) -> dict:
+    """在当前进程中完成一次访问（由子进程调用）"""
+    from corpus_binary import open_corpus
+    from paper_table import PaperTable
+
+    reset_peak()
+    baseline = memory_kib('VmRSS')
+    start = time.perf_counter()
+    if fmt == 'json':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if task == 'random':
+            result = data[len(data) // 2]['title']
+        elif task == 'viewer':
+            result = [(paper['title'], paper['url']) for paper in data]
+        elif task == 'table':
+            table = PaperTable.from_records(data)
+            result = sum(len(abstract) for abstract in table.columns['abstract'])
+        papers = len(data)
+    else:
+        corpus = open_corpus(path)
+        if task == 'random':
+            result = corpus.column('title')[len(corpus) // 2]
+        elif task == 'viewer':
+            result = list(corpus.iter_records(('title', 'url')))
+        elif task == 'table':
+            table = corpus.table()
+            result = sum(len(abstract) for abstract in table.columns['abstract'])
+        papers = len(corpus)
+    elapsed = time.perf_counter() - start
+    peak = memory_kib('VmHWM') - baseline
+    return {'papers': papers, 'seconds': elapsed, 'peak_mib': peak / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较 json.load 与二进制语料的加载耗时和峰值内存")
+    parser.add_argument('--papers', type=int, default=100_000, help="合成论文数量")
+    parser.add_argument('--worker', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--task', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--path', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_task(args.worker, args.task, args.path)))
+        return
+
+    from corpus_binary import convert
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {'json': write_corpus(tmp, args.papers), 'ndssbin': os.path.join(tmp, 'corpus.ndssbin')}
+        start = time.perf_counter()
+        convert(paths['json'], paths['ndssbin'])
+        print(f"合成语料: {args.papers} 篇, JSON {os.path.getsize(paths['json']) / 2**20:.1f} MiB, "
+              f".ndssbin {os.path.getsize(paths['ndssbin']) / 2**20:.1f} MiB（转换 {time.perf_counter() - start:.2f} s）")
+        for task, label in TASKS.items():
+            for fmt in ('json', 'ndssbin'):
+                completed = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', fmt,
+                                            '--task', task, '--path', paths[fmt]],
+                                           cwd=ROOT, capture_output=True, text=True)
+                name = f"{label} ({'json.load' if fmt == 'json' else '内存映射'})"
+                if completed.returncode != 0:
+                    print(f"{name:<32} 失败: {completed.stderr.strip().splitlines()[-1]}")
+                    continue
+                result = json.loads(completed.stdout.strip().splitlines()[-1])
+                print(f"{name:<32} 耗时 {result['seconds'] * 1000:10.2f} ms   "
+                      f"峰值内存增长 {result['peak_mib']:8.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+句子编码器后端基准测试
+在各自全新的进程中比较 PyTorch / ONNX / ONNX int8 三种后端的导入加载耗时、单条查询延迟、
+摘要编码吞吐量，以及与 PyTorch 嵌入的误差（ONNX 后端需先运行 python onnx_encoder.py --int8 导出）
+
+用法: python benchmarks/bench_encoders.py [--model paraphrase-MiniLM-L6-v2] [--papers 211]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PAPERS_FILE = os.path.join(ROOT, 'ndss_papers_2025.json')
+QUERY = "zero-knowledge proofs, chameleon hash functions, public key cryptography"
+
+
+def run_backend(encoder: str, model_name: str, onnx_dir: str, texts, threads: int, output: str) -> dict:
+    """在当前进程中测量一个后端（由子进程调用）"""
+    start = time.perf_counter()
+    if encoder == 'torch':
+        import torch
+        if threads:
+            torch.set_num_threads(threads)
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(model_name, device='cpu')
+    else:
+        from onnx_encoder import OnnxEncoder, default_onnx_dir
+        model = OnnxEncoder(onnx_dir or default_onnx_dir(model_name), int8=encoder == 'onnx-int8',
+                            threads=threads)
+    load = time.perf_counter() - start
+
+    def encode(batch):
+        return model.encode(batch, batch_size=32, convert_to_numpy=True, normalize_embeddings=True,
+                            show_progress_bar=False)
+
+    encode([QUERY])  # 预热
+    latencies = []
+    for _ in range(20):
+        start = time.perf_counter()
+        encode([QUERY])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    embeddings = encode(texts)
+    elapsed = time.perf_counter() - start
+    np.save(output, np.asarray(embeddings, dtype=np.float32))
+    return {'load': load, 'latency': statistics.median(latencies), 'per_second': len(texts) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较句子编码器后端的延迟和吞吐量")
+    parser.add_argument('--model', default='paraphrase-MiniLM-L6-v2')
+    parser.add_argument('--onnx-dir', default=None, help="ONNX 导出目录，默认 .onnx_models/<模型名>")
+    parser.add_argument('--papers', type=int, default=None, help="参与吞吐量测试的摘要数（默认全部）")
+    parser.add_argument('--threads', type=int, default=None, help="推理线程数，默认由各框架决定")
+    parser.add_argument('--encoders', nargs='+', default=['torch', 'onnx', 'onnx-int8'])
+    parser.add_argument('--worker', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--output', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    with open(PAPERS_FILE, 'r', encoding='utf-8') as f:
+        texts = [paper.get('abstract', '') for paper in json.load(f)][:args.papers]
+
+    if args.worker:
+        result = run_backend(args.worker, args.model, args.onnx_dir, texts, args.threads, args.output)
+        print(json.dumps(result))
+        return
+
+    print(f"模型: {args.model}, 摘要 {len(texts)} 条")
+    embeddings = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for encoder in args.encoders:
+            output = os.path.join(tmp, f'{encoder}.npy')
+            command = [sys.executable, os.path.abspath(__file__), '--worker', encoder, '--model', args.model,
+                       '--output', output]
+            for flag, value in (('--onnx-dir', args.onnx_dir), ('--papers', args.papers),
+                                ('--threads', args.threads)):
+                if value is not None:
+                    command += [flag, str(value)]
+            completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+            if completed.returncode != 0:
+                print(f"{encoder:<10} 失败: {completed.stderr.strip().splitlines()[-1]}")
+                continue
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            embeddings[encoder] = np.load(output)
+
+            agreement = ""
+            if encoder != 'torch' and 'torch' in embeddings:
+                reference = embeddings['torch']
+                agreement = (f"   最大误差 {np.abs(embeddings[encoder] - reference).max():.2e}"
+                             f"  最小余弦 {(embeddings[encoder] * reference).sum(axis=1).min():.5f}")
+            print(f"{encoder:<10} 导入+加载 {result['load']:6.2f} s   单条查询 p50 {result['latency'] * 1000:7.2f} ms   "
+                  f"吞吐 {result['per_second']:8.1f} 条/秒{agreement}")
+
+
+if __name__ == '__main__':
+    main()
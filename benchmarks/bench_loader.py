@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+语料加载基准测试
+生成大规模合成语料（JSON 数组和 JSONL 两种格式），在各自全新的子进程中比较
+整体 json.load、逐条流式读取为 Paper 列表、流式读取为 PaperTable 的加载耗时、峰值内存，
+以及第一批论文可以交给下游（编码、打分）之前的等待时间
+
+用法: python benchmarks/bench_loader.py [--papers 100000]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PAPERS_FILE = os.path.join(ROOT, 'ndss_papers_2025.json')
+FIRST_BATCH = 1024
+
+METHODS = {
+    'json.load + Paper 列表': 'array',
+    '流式 -> Paper 列表': 'array',
+    '流式 -> PaperTable': 'array',
+    '流式 JSONL -> PaperTable': 'jsonl',
+}
+
+
+def write_corpus(directory: str, papers: int):
+    """写出 JSON 数组和 JSONL 两份相同内容的合成语料"""
+    with open(PAPERS_FILE, 'r', encoding='utf-8') as f:
+        source = json.load(f)
+    array_path = os.path.join(directory, 'corpus.json')
+    jsonl_path = os.path.join(directory, 'corpus.jsonl')
+    with open(array_path, 'w', encoding='utf-8') as array_file, open(jsonl_path, 'w', encoding='utf-8') as jsonl_file:
+        array_file.write('[\n')
+        for i in range(papers):
+            paper = dict(source[i % len(source)])
+            paper['title'] = f"{paper.get('title', '')} #{i}"
+            paper['url'] = f"{paper.get('url', '')}?v={i}"
+            line = json.dumps(paper, ensure_ascii=False)
+            array_file.write(('    ' if i == 0 else ',\n    ') + line)
+            jsonl_file.write(line + '\n')
+        array_file.write('\n]\n')
+    return array_path, jsonl_path
+
+
+def run_method(method: str, path: str) -> dict:
+    """在当前进程中加载一次（由子进程调用）"""
+    from corpus_reader import batched, iter_records
+    from paper_filter import Paper
+    from paper_table import PaperTable, PaperTableBuilder
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    first_batch = None
+    if method == 'json.load + Paper 列表':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        first_batch = time.perf_counter() - start
+        papers = [Paper(title=item.get('title', ''), authors=item.get('authors', ''),
+                        abstract=item.get('abstract', ''), url=item.get('url', '')) for item in data]
+        del data
+    elif method == '流式 -> Paper 列表':
+        papers = []
+        for batch in batched(iter_records(path), FIRST_BATCH):
+            if first_batch is None:
+                first_batch = time.perf_counter() - start
+            papers.extend(Paper(title=item.get('title', ''), authors=item.get('authors', ''),
+                                abstract=item.get('abstract', ''), url=item.get('url', '')) for item in batch)
+    else:
+        builder = PaperTableBuilder()
+        for batch in batched(iter_records(path), FIRST_BATCH):
+            if first_batch is None:
+                first_batch = time.perf_counter() - start
+            builder.append(PaperTable.from_records(batch))
+        papers = builder.build()
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    return {'papers': len(papers), 'seconds': elapsed, 'first_batch': first_batch, 'peak_mib': peak / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较整体加载与流式加载的耗时和峰值内存")
+    parser.add_argument('--papers', type=int, default=100_000, help="合成论文数量")
+    parser.add_argument('--worker', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--path', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_method(args.worker, args.path)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = dict(zip(('array', 'jsonl'), write_corpus(tmp, args.papers)))
+        print(f"合成语料: {args.papers} 篇, JSON {os.path.getsize(paths['array']) / 2**20:.1f} MiB, "
+              f"JSONL {os.path.getsize(paths['jsonl']) / 2**20:.1f} MiB")
+        for method, fmt in METHODS.items():
+            completed = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', method,
+                                        '--path', paths[fmt]], cwd=ROOT, capture_output=True, text=True)
+            if completed.returncode != 0:
+                print(f"{method:<24} 失败: {completed.stderr.strip().splitlines()[-1]}")
+                continue
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(f"{method:<24} 加载 {result['seconds']:6.2f} s   峰值内存增长 {result['peak_mib']:8.1f} MiB   "
+                  f"首批 {FIRST_BATCH} 篇可用 {result['first_batch'] * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
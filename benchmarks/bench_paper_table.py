@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+列式论文表内存基准测试
+把真实论文复制成大规模合成语料（每篇的标题加编号以免字符串被共享），比较 Paper 对象列表与
+PaperTable 的内存占用（tracemalloc），以及逐篇写入分数、读取摘要等循环的耗时
+
+用法: python benchmarks/bench_paper_table.py [--papers 100000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from paper_filter import Paper, fuse_scores  # noqa: E402
+from paper_table import PaperTable, column_of  # noqa: E402
+
+PAPERS_FILE = os.path.join(ROOT, 'ndss_papers_2025.json')
+
+
+def synthetic_records(papers: int):
+    with open(PAPERS_FILE, 'r', encoding='utf-8') as f:
+        source = json.load(f)
+    return [{'title': f"{source[i % len(source)]['title']} #{i}",
+             'authors': source[i % len(source)].get('authors', ''),
+             'abstract': f"{source[i % len(source)].get('abstract', '')} ({i})",
+             'url': f"{source[i % len(source)].get('url', '')}?v={i}"}
+            for i in range(papers)]
+
+
+def measure(build):
+    """(结果, 占用字节数, 构造耗时)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较 Paper 列表与 PaperTable 的内存和循环开销")
+    parser.add_argument('--papers', type=int, default=100_000, help="合成论文数量")
+    args = parser.parse_args()
+
+    records = synthetic_records(args.papers)
+    text_bytes = sum(len(r[k].encode('utf-8')) for r in records for k in ('title', 'authors', 'abstract', 'url'))
+    print(f"合成语料: {len(records)} 篇, 文本 UTF-8 共 {text_bytes / 2**20:.1f} MiB")
+
+    # 复制字符串，确保两种结构都不与 records 共享字符串对象
+    papers, list_bytes, list_time = measure(lambda: [
+        Paper(title=''.join(r['title']), authors=''.join(r['authors']), abstract=''.join(r['abstract']),
+              url=''.join(r['url'])) for r in records])
+    table, table_bytes, table_time = measure(lambda: PaperTable.from_records(records))
+    del records
+    # 文本本身之外的开销：对象头、__dict__、str 头、float 对象等
+    for name, used, elapsed in (('Paper 列表', list_bytes, list_time), ('PaperTable', table_bytes, table_time)):
+        print(f"{name:<12} 内存 {used / 2**20:8.1f} MiB   文本之外的开销 {(used - text_bytes) / 2**20:7.1f} MiB "
+              f"（每篇 {(used - text_bytes) / len(papers):6.1f} 字节）   构造 {elapsed:6.2f} s")
+
+    rng = np.random.default_rng(0)
+    similarity, rule = rng.random(len(papers)), rng.random(len(papers))
+
+    def list_scores():
+        for paper, s, r in zip(papers, similarity, rule):
+            paper.similarity_score = float(s)
+            paper.rule_score = float(r)
+        sims = np.array([p.similarity_score for p in papers])
+        rules = np.array([p.rule_score for p in papers])
+        for paper, final in zip(papers, fuse_scores(sims, rules)):
+            paper.final_score = float(final)
+
+    def table_scores():
+        table.scores['similarity_score'][:] = similarity
+        table.scores['rule_score'][:] = rule
+        table.scores['final_score'][:] = fuse_scores(table.scores['similarity_score'], table.scores['rule_score'])
+
+    print("\n循环耗时:")
+    print(f"  写入三列分数        Paper 列表 {timed(list_scores) * 1000:8.1f} ms   "
+          f"PaperTable {timed(table_scores) * 1000:8.1f} ms")
+    print(f"  遍历全部摘要        Paper 列表 {timed(lambda: sum(len(a) for a in column_of(papers, 'abstract'))) * 1000:8.1f} ms   "
+          f"PaperTable {timed(lambda: sum(len(a) for a in column_of(table, 'abstract'))) * 1000:8.1f} ms")
+    print(f"  逐行视图读取标题    Paper 列表 {timed(lambda: [p.title for p in papers]) * 1000:8.1f} ms   "
+          f"PaperTable {timed(lambda: [p.title for p in table]) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
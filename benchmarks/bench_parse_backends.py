@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+详情页解析后端基准测试
+在 .page_store 中已存储的页面上比较各解析后端的单页解析时间，并检查提取结果是否与 html.parser 一致
+
+用法: python benchmarks/bench_parse_backends.py [--store-dir .page_store] [--limit 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_backends import available_backends  # noqa: E402
+from page_store import PageStore  # noqa: E402
+from scrape_papers import STORE_DIR, parse_paper_details  # noqa: E402
+
+DEBUG_PAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'debug_page.html')
+
+
+def load_pages(store_dir, limit):
+    """读取已存储的页面；存储为空时退回到仓库中的 debug_page.html"""
+    pages = []
+    if os.path.isdir(store_dir):
+        store = PageStore(store_dir)
+        for url, digest in list(store.urls().items())[:limit]:
+            pages.append((url, store.get(digest)))
+    if not pages:
+        with open(DEBUG_PAGE, 'rb') as f:
+            pages.append(('debug_page.html', f.read()))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较详情页解析后端的速度")
+    parser.add_argument('--store-dir', default=STORE_DIR)
+    parser.add_argument('--limit', type=int, default=200, help="最多使用多少个存储页面")
+    parser.add_argument('--repeat', type=int, default=5, help="每个页面重复解析次数")
+    args = parser.parse_args()
+
+    pages = load_pages(args.store_dir, args.limit)
+    print(f"页面数: {len(pages)}, 每页重复 {args.repeat} 次")
+
+    reference = {url: parse_paper_details(content, url, verbose=False, backend='html.parser')
+                 for url, content in pages}
+
+    print(f"{'后端':<12} {'平均(ms)':>10} {'p50(ms)':>10} {'p99(ms)':>10} {'加速比':>8} {'结果一致':>10}")
+    baseline = None
+    for backend in available_backends():
+        timings = []
+        agree = 0
+        for url, content in pages:
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                paper = parse_paper_details(content, url, verbose=False, backend=backend)
+                timings.append((time.perf_counter() - start) * 1000)
+            agree += paper == reference[url]
+
+        timings.sort()
+        mean = statistics.mean(timings)
+        p50 = timings[len(timings) // 2]
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        baseline = baseline or mean
+        print(f"{backend:<12} {mean:>10.3f} {p50:>10.3f} {p99:>10.3f} {baseline / mean:>7.1f}x "
+              f"{agree:>5}/{len(pages)}")
+
+
+if __name__ == '__main__':
+    main()
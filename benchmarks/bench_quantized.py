@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+量化嵌入基准测试
+比较 float32 / float16 / int8 三种存储的内存占用、打分耗时，以及近似打分（和 float32 重算后）
+的排序与全精度结果的一致程度
+
+用法: python benchmarks/bench_quantized.py [--papers 200000] [--dim 384] [--rescore 200]
+      python benchmarks/bench_quantized.py --cache-dir .embedding_cache
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embedding_store import EmbeddingStore, normalize_rows  # noqa: E402
+from quantized_embeddings import QUANTIZATION_MODES, QuantizedEmbeddings, rescore_top  # noqa: E402
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best])]
+
+
+def agreement(reference: np.ndarray, scores: np.ndarray, k: int):
+    """(与全精度前k名的重合率, 前k名顺序完全一致的查询比例)"""
+    overlap, identical = 0, 0
+    for ref_row, row in zip(reference, scores):
+        expected, got = top_k(ref_row, k), top_k(row, k)
+        overlap += len(set(expected.tolist()) & set(got.tolist()))
+        identical += int(np.array_equal(expected, got))
+    return overlap / (k * len(reference)), identical / len(reference)
+
+
+def timed(func, repeat: int = 3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较量化嵌入的内存、速度和排序一致性")
+    parser.add_argument('--papers', type=int, default=200_000, help="合成嵌入数量")
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--cache-dir', default=None, help="改用已有嵌入缓存中的嵌入")
+    parser.add_argument('--model', default='paraphrase-MiniLM-L6-v2')
+    parser.add_argument('--queries', type=int, default=12, help="同时打分的研究兴趣数")
+    parser.add_argument('--k', type=int, default=100)
+    parser.add_argument('--rescore', type=int, default=200)
+    args = parser.parse_args()
+
+    tmp = None
+    if args.cache_dir:
+        store = EmbeddingStore(args.cache_dir, args.model)
+    else:
+        tmp = tempfile.mkdtemp()
+        store = EmbeddingStore(tmp, 'synthetic')
+        rng = np.random.default_rng(0)
+        store.add([str(i) for i in range(args.papers)], rng.standard_normal((args.papers, args.dim)))
+    matrix = np.asarray(store.matrix)
+    rows = np.arange(len(matrix))
+    rng = np.random.default_rng(1)
+    queries = normalize_rows(matrix[rng.integers(0, len(matrix), args.queries)]
+                             + rng.standard_normal((args.queries, matrix.shape[1])).astype(np.float32) * 0.05)
+    print(f"嵌入: {matrix.shape[0]} x {matrix.shape[1]}, 查询 {args.queries} 个, k={args.k}, 重算 {args.rescore} 个候选")
+
+    try:
+        elapsed, reference = timed(lambda: queries @ matrix.T)
+        print(f"{'float32':<8} 内存 {matrix.nbytes / 2**20:8.1f} MiB   打分 {elapsed * 1000:8.1f} ms")
+
+        for mode in QUANTIZATION_MODES:
+            quantized = QuantizedEmbeddings(store, mode)
+            elapsed, approx = timed(lambda: quantized.score(queries, rows))
+            overlap, identical = agreement(reference, approx, args.k)
+            rescore_time, rescored = timed(
+                lambda: rescore_top(approx.copy(), queries, matrix, rows, args.rescore))
+            overlap_r, identical_r = agreement(reference, rescored, args.k)
+            print(f"{mode:<8} 内存 {quantized.nbytes / 2**20:8.1f} MiB   打分 {elapsed * 1000:8.1f} ms   "
+                  f"最大误差 {np.abs(approx - reference).max():.2e}")
+            print(f"{'':<8} 近似排序: 前{args.k}重合 {overlap:.4f}  顺序一致 {identical:.2f}   "
+                  f"重算后: 前{args.k}重合 {overlap_r:.4f}  顺序一致 {identical_r:.2f}  "
+                  f"(重算 {rescore_time * 1000:.1f} ms)")
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
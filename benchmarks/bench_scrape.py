@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+抓取器吞吐量基准测试
+在独立进程中启动本地替身 NDSS 网站，用 scrape_papers 抓取全部论文，
+报告论文/秒、抓取延迟 p50/p99、解析耗时和峰值内存；--rerun 额外测量带缓存的第二次抓取（304）
+
+用法: python benchmarks/bench_scrape.py --pages 400 --latency 0.1 --error-rate 0.02 --concurrency 16
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_papers  # noqa: E402
+from html_backends import BACKENDS  # noqa: E402
+from index_stream import iter_paper_links  # noqa: E402
+from ndss_stub_server import run_in_process  # noqa: E402
+
+
+def percentile(values, q):
+    """返回已排序列表的 q 分位数"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run_once(index_url, args, cache_dir, store_dir, label):
+    """抓取一次并打印指标"""
+    stats = {}
+    failed = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        papers = scrape_papers.scrape_papers(
+            iter_paper_links([index_url], session=scrape_papers.get_session(args.concurrency)),
+            concurrency=args.concurrency, rate=args.rate, burst=args.burst, max_retries=args.retries,
+            failed=failed, cache_dir=cache_dir, store_dir=store_dir, backend=args.parser, stats=stats)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = sorted(stats.get('fetch_latencies', []))
+    parse_times = stats.get('parse_times', [])
+    summary = [line for line in output.getvalue().splitlines() if line.startswith(('抓取统计', '缓存统计'))]
+
+    print(f"\n[{label}]")
+    print(f"  论文数: {len(papers)} (失败 {len(failed)}), 总耗时 {elapsed:.2f}s, "
+          f"吞吐量 {len(papers) / elapsed:.1f} 篇/秒")
+    print(f"  抓取延迟: p50 {percentile(latencies, 0.5) * 1000:.1f}ms, p99 {percentile(latencies, 0.99) * 1000:.1f}ms")
+    if parse_times:
+        print(f"  解析耗时: 平均 {statistics.mean(parse_times) * 1000:.2f}ms/篇, 合计 {sum(parse_times):.2f}s")
+    print(f"  峰值内存: Python 分配 {peak / 1024 / 1024:.1f}MB, 进程 RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f}MB")
+    for line in summary:
+        print(f"  {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="在本地替身网站上测量抓取器吞吐量")
+    parser.add_argument('--pages', type=int, default=None, help="论文数量 (默认与保存的索引页相同)")
+    parser.add_argument('--latency', type=float, default=0.05, help="详情页平均延迟（秒）")
+    parser.add_argument('--jitter', type=float, default=0.5)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="503 概率")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="429 概率")
+    parser.add_argument('--concurrency', type=int, default=scrape_papers.DEFAULT_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=0, help="每主机限速，默认不限速以测量上限")
+    parser.add_argument('--burst', type=float, default=scrape_papers.DEFAULT_BURST)
+    parser.add_argument('--retries', type=int, default=scrape_papers.DEFAULT_RETRIES)
+    parser.add_argument('--parser', choices=BACKENDS, default=None)
+    parser.add_argument('--rerun', action='store_true', help="再抓取一次，测量条件 GET 缓存的效果")
+    args = parser.parse_args()
+
+    url_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=run_in_process, args=(url_queue,), daemon=True,
+                                     kwargs={'pages': args.pages, 'latency': args.latency, 'jitter': args.jitter,
+                                             'error_rate': args.error_rate, 'throttle_rate': args.throttle_rate})
+    server.start()
+    try:
+        index_url = url_queue.get(timeout=30) + '/accepted-papers/'
+        print(f"替身网站: {index_url}")
+        with tempfile.TemporaryDirectory() as workdir:
+            cache_dir = os.path.join(workdir, 'cache')
+            store_dir = os.path.join(workdir, 'store')
+            run_once(index_url, args, cache_dir, store_dir, "首次抓取")
+            if args.rerun:
+                run_once(index_url, args, cache_dir, store_dir, "再次抓取 (条件 GET)")
+    finally:
+        server.terminate()
+
+
+if __name__ == '__main__':
+    main()
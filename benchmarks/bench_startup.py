@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+paper_filter 冷启动基准测试
+在全新的解释器中测量 import paper_filter 的耗时和 --rules-only 端到端耗时，
+并检查这两种情况下都没有导入 torch / sentence_transformers / onnxruntime / tokenizers，用于发现启动时间回退
+
+用法: python benchmarks/bench_startup.py [--runs 5] [--max-import-ms 500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAPERS_FILE = os.path.join(ROOT, 'ndss_papers_2025.json')
+
+# 这些模块导入很慢，只应在真正需要语义编码时才出现
+HEAVY_MODULES = ('torch', 'sentence_transformers', 'onnxruntime', 'tokenizers')
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import paper_filter
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'heavy': [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+RULES_ONLY_PROBE = """
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+import paper_filter
+sys.argv = ['paper_filter.py', '--rules-only', '--input', %r, '--output', %r, '--no-cache']
+with contextlib.redirect_stdout(io.StringIO()):
+    paper_filter.main()
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'heavy': [m for m in %r if m in sys.modules]}))
+"""
+
+
+def run_probe(code: str) -> dict:
+    """在全新的解释器中执行探测代码并返回其 JSON 输出"""
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(name: str, code: str, runs: int) -> float:
+    """多次测量并打印中位数，返回中位数（毫秒）"""
+    samples, heavy = [], set()
+    for _ in range(runs):
+        probe = run_probe(code)
+        samples.append(probe['seconds'] * 1000)
+        heavy.update(probe['heavy'])
+    median = statistics.median(samples)
+    flag = f"  ⚠️ 导入了 {', '.join(sorted(heavy))}" if heavy else ""
+    print(f"{name:<24} 中位数 {median:8.1f} ms  最小 {min(samples):8.1f} ms  最大 {max(samples):8.1f} ms{flag}")
+    return median if not heavy else float('inf')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量 paper_filter 的冷启动耗时")
+    parser.add_argument('--runs', type=int, default=5, help="每项测量的重复次数")
+    parser.add_argument('--max-import-ms', type=float, default=None,
+                        help="import 耗时上限，超出（或导入了 torch）时以非零状态退出")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, 'filtered.json')
+        # 先执行一次预热，避免首次运行的磁盘缓存影响结果
+        run_probe(IMPORT_PROBE)
+        started = time.perf_counter()
+        import_ms = measure("import paper_filter", IMPORT_PROBE, args.runs)
+        measure("--rules-only 端到端", RULES_ONLY_PROBE % (PAPERS_FILE, output, HEAVY_MODULES), args.runs)
+        print(f"总耗时 {time.perf_counter() - started:.1f} 秒")
+
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f"❌ import 耗时超过上限 {args.max_import_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+本地替身 NDSS 网站
+提供改写为本地链接的索引页和仿照 debug_page.html 生成的详情页，可配置页面数量、响应延迟、
+5xx/429 错误率，并支持 ETag 条件请求，用于在不访问真实网站的情况下测量抓取器性能
+
+单独运行: python benchmarks/ndss_stub_server.py --pages 400 --latency 0.2 --error-rate 0.02
+"""
+
+import argparse
+import hashlib
+import html
+import itertools
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INDEX_TEMPLATE = os.path.join(ROOT, 'NDSS Symposium 2025 Accepted Papers - NDSS Symposium.html')
+DETAIL_TEMPLATE = os.path.join(ROOT, 'debug_page.html')
+PAPERS_FILE = os.path.join(ROOT, 'ndss_papers_2025.json')
+
+LINK_PATTERN = re.compile(r'<a class="paper-link-abs" href="[^"]*">')
+
+# debug_page.html 中要替换为合成内容的原始文本
+TEMPLATE_TITLE = "A Key-Driven Framework for Identity-Preserving Face Anonymization"
+TEMPLATE_AUTHORS = re.compile(r'Miaomiao Wang \(Shanghai University\).*?Guorui Feng \(Shanghai University\)')
+TEMPLATE_ABSTRACT = re.compile(r'Virtual faces are crucial content.*?anonymity and identifiability\.', re.DOTALL)
+
+
+class StubSite:
+    """替身网站的内容与故障注入配置"""
+
+    def __init__(self, pages: Optional[int] = None, latency: float = 0.05, jitter: float = 0.5,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, seed: int = 0):
+        """
+        初始化替身网站
+
+        Args:
+            pages: 详情页数量，None 表示与保存的索引页相同
+            latency: 详情页平均响应延迟（秒）
+            jitter: 延迟的相对抖动幅度，实际延迟在 latency * (1 ± jitter) 之间均匀分布
+            error_rate: 返回 503 的概率
+            throttle_rate: 返回 429 (Retry-After: 1) 的概率
+            seed: 随机种子
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+
+        with open(INDEX_TEMPLATE, 'r', encoding='utf-8') as f:
+            self.index_template = f.read()
+        with open(DETAIL_TEMPLATE, 'r', encoding='utf-8') as f:
+            self.detail_template = f.read()
+        with open(PAPERS_FILE, 'r', encoding='utf-8') as f:
+            self.papers = json.load(f)
+
+        self.pages = pages if pages is not None else len(LINK_PATTERN.findall(self.index_template))
+        self.base_url = ''
+
+    def index_html(self) -> str:
+        """保存的索引页，论文链接改写为本地地址，数量截断或补足到 self.pages"""
+        counter = itertools.count()
+
+        def rewrite(match):
+            i = next(counter)
+            if i >= self.pages:
+                return '<a href="#">'
+            return f'<a class="paper-link-abs" href="{self.base_url}/ndss-paper/paper-{i}/">'
+
+        page = LINK_PATTERN.sub(rewrite, self.index_template)
+        existing = min(self.pages, len(LINK_PATTERN.findall(self.index_template)))
+        extra = ''.join(f'<p><a class="paper-link-abs" href="{self.base_url}/ndss-paper/paper-{i}/">Paper {i}</a></p>\n'
+                        for i in range(existing, self.pages))
+        return page.replace('</body>', extra + '</body>', 1)
+
+    def detail_html(self, i: int) -> str:
+        """第 i 篇论文的详情页，内容取自 ndss_papers_2025.json 并循环使用"""
+        paper = self.papers[i % len(self.papers)]
+        title = html.escape(f"{paper['title']} (#{i})")
+        page = self.detail_template.replace(TEMPLATE_TITLE, title)
+        page = TEMPLATE_AUTHORS.sub(lambda m: html.escape(paper['authors']), page)
+        return TEMPLATE_ABSTRACT.sub(lambda m: html.escape(paper['abstract']), page)
+
+    def next_fault(self) -> Optional[int]:
+        """按配置的概率决定本次请求是否返回错误状态码"""
+        with self.lock:
+            self.requests += 1
+            r = self.random.random()
+        if r < self.throttle_rate:
+            return 429
+        if r < self.throttle_rate + self.error_rate:
+            return 503
+        return None
+
+    def delay(self) -> float:
+        with self.lock:
+            return max(0.0, self.latency * (1 + self.jitter * (2 * self.random.random() - 1)))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """替身网站请求处理器"""
+
+    site: StubSite = None
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, status: int, body: bytes = b'', headers: Optional[dict] = None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        site = self.site
+        path = self.path.split('?', 1)[0]
+
+        if path in ('/', '/accepted-papers/'):
+            self._send(200, site.index_html().encode('utf-8'), {'Content-Type': 'text/html; charset=utf-8'})
+            return
+
+        match = re.fullmatch(r'/ndss-paper/paper-(\d+)/', path)
+        if not match or int(match.group(1)) >= site.pages:
+            self._send(404)
+            return
+
+        time.sleep(site.delay())
+        fault = site.next_fault()
+        if fault == 429:
+            self._send(429, headers={'Retry-After': '1'})
+            return
+        if fault:
+            self._send(fault)
+            return
+
+        i = int(match.group(1))
+        etag = '"' + hashlib.sha1(f"paper-{i}".encode('utf-8')).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self._send(304, headers={'ETag': etag})
+            return
+        self._send(200, site.detail_html(i).encode('utf-8'),
+                   {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(site: StubSite, host: str = '127.0.0.1', port: int = 0):
+    """
+    创建替身网站服务器，调用其 serve_forever() 开始服务
+
+    Args:
+        site: 网站配置
+        host: 监听地址
+        port: 端口，0 表示自动分配
+
+    Returns:
+        ThreadingHTTPServer 对象
+    """
+    handler = type('BoundStubHandler', (StubHandler,), {'site': site})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    site.base_url = f"http://{host}:{server.server_address[1]}"
+    return server
+
+
+def run_in_process(url_queue, **options):
+    """multiprocessing 入口：启动服务器并通过队列返回基础 URL"""
+    site = StubSite(**options)
+    server = serve(site)
+    url_queue.put(site.base_url)
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地替身 NDSS 网站")
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--pages', type=int, default=None)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.5)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    site = StubSite(args.pages, args.latency, args.jitter, args.error_rate, args.throttle_rate)
+    server = serve(site, port=args.port)
+    print(f"替身 NDSS 网站已启动: {site.base_url}/accepted-papers/ ({site.pages} 篇论文)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+BM25 倒排索引 - 标题和摘要上的词法检索
+词项包括单词和相邻词对（"chameleon hash" 作为一个词项），标题中的词项按 TITLE_BOOST 倍计入词频；
+倒排表以 CSR 数组保存在语料文件旁（<语料>.bm25.npz），语料内容变化时自动重建
+"""
+
+import hashlib
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from keyword_matcher import tokenize
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_BOOST = 2.0
+INDEX_SUFFIX = '.bm25.npz'
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or that the their these this
+to via was we were which with our can such not than also both using based under over between
+""".split())
+
+
+def extract_terms(text: str) -> List[str]:
+    """文本的检索词项：去停用词后的单词，以及不含停用词的相邻词对"""
+    words = tokenize(text)
+    terms = [word for word in words if word not in STOPWORDS]
+    terms.extend(f"{first} {second}" for first, second in zip(words, words[1:])
+                 if first not in STOPWORDS and second not in STOPWORDS)
+    return terms
+
+
+def corpus_fingerprint(documents: Sequence[Tuple[str, str]]) -> str:
+    """语料内容指纹（按顺序对所有标题和摘要做 SHA-256）"""
+    digest = hashlib.sha256()
+    for title, abstract in documents:
+        digest.update(title.encode('utf-8'))
+        digest.update(b'\x00')
+        digest.update(abstract.encode('utf-8'))
+        digest.update(b'\x01')
+    return digest.hexdigest()
+
+
+class BM25Index:
+    """
+    BM25 倒排索引
+
+    词项 t 的倒排表为 doc_ids[offsets[t]:offsets[t + 1]] 和对应的 tfs，
+    查询时只访问查询词项的倒排表，耗时与命中文档数成正比。
+    """
+
+    def __init__(self, vocabulary: Dict[str, int], offsets: np.ndarray, doc_ids: np.ndarray,
+                 tfs: np.ndarray, doc_lengths: np.ndarray, fingerprint: str = ''):
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_lengths = doc_lengths
+        self.fingerprint = fingerprint
+        self.avg_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+        # 文档频率和 idf 只依赖索引本身，预先计算
+        df = np.diff(offsets).astype(np.float64)
+        n = len(doc_lengths)
+        self.idf = np.log(1.0 + (n - df + 0.5) / (df + 0.5))
+        self.length_norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / max(self.avg_length, 1e-9))
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    @classmethod
+    def build(cls, documents: Sequence[Tuple[str, str]]) -> 'BM25Index':
+        """
+        建立索引
+
+        Args:
+            documents: (标题, 摘要) 列表
+
+        Returns:
+            BM25Index 对象
+        """
+        vocabulary: Dict[str, int] = {}
+        term_ids: List[int] = []
+        tf_values: List[float] = []
+        doc_sizes = np.zeros(len(documents), dtype=np.int64)
+        doc_lengths = np.zeros(len(documents), dtype=np.float32)
+
+        for doc_id, (title, abstract) in enumerate(documents):
+            counts: Dict[int, float] = {}
+            for terms, weight in ((extract_terms(title), TITLE_BOOST), (extract_terms(abstract), 1.0)):
+                for term in terms:
+                    term_id = vocabulary.setdefault(term, len(vocabulary))
+                    counts[term_id] = counts.get(term_id, 0.0) + weight
+                doc_lengths[doc_id] += weight * len(terms)
+            term_ids.extend(counts)
+            tf_values.extend(counts.values())
+            doc_sizes[doc_id] = len(counts)
+
+        # (词项, 文档, 词频) 三元组按文档顺序产生，按词项稳定排序后即为各词项的倒排表
+        term_ids = np.array(term_ids, dtype=np.int64)
+        order = np.argsort(term_ids, kind='stable')
+        doc_ids = np.repeat(np.arange(len(documents), dtype=np.int32), doc_sizes)[order]
+        tfs = np.array(tf_values, dtype=np.float32)[order]
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(term_ids, minlength=len(vocabulary)))]).astype(np.int64)
+        return cls(vocabulary, offsets, doc_ids, tfs, doc_lengths, corpus_fingerprint(documents))
+
+    def updated(self, sources: Sequence[int], documents: Sequence[Tuple[str, str]]) -> 'BM25Index':
+        """
+        增量更新：复用未变化文档的倒排项，只为新增或修改的文档分词
+
+        Args:
+            sources: 新语料中每篇文档在本索引中的文档编号，-1 表示新增或已修改、需要重新分词
+            documents: 新语料的 (标题, 摘要) 列表，与 sources 等长
+
+        Returns:
+            与 BM25Index.build(documents) 打分一致的新索引（本索引不变）；
+            不再出现在任何文档中的词项保留在词表中，倒排表为空
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        fresh = np.flatnonzero(sources < 0)
+        reused = np.flatnonzero(sources >= 0)
+        delta = BM25Index.build([documents[i] for i in fresh])
+
+        # 旧文档编号 -> 新编号，被删除或修改的文档为 -1
+        new_position = np.full(len(self), -1, dtype=np.int64)
+        new_position[sources[reused]] = reused
+        old_terms = np.repeat(np.arange(len(self.offsets) - 1), np.diff(self.offsets))
+        keep = new_position[self.doc_ids] >= 0
+
+        vocabulary = dict(self.vocabulary)
+        delta_terms = np.array([vocabulary.setdefault(term, len(vocabulary))
+                                for term in sorted(delta.vocabulary, key=delta.vocabulary.get)], dtype=np.int64)
+        term_ids = np.concatenate([old_terms[keep], delta_terms[np.repeat(np.arange(len(delta_terms)),
+                                                                          np.diff(delta.offsets))]])
+        doc_ids = np.concatenate([new_position[self.doc_ids[keep]], fresh[delta.doc_ids]])
+        tfs = np.concatenate([self.tfs[keep], delta.tfs])
+        # 与 build 相同：倒排表按词项排列，同一词项内按文档编号升序
+        order = np.lexsort((doc_ids, term_ids))
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(term_ids, minlength=len(vocabulary)))]).astype(np.int64)
+
+        doc_lengths = np.empty(len(documents), dtype=np.float32)
+        doc_lengths[reused] = self.doc_lengths[sources[reused]]
+        doc_lengths[fresh] = delta.doc_lengths
+        return BM25Index(vocabulary, offsets, doc_ids[order].astype(np.int32), tfs[order], doc_lengths,
+                         corpus_fingerprint(documents))
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        计算查询对所有文档的 BM25 分数
+
+        Args:
+            query: 查询文本
+
+        Returns:
+            (文档数,) float32 分数，未命中任何词项的文档为 0
+        """
+        scores = np.zeros(len(self), dtype=np.float32)
+        for term in set(extract_terms(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            docs, tf = self.doc_ids[start:end], self.tfs[start:end]
+            # 同一词项的倒排表中文档不重复，可以直接按下标累加
+            scores[docs] += self.idf[term_id] * tf * (BM25_K1 + 1) / (tf + self.length_norm[docs])
+        return scores
+
+    def save(self, path: str):
+        """保存为 npz（先写临时文件再替换）"""
+        # 词表按编号顺序以换行分隔的 UTF-8 字节保存，比定长字符串数组紧凑得多
+        terms = '\n'.join(sorted(self.vocabulary, key=self.vocabulary.get)).encode('utf-8')
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, terms=np.frombuffer(terms, dtype=np.uint8), offsets=self.offsets, doc_ids=self.doc_ids, tfs=self.tfs,
+                 doc_lengths=self.doc_lengths, fingerprint=np.array(self.fingerprint))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['BM25Index']:
+        """加载索引，文件不存在或损坏时返回 None"""
+        try:
+            with np.load(path) as data:
+                terms = data['terms'].tobytes().decode('utf-8').split('\n') if data['terms'].size else []
+                vocabulary = {term: i for i, term in enumerate(terms)}
+                return cls(vocabulary, data['offsets'], data['doc_ids'], data['tfs'], data['doc_lengths'],
+                           str(data['fingerprint']))
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def load_or_build(documents: Sequence[Tuple[str, str]], path: Optional[str] = None) -> BM25Index:
+    """
+    加载与语料内容一致的索引，不存在或内容已变化时重建（并在提供 path 时保存）
+
+    Args:
+        documents: (标题, 摘要) 列表
+        path: 索引文件路径，None 表示只在内存中建立
+
+    Returns:
+        BM25Index 对象
+    """
+    if path:
+        index = BM25Index.load(path)
+        if index is not None and index.fingerprint == corpus_fingerprint(documents):
+            return index
+    index = BM25Index.build(documents)
+    if path:
+        index.save(path)
+    return index
+
+
+def index_path_for(corpus_file: str) -> str:
+    """语料文件旁的索引路径"""
+    return corpus_file + INDEX_SUFFIX
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+二进制语料格式 (.ndssbin) - 以内存映射方式打开，打开耗时与论文数无关
+文件由定长文件头、JSON 块目录、每个字段的偏移表 + UTF-8 字节区（或数值数组）和可选的嵌入块组成，
+读取时只映射、解码需要的字段；附带从现有 JSON 文件转换的命令行工具
+
+用法: python corpus_binary.py ndss_papers_2025.json [-o ndss_papers_2025.ndssbin] [--embeddings MODEL]
+"""
+
+import argparse
+import json
+import os
+import struct
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from embedding_store import text_key
+from paper_table import SCORE_FIELDS, STRING_FIELDS, PaperTable, StringColumn
+
+BINARY_SUFFIX = '.ndssbin'
+MAGIC = b'NDSSBIN1'
+# 文件头: 魔数 + 块目录（JSON）的字节数
+HEADER = struct.Struct('<8sQ')
+# 各数据块的起始位置按 64 字节对齐，映射后的数值数组可以直接按类型访问
+ALIGNMENT = 64
+
+# 字段取值的存储方式：字符串、整数、浮点数，其余（列表、布尔值、混合类型）存为 JSON 文本
+KINDS = ('str', 'int', 'float', 'json')
+# 每个字段可选的状态数组：字段缺失、有值、值为 null；全部有值的字段不写状态数组
+MISSING, PRESENT, NULL = 0, 1, 2
+
+
+def is_binary_corpus(path: str) -> bool:
+    """文件是否为二进制语料（按魔数判断，与扩展名无关）"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def binary_path_for(json_file: str) -> str:
+    """JSON 语料对应的二进制语料路径"""
+    return os.path.splitext(json_file)[0] + BINARY_SUFFIX
+
+
+def _aligned(position: int) -> int:
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def _value_kind(value) -> Optional[str]:
+    """单个取值的存储方式，None 返回 None（可出现在任何字段中）"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return 'str'
+    if isinstance(value, int) and not isinstance(value, bool):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    return 'json'
+
+
+class _ColumnWriter:
+    """逐条追加一个字段的取值；出现不兼容的类型时把已有取值整体改存为更通用的方式"""
+
+    def __init__(self, rows: int):
+        # 之前的 rows 条记录都没有这个字段
+        self.kind: Optional[str] = None
+        self.flags = bytearray([MISSING]) * rows
+        self.arena = bytearray()
+        self.lengths: List[int] = [0] * rows
+        self.values: List = [0] * rows
+
+    def _convert(self, kind: str):
+        """把已有取值改存为 kind（只会从 None 出发、int -> float 或改为 json）"""
+        if self.kind in ('str', 'int', 'float') and kind == 'json':
+            if self.kind == 'str':
+                view, start, texts = memoryview(self.arena), 0, []
+                for length in self.lengths:
+                    texts.append(str(view[start:start + length], 'utf-8'))
+                    start += length
+            else:
+                texts = self.values
+            self.arena, self.lengths = bytearray(), []
+            for value, flag in zip(texts, self.flags):
+                encoded = json.dumps(value, ensure_ascii=False).encode('utf-8') if flag == PRESENT else b''
+                self.arena += encoded
+                self.lengths.append(len(encoded))
+        self.kind = kind
+
+    def append(self, present: bool, value=None):
+        kind = _value_kind(value) if present else None
+        if kind is not None and kind != self.kind:
+            if self.kind is None or (self.kind, kind) == ('int', 'float'):
+                self._convert(kind)
+            elif (self.kind, kind) != ('float', 'int') and self.kind != 'json':
+                self._convert('json')
+        self.flags.append(MISSING if not present else NULL if value is None else PRESENT)
+        encoded = b''
+        if kind is not None and self.kind in ('str', 'json'):
+            encoded = (value if self.kind == 'str' else json.dumps(value, ensure_ascii=False)).encode('utf-8')
+        self.arena += encoded
+        self.lengths.append(len(encoded))
+        self.values.append(value if kind in ('int', 'float') else 0)
+
+    def blocks(self) -> Dict[str, np.ndarray]:
+        """字段的数据块：字符串（及 JSON）为偏移表和字节区，数值为数组；有缺失或 null 时附带状态数组"""
+        kind = self.kind or 'str'
+        if kind in ('str', 'json'):
+            offsets = np.zeros(len(self.lengths) + 1, dtype=np.int64)
+            np.cumsum(self.lengths, out=offsets[1:])
+            blocks = {'offsets': offsets, 'data': np.frombuffer(self.arena, dtype=np.uint8)}
+        else:
+            values = np.array(self.values, dtype=np.int64 if kind == 'int' else np.float64)
+            if kind == 'float':
+                values[np.frombuffer(self.flags, dtype=np.uint8) != PRESENT] = np.nan
+            blocks = {'values': values}
+        if self.flags.count(PRESENT) != len(self.flags):
+            blocks['flags'] = np.frombuffer(self.flags, dtype=np.uint8)
+        return blocks
+
+
+def write_corpus(records: Iterable[dict], path: str, meta: Optional[dict] = None,
+                 embeddings: Optional[np.ndarray] = None, embedding_model: Optional[str] = None) -> int:
+    """
+    把论文记录写成二进制语料（单次遍历，记录可以来自生成器）
+
+    Args:
+        records: 论文字典，字段不必一致，各字段的取值类型也不必一致
+        path: 输出路径（先写临时文件再替换）
+        meta: 原 JSON 顶层对象中 papers 以外的字段，原样保存
+        embeddings: 与记录一一对应的 (N, dim) 嵌入矩阵，写成 float32 嵌入块
+        embedding_model: 嵌入对应的模型名（嵌入缓存使用的名称）
+
+    Returns:
+        写入的论文数
+    """
+    writers: Dict[str, _ColumnWriter] = {}
+    rows = 0
+    for record in records:
+        for name in record:
+            if name not in writers:
+                writers[name] = _ColumnWriter(rows)
+        for name, writer in writers.items():
+            writer.append(name in record, record.get(name))
+        rows += 1
+
+    # 块目录中的位置都相对于数据区起点（块目录之后第一个对齐位置）
+    blocks: List[Tuple[int, np.ndarray]] = []
+    position = 0
+
+    def place(array: np.ndarray) -> int:
+        nonlocal position
+        start = _aligned(position)
+        blocks.append((start, np.ascontiguousarray(array)))
+        position = start + array.nbytes
+        return start
+
+    fields = {}
+    for name, writer in writers.items():
+        entry = {'kind': writer.kind or 'str'}
+        for block, array in writer.blocks().items():
+            entry[block] = place(array)
+        entry['bytes'] = len(writer.arena)
+        fields[name] = entry
+    directory = {'papers': rows, 'fields': fields, 'meta': meta or {}, 'embeddings': None}
+    if embeddings is not None:
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.shape[0] != rows:
+            raise ValueError(f"嵌入行数 {embeddings.shape[0]} 与论文数 {rows} 不一致")
+        directory['embeddings'] = {'offset': place(embeddings), 'dim': int(embeddings.shape[1]),
+                                   'model': embedding_model}
+
+    encoded = json.dumps(directory, ensure_ascii=False).encode('utf-8')
+    data_start = _aligned(HEADER.size + len(encoded))
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(encoded)))
+        f.write(encoded)
+        for start, array in blocks:
+            f.write(b'\0' * (data_start + start - f.tell()))
+            f.write(memoryview(array).cast('B'))
+    os.replace(tmp_path, path)
+    return rows
+
+
+class BinaryCorpus:
+    """
+    以内存映射方式打开的二进制语料
+
+    打开时只读取文件头和块目录；字段在第一次访问时映射为 StringColumn 或 NumPy 数组，
+    文本按需解码，未访问的字段（例如只看标题时的摘要）不会被读入内存。
+    """
+
+    def __init__(self, path: str):
+        """
+        打开二进制语料
+
+        Args:
+            path: .ndssbin 文件路径
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, size = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} 不是二进制语料文件")
+            directory = json.loads(f.read(size).decode('utf-8'))
+        self._data_start = _aligned(HEADER.size + size)
+        self._map = np.memmap(path, dtype=np.uint8, mode='r')
+        self.size: int = directory['papers']
+        self.fields: Dict[str, dict] = directory['fields']
+        self.meta: dict = directory.get('meta') or {}
+        self._embeddings = directory.get('embeddings')
+        self._columns: Dict[str, object] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _block(self, position: int, dtype, count: int) -> np.ndarray:
+        start = self._data_start + position
+        return self._map[start:start + count * np.dtype(dtype).itemsize].view(dtype)
+
+    def column(self, name: str):
+        """
+        字段的整列：字符串字段为 StringColumn（JSON 字段为其 JSON 文本），数值字段为只读数组
+
+        缺失的字段返回空字符串列。
+        """
+        if name not in self._columns:
+            entry = self.fields.get(name)
+            if entry is None:
+                column = StringColumn(np.zeros(0, dtype=np.uint8), np.zeros(self.size + 1, dtype=np.int64))
+            elif entry['kind'] in ('str', 'json'):
+                column = StringColumn(self._block(entry['data'], np.uint8, entry['bytes']),
+                                      self._block(entry['offsets'], np.int64, self.size + 1))
+            else:
+                column = self._block(entry['values'], np.int64 if entry['kind'] == 'int' else np.float64, self.size)
+            self._columns[name] = column
+        return self._columns[name]
+
+    def flags(self, name: str) -> Optional[np.ndarray]:
+        """字段的状态数组（MISSING / PRESENT / NULL），全部有值时为 None"""
+        entry = self.fields.get(name)
+        if entry is None:
+            return np.full(self.size, MISSING, dtype=np.uint8)
+        return self._block(entry['flags'], np.uint8, self.size) if 'flags' in entry else None
+
+    @property
+    def embedding_model(self) -> Optional[str]:
+        return self._embeddings['model'] if self._embeddings else None
+
+    @property
+    def embeddings(self) -> Optional[np.ndarray]:
+        """嵌入块 (N, dim) 的只读内存映射，没有时为 None"""
+        if not self._embeddings:
+            return None
+        dim = self._embeddings['dim']
+        return self._block(self._embeddings['offset'], np.float32, self.size * dim).reshape(self.size, dim)
+
+    def iter_records(self, fields: Optional[Sequence[str]] = None) -> Iterator[dict]:
+        """
+        逐条产出论文字典，与原 JSON 中的条目相同（缺失的字段不出现，null 为 None）
+
+        Args:
+            fields: 只读取这些字段，None 表示全部字段
+        """
+        names = [name for name in (self.fields if fields is None else fields) if name in self.fields]
+        columns = []
+        for name in names:
+            column, kind = self.column(name), self.fields[name]['kind']
+            values = iter(column) if kind in ('str', 'json') else iter(column.tolist())
+            flags = self.flags(name)
+            columns.append((name, kind, values, None if flags is None else flags.tolist()))
+        for i in range(self.size):
+            record = {}
+            for name, kind, values, flags in columns:
+                value = next(values)
+                flag = PRESENT if flags is None else flags[i]
+                if flag == NULL:
+                    record[name] = None
+                elif flag == PRESENT:
+                    record[name] = json.loads(value) if kind == 'json' else value
+            yield record
+
+    def table(self) -> PaperTable:
+        """
+        论文表：文本列直接引用内存映射（不拷贝、不解码），文件中有的分数列拷贝为可写数组
+        """
+        scores = {}
+        for name in SCORE_FIELDS:
+            if name in self.fields and self.fields[name]['kind'] in ('int', 'float'):
+                scores[name] = np.array(self.column(name), dtype=np.float64)
+        return PaperTable({name: self.column(name) for name in STRING_FIELDS}, scores)
+
+    def cached_encoder(self, model_name: str, encode_fn: Callable[[List[str]], np.ndarray]
+                       ) -> Callable[[List[str]], np.ndarray]:
+        """
+        编码函数：嵌入块与 model_name 对应时，摘要的嵌入直接取自嵌入块，其余文本交给 encode_fn
+
+        用于 EmbeddingStore.rows_or_encode，把文件里自带的嵌入写入嵌入缓存而不必重新编码。
+        """
+        if self.embedding_model != model_name:
+            return encode_fn
+        matrix = self.embeddings
+        lookup = {}
+        for row, abstract in enumerate(self.column('abstract')):
+            lookup.setdefault(abstract, row)
+
+        def encode(texts: List[str]) -> np.ndarray:
+            rows = np.array([lookup.get(text, -1) for text in texts], dtype=np.int64)
+            result = np.empty((len(texts), matrix.shape[1]), dtype=np.float32)
+            result[rows >= 0] = matrix[rows[rows >= 0]]
+            missing = np.flatnonzero(rows < 0)
+            if len(missing):
+                result[missing] = encode_fn([texts[i] for i in missing])
+            return result
+        return encode
+
+
+def open_corpus(path: str) -> BinaryCorpus:
+    """打开二进制语料（只读取文件头和块目录）"""
+    return BinaryCorpus(path)
+
+
+def convert(json_file: str, output_file: Optional[str] = None, store=None) -> int:
+    """
+    把 JSON 语料（JSON 数组、{'papers': [...], ...} 或 JSONL）转换为二进制语料
+
+    Args:
+        json_file: JSON 语料路径
+        output_file: 输出路径，默认与输入同名、扩展名为 .ndssbin
+        store: EmbeddingStore；给出时把其中全部摘要的嵌入写入嵌入块（缺少任何一篇时不写嵌入块）
+
+    Returns:
+        转换的论文数
+    """
+    from corpus_reader import JSONL_SUFFIXES, iter_records
+
+    output_file = output_file or binary_path_for(json_file)
+    meta = {}
+    records: Iterable[dict] = iter_records(json_file)
+    if not json_file.lower().endswith(JSONL_SUFFIXES):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            head = f.read(64).lstrip()
+        if head.startswith('{'):
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            records = data.pop('papers', [])
+            meta = data
+
+    if store is None:
+        return write_corpus(records, output_file, meta)
+
+    records = list(records)
+    rows = store.rows([text_key(record.get('abstract', '') or '') for record in records])
+    if (rows < 0).any():
+        print(f"嵌入缓存中缺少 {int((rows < 0).sum())} 篇论文摘要的嵌入，不写入嵌入块"
+              f"（请先运行 embed_corpus.py）")
+        return write_corpus(records, output_file, meta)
+    return write_corpus(records, output_file, meta, store.matrix[rows], store.model_name)
+
+
+def main():
+    from paper_filter import EMBEDDING_CACHE_DIR, ENCODERS, embedding_store_name
+    from embedding_store import EmbeddingStore
+
+    parser = argparse.ArgumentParser(description="把 JSON 语料转换为内存映射的二进制语料")
+    parser.add_argument('input', help="JSON 语料（JSON 数组、{'papers': [...]} 或 JSONL）")
+    parser.add_argument('-o', '--output', default=None, help="输出路径，默认与输入同名、扩展名为 .ndssbin")
+    parser.add_argument('--embeddings', default=None, metavar='MODEL',
+                        help="把该模型在嵌入缓存中的摘要嵌入一并写入")
+    parser.add_argument('--encoder', choices=ENCODERS, default='torch', help="嵌入对应的编码器后端")
+    parser.add_argument('--cache-dir', default=EMBEDDING_CACHE_DIR, help="嵌入缓存目录")
+    args = parser.parse_args()
+
+    store = None
+    if args.embeddings:
+        store = EmbeddingStore(args.cache_dir, embedding_store_name(args.embeddings, args.encoder))
+    output = args.output or binary_path_for(args.input)
+    papers = convert(args.input, output, store)
+    corpus = open_corpus(output)
+    print(f"已转换 {papers} 篇论文: {args.input} ({os.path.getsize(args.input) / 2**20:.1f} MiB) -> "
+          f"{output} ({os.path.getsize(output) / 2**20:.1f} MiB)")
+    kinds = ', '.join(f"{name}({entry['kind']})" for name, entry in corpus.fields.items())
+    print(f"字段: {kinds}")
+    if corpus.embedding_model:
+        print(f"嵌入块: {corpus.embedding_model}, {corpus.embeddings.shape[1]} 维")
+
+
+if __name__ == '__main__':
+    main()
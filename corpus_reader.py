@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+流式语料读取 - 逐条产出论文记录，不把整个文件解析成一棵树
+支持 JSONL（每行一条记录）、JSON 数组（按块读取、逐个解码元素）和内存映射的二进制语料；
+batched / prefetch 把读取串成生成器流水线，解析与下游的编码、打分在不同线程中重叠进行
+"""
+
+import json
+import queue
+import threading
+from typing import Iterable, Iterator, List
+
+from corpus_binary import is_binary_corpus, open_corpus
+
+CHUNK_SIZE = 1 << 20
+JSONL_SUFFIXES = ('.jsonl', '.ndjson')
+
+
+def iter_jsonl(path: str) -> Iterator[dict]:
+    """逐行读取 JSONL，跳过空行"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path} 第 {line_number} 行不是合法的 JSON: {e}") from None
+
+
+def iter_json_array(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """
+    增量解析顶层为数组的 JSON 文件，逐个产出数组元素
+
+    文件按块读入缓冲区，每次用 raw_decode 解码一个元素；元素跨越块边界时读入下一块后重试。
+    内存中只保留当前缓冲区，而不是整棵解析树。
+
+    Args:
+        path: JSON 文件路径
+        chunk_size: 每次读取的字符数
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer, pos, eof = '', 0, False
+
+        def read_more():
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+
+        def next_char() -> str:
+            """跳过空白，返回下一个字符（不消耗），文件结束时返回空串"""
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return buffer[pos] if pos < len(buffer) else ''
+                read_more()
+
+        if next_char() != '[':
+            raise ValueError(f"{path} 的顶层不是 JSON 数组")
+        pos += 1
+        first = True
+        while True:
+            char = next_char()
+            if char == ']':
+                return
+            if not first:
+                if char != ',':
+                    raise ValueError(f"{path} 中数组元素之间缺少逗号")
+                pos += 1
+                next_char()
+            while True:
+                try:
+                    record, pos = decoder.raw_decode(buffer, pos)
+                    break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    read_more()
+            first = False
+            yield record
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """
+    按格式逐条读取论文记录
+
+    .jsonl / .ndjson 按行读取；二进制语料（.ndssbin）逐条解码；顶层为数组的 JSON 增量解析；
+    顶层为对象的 JSON（{'papers': [...]}）只能整体加载后产出其中的 papers。
+    """
+    if is_binary_corpus(path):
+        yield from open_corpus(path).iter_records()
+        return
+    if path.lower().endswith(JSONL_SUFFIXES):
+        yield from iter_jsonl(path)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        head = f.read(64).lstrip()
+    if head.startswith('{'):
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f).get('papers', [])
+        return
+    yield from iter_json_array(path)
+
+
+def batched(records: Iterable, size: int) -> Iterator[List]:
+    """把记录流切成大小为 size 的批次（最后一批可能更小）"""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+_DONE = object()
+
+
+def prefetch(items: Iterable, depth: int = 2) -> Iterator:
+    """
+    在后台线程中提前取出最多 depth 个元素
+
+    上游（读取和解析）与下游（编码、打分）交替释放 GIL 时可以并行；上游的异常在下游重新抛出。
+    下游提前结束时后台线程会在放入下一个元素后退出。
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in items:
+                if stop.is_set():
+                    return
+                buffer.put(item)
+            buffer.put(_DONE)
+        except BaseException as e:  # 交给消费者线程重新抛出
+            buffer.put(e)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # 放出一个空位，让可能阻塞在 put 上的生产者线程看到 stop 后退出
+        try:
+            buffer.get_nowait()
+        except queue.Empty:
+            pass
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+语料增量更新 - 按 url 比较新旧语料，找出新增、删除和摘要（或标题）有变化的论文
+上次运行的每篇论文的内容摘要和规则分数保存在语料文件旁的快照（<语料>.snapshot.json）中，
+顺序与 BM25 索引的文档编号一致，重新抓取后只需为变化部分重新计算
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SNAPSHOT_SUFFIX = '.snapshot.json'
+
+
+def paper_key(url: str, title: str) -> str:
+    """论文的比较键：url，没有 url 时退回标题"""
+    return url or f"title:{title}"
+
+
+def paper_digest(title: str, abstract: str) -> str:
+    """影响评分的内容（标题和摘要）的 SHA-256"""
+    return hashlib.sha256(f"{title}\x00{abstract}".encode('utf-8')).hexdigest()
+
+
+def rules_fingerprint(keyword_weights: Dict[str, float]) -> str:
+    """关键词权重表的指纹，权重变化时旧的规则分数全部失效"""
+    return hashlib.sha256(json.dumps(sorted(keyword_weights.items())).encode('utf-8')).hexdigest()
+
+
+def snapshot_path_for(corpus_file: str) -> str:
+    """语料文件旁的快照路径"""
+    return corpus_file + SNAPSHOT_SUFFIX
+
+
+@dataclass
+class CorpusDiff:
+    """新旧语料的差异"""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    # 新语料中每篇论文在旧语料（快照）中的位置，-1 表示新增或已修改
+    sources: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+
+    def summary(self) -> str:
+        return (f"新增 {len(self.added)} 篇, 删除 {len(self.removed)} 篇, 修改 {len(self.changed)} 篇, "
+                f"未变 {self.unchanged} 篇")
+
+
+@dataclass
+class CorpusSnapshot:
+    """上次运行时的语料快照"""
+    keys: List[str]
+    digests: List[str]
+    rule_scores: List[float]
+    rules_fingerprint: str = ''
+    fingerprint: str = ''  # 对应 BM25 索引的语料指纹
+
+    @classmethod
+    def load(cls, path: str) -> Optional['CorpusSnapshot']:
+        """加载快照，不存在或损坏时返回 None"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(data['keys'], data['digests'], data['rule_scores'],
+                       data.get('rules_fingerprint', ''), data.get('fingerprint', ''))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, path: str):
+        """保存快照（先写临时文件再替换）"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'keys': self.keys, 'digests': self.digests, 'rule_scores': self.rule_scores,
+                       'rules_fingerprint': self.rules_fingerprint, 'fingerprint': self.fingerprint}, f)
+        os.replace(tmp_path, path)
+
+
+def diff_corpus(snapshot: Optional[CorpusSnapshot], keys: Sequence[str], digests: Sequence[str]) -> CorpusDiff:
+    """
+    按比较键对比快照与新语料
+
+    Args:
+        snapshot: 上次运行的快照，None 表示全部为新增
+        keys: 新语料每篇论文的比较键
+        digests: 新语料每篇论文的内容摘要
+
+    Returns:
+        CorpusDiff；重复的比较键只有第一次出现时与旧论文对应，其余视为新增
+    """
+    previous: Dict[str, Tuple[int, str]] = {}
+    if snapshot is not None:
+        for row, (key, digest) in enumerate(zip(snapshot.keys, snapshot.digests)):
+            previous.setdefault(key, (row, digest))
+
+    diff = CorpusDiff(sources=np.full(len(keys), -1, dtype=np.int64))
+    seen = set()
+    for i, (key, digest) in enumerate(zip(keys, digests)):
+        if key in seen or key not in previous:
+            diff.added.append(key)
+        elif previous[key][1] != digest:
+            diff.changed.append(key)
+        else:
+            diff.sources[i] = previous[key][0]
+            diff.unchanged += 1
+        seen.add(key)
+    diff.removed = [key for key in previous if key not in seen]
+    return diff
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+语料嵌入命令 - 用多进程编码论文摘要并流式写入嵌入缓存
+摘要按长度排序后分桶，每批的大小由 token 预算决定（短文本批次大、长文本批次小），减少填充浪费；
+已在缓存中的摘要会被跳过，中断后重新运行即可继续
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List
+
+from corpus_binary import is_binary_corpus, open_corpus
+from corpus_reader import iter_records
+from embedding_store import EmbeddingStore, text_key
+from onnx_encoder import default_onnx_dir
+from paper_filter import EMBEDDING_CACHE_DIR, ENCODERS, embedding_store_name
+
+DEFAULT_MODEL = 'paraphrase-MiniLM-L6-v2'
+# 每批的 token 预算：批大小 x 批内最长文本的 token 数（即包括填充在内的计算量）
+DEFAULT_TOKEN_BUDGET = 8192
+MAX_BATCH_SIZE = 256
+# 模型最大序列长度，更长的文本会被截断，估算 token 数时按此封顶
+MAX_SEQ_TOKENS = 256
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估计子词 token 数（英文约每词 1.3 个 token，加上 [CLS]/[SEP]）"""
+    return min(MAX_SEQ_TOKENS, len(text.split()) * 4 // 3 + 2)
+
+
+def make_batches(texts: List[str], token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 max_batch_size: int = MAX_BATCH_SIZE) -> List[List[int]]:
+    """
+    按长度分桶生成批次
+
+    文本按估计长度降序排列，依次装入批次，直到 批大小 x 批内最长长度 超出预算，
+    因此同一批内的文本长度相近，填充很少。
+
+    Args:
+        texts: 文本列表
+        token_budget: 每批的 token 预算
+        max_batch_size: 批大小上限
+
+    Returns:
+        批次列表，每批是 texts 中的下标
+    """
+    lengths = [estimate_tokens(text) for text in texts]
+    order = sorted(range(len(texts)), key=lambda i: -lengths[i])
+    batches, batch = [], []
+    for i in order:
+        # 降序排列，批内第一个文本即最长文本
+        longest = lengths[batch[0]] if batch else lengths[i]
+        if batch and ((len(batch) + 1) * longest > token_budget or len(batch) >= max_batch_size):
+            batches.append(batch)
+            batch = []
+        batch.append(i)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+# 每个编码进程各自加载一份模型
+_worker_model = None
+
+
+def _init_encode_worker(model_name: str, threads: int, encoder: str = 'torch', onnx_dir: str = None):
+    global _worker_model
+    if encoder == 'torch':
+        import torch
+        torch.set_num_threads(threads)
+        from sentence_transformers import SentenceTransformer
+        _worker_model = SentenceTransformer(model_name, device='cpu')
+    else:
+        from onnx_encoder import OnnxEncoder
+        _worker_model = OnnxEncoder(onnx_dir or default_onnx_dir(model_name), int8=encoder == 'onnx-int8',
+                                    threads=threads)
+
+
+def _encode_batch(texts: List[str]):
+    return _worker_model.encode(texts, batch_size=len(texts), convert_to_numpy=True,
+                                normalize_embeddings=True, show_progress_bar=False)
+
+
+def load_abstracts(json_file: str) -> List[str]:
+    """流式读取论文 JSON（列表、{'papers': [...]} 或 JSONL）中的摘要，二进制语料只读取摘要列"""
+    if is_binary_corpus(json_file):
+        return list(open_corpus(json_file).column('abstract'))
+    return [item.get('abstract', '') for item in iter_records(json_file)]
+
+
+def embed_corpus(texts: List[str], model_name: str = DEFAULT_MODEL, cache_dir: str = EMBEDDING_CACHE_DIR,
+                 workers: int = None, threads: int = 1, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 encoder: str = 'torch') -> Dict:
+    """
+    编码缓存中还没有的文本并写入嵌入缓存
+
+    Args:
+        texts: 文本列表（重复和已缓存的会被跳过）
+        model_name: 句子嵌入模型名称
+        cache_dir: 嵌入缓存目录
+        workers: 编码进程数，默认 CPU 核数 / threads
+        threads: 每个进程的 torch / onnxruntime 线程数
+        token_budget: 每批的 token 预算
+        encoder: 编码器后端，见 paper_filter.ENCODERS（与 PaperFilter 使用相同的缓存子目录）
+
+    Returns:
+        统计字典：total, cached, encoded, batches, seconds, per_second
+    """
+    store = EmbeddingStore(cache_dir, embedding_store_name(model_name, encoder))
+    pending: Dict[str, str] = {}
+    cached = 0
+    for text in texts:
+        key = text_key(text)
+        if key in store:
+            cached += 1
+        elif key not in pending:
+            pending[key] = text
+    keys, todo = list(pending), list(pending.values())
+    stats = {'total': len(texts), 'cached': cached, 'encoded': 0, 'batches': 0,
+             'seconds': 0.0, 'per_second': 0.0}
+    if not todo:
+        print(f"全部 {len(texts)} 条摘要都已在缓存中")
+        return stats
+
+    workers = workers or max(1, (os.cpu_count() or 1) // threads)
+    batches = make_batches(todo, token_budget)
+    print(f"待编码 {len(todo)} 条摘要（已缓存 {stats['cached']} 条），共 {len(batches)} 批，"
+          f"{workers} 个进程 x {threads} 线程")
+
+    start = time.perf_counter()
+    last_report = start
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_encode_worker,
+                             initargs=(model_name, threads, encoder)) as pool:
+        # 同时在途的批次数限制为进程数的两倍，结果按完成顺序写入缓存
+        queue = iter(batches)
+        running: Dict = {}
+
+        def submit_next() -> bool:
+            batch = next(queue, None)
+            if batch is None:
+                return False
+            running[pool.submit(_encode_batch, [todo[i] for i in batch])] = batch
+            return True
+
+        for _ in range(workers * 2):
+            if not submit_next():
+                break
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = running.pop(future)
+                store.add([keys[i] for i in batch], future.result())
+                stats['encoded'] += len(batch)
+                stats['batches'] += 1
+                submit_next()
+
+            now = time.perf_counter()
+            if now - last_report >= 5:
+                last_report = now
+                print(f"  已编码 {stats['encoded']}/{len(todo)} 条, "
+                      f"{stats['encoded'] / (now - start):.1f} 条/秒")
+
+    stats['seconds'] = time.perf_counter() - start
+    stats['per_second'] = stats['encoded'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+    print(f"编码完成: {stats['encoded']} 条, 用时 {stats['seconds']:.1f}s（含各进程加载模型）, "
+          f"{stats['per_second']:.1f} 条摘要/秒")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多进程编码论文摘要并写入嵌入缓存")
+    parser.add_argument('--input', nargs='+', default=['ndss_papers_2025.json'], help="一个或多个论文 JSON 文件")
+    parser.add_argument('--model', default=DEFAULT_MODEL, help="句子嵌入模型名称")
+    parser.add_argument('--cache-dir', default=EMBEDDING_CACHE_DIR, help="嵌入缓存目录")
+    parser.add_argument('--workers', type=int, default=None, help="编码进程数，默认 CPU 核数 / --threads")
+    parser.add_argument('--threads', type=int, default=1, help="每个进程的 torch / onnxruntime 线程数")
+    parser.add_argument('--encoder', choices=ENCODERS, default='torch', help="编码器后端")
+    parser.add_argument('--token-budget', type=int, default=DEFAULT_TOKEN_BUDGET,
+                        help="每批的 token 预算（批大小 x 批内最长文本长度）")
+    args = parser.parse_args()
+
+    texts = []
+    for json_file in args.input:
+        texts.extend(load_abstracts(json_file))
+    print(f"共读取 {len(texts)} 条摘要")
+    embed_corpus(texts, args.model, args.cache_dir, args.workers, args.threads, args.token_budget, args.encoder)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+持久化嵌入缓存 - 按 (模型名, 文本 SHA-256) 索引
+嵌入以 L2 归一化的 float32 矩阵追加写入磁盘并以内存映射方式读取，
+重复运行时只需编码新增或变化的文本，余弦相似度退化为一次矩阵-向量乘法
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def text_key(text: str) -> str:
+    """文本内容的 SHA-256 摘要，作为嵌入的键"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """按行 L2 归一化（零向量保持不变）"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+class EmbeddingStore:
+    """
+    单个模型的磁盘嵌入缓存
+
+    目录结构（每个模型一个子目录）:
+        meta.json       模型名和向量维度
+        keys.txt        每行一个文本摘要，行号即矩阵行号（只追加）
+        embeddings.f32  行优先的 float32 矩阵（只追加），以 np.memmap 读取
+
+    新嵌入只需追加写入，不必重写已有数据；崩溃后以两个文件中较短的一方为准，
+    加载时把较长的一方截断到相同行数。
+    """
+
+    def __init__(self, cache_dir: str, model_name: str):
+        """
+        初始化嵌入缓存
+
+        Args:
+            cache_dir: 缓存根目录
+            model_name: 模型名称，不同模型的嵌入互不混用
+        """
+        self.model_name = model_name
+        self.dir = os.path.join(cache_dir, re.sub(r'[^A-Za-z0-9._-]+', '_', model_name))
+        self.meta_path = os.path.join(self.dir, 'meta.json')
+        self.keys_path = os.path.join(self.dir, 'keys.txt')
+        self.data_path = os.path.join(self.dir, 'embeddings.f32')
+
+        self.dim: Optional[int] = None
+        self.index: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path, 'r', encoding='utf-8') as f:
+            self.dim = json.load(f)['dim']
+
+        keys = []
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, 'r', encoding='utf-8') as f:
+                keys = [line.strip() for line in f if line.strip()]
+        rows = os.path.getsize(self.data_path) // (4 * self.dim) if os.path.exists(self.data_path) else 0
+        self.index = {key: i for i, key in enumerate(keys[:rows])}
+
+        # 截掉上次中断时多出的数据行（或多出的键），之后追加的行号才与键对应
+        if os.path.exists(self.data_path) and os.path.getsize(self.data_path) != len(self.index) * 4 * self.dim:
+            with open(self.data_path, 'ab') as f:
+                f.truncate(len(self.index) * 4 * self.dim)
+        if len(keys) > len(self.index):
+            with open(self.keys_path, 'w', encoding='utf-8') as f:
+                f.write(''.join(key + '\n' for key in keys[:len(self.index)]))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """全部嵌入的只读内存映射矩阵 (N, dim)"""
+        if self._matrix is None or self._matrix.shape[0] != len(self.index):
+            if not self.index:
+                return np.zeros((0, self.dim or 0), dtype=np.float32)
+            self._matrix = np.memmap(self.data_path, dtype=np.float32, mode='r',
+                                     shape=(len(self.index), self.dim))
+        return self._matrix
+
+    def rows(self, keys: Sequence[str]) -> np.ndarray:
+        """键对应的矩阵行号，缺失的为 -1"""
+        return np.fromiter((self.index.get(key, -1) for key in keys), dtype=np.int64, count=len(keys))
+
+    def add(self, keys: Sequence[str], embeddings: np.ndarray):
+        """
+        追加新的嵌入（已存在的键会被跳过）
+
+        Args:
+            keys: 文本摘要列表
+            embeddings: 对应的嵌入矩阵 (len(keys), dim)，写入前会做 L2 归一化
+        """
+        embeddings = normalize_rows(embeddings)
+        if self.dim is None:
+            os.makedirs(self.dir, exist_ok=True)
+            self.dim = int(embeddings.shape[1])
+            with open(self.meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'model_name': self.model_name, 'dim': self.dim}, f)
+        elif embeddings.shape[1] != self.dim:
+            raise ValueError(f"嵌入维度 {embeddings.shape[1]} 与缓存维度 {self.dim} 不一致")
+
+        new_keys, new_rows, seen = [], [], set()
+        for key, row in zip(keys, embeddings):
+            if key not in self.index and key not in seen:
+                seen.add(key)
+                new_keys.append(key)
+                new_rows.append(row)
+        if not new_keys:
+            return
+
+        # 先写数据再写键：中途崩溃时多出的数据行没有对应的键，会在下次加载时被截掉
+        with open(self.data_path, 'ab') as f:
+            f.write(np.ascontiguousarray(new_rows, dtype=np.float32).tobytes())
+        with open(self.keys_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(key + '\n' for key in new_keys))
+
+        start = len(self.index)
+        for i, key in enumerate(new_keys):
+            self.index[key] = start + i
+
+    def rows_or_encode(self, texts: List[str], encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        返回文本在缓存矩阵中的行号，只对缓存中没有的文本调用 encode_fn
+
+        Args:
+            texts: 文本列表
+            encode_fn: 批量编码函数，输入文本列表，返回 (n, dim) 矩阵
+
+        Returns:
+            行号数组
+        """
+        keys = [text_key(text) for text in texts]
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self.index and key not in missing:
+                missing[key] = text
+
+        if missing:
+            self.add(list(missing), encode_fn(list(missing.values())))
+        return self.rows(keys)
+
+    def get_or_encode(self, texts: List[str], encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        返回文本的归一化嵌入，只对缓存中没有的文本调用 encode_fn
+
+        Args:
+            texts: 文本列表
+            encode_fn: 批量编码函数，输入文本列表，返回 (n, dim) 矩阵
+
+        Returns:
+            (len(texts), dim) 的 float32 矩阵
+        """
+        rows = self.rows_or_encode(texts, encode_fn)
+        if not texts:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return np.asarray(self.matrix[rows])
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+自调优的字段提取规则级联
+每个字段（标题、作者、摘要）对应一组按顺序尝试的规则，运行中统计每条规则的命中率并据此重新排序，
+排序和统计持久化到磁盘供下次运行使用，常见情况下只需一次查找就能命中
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 加载上次运行的统计时乘以的衰减系数，让新的运行更快反映模板变化
+STATS_DECAY = 0.5
+
+
+@dataclass
+class ExtractionRule:
+    """单条提取规则"""
+    name: str
+    extract: Callable  # (doc, cache) -> Optional[str]
+    fallback: bool = False  # 通用兜底规则永远排在特定规则之后
+    attempts: float = 0.0
+    hits: float = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        """平滑后的命中率，没有统计时为 0.5"""
+        return (self.hits + 1) / (self.attempts + 2)
+
+
+class RuleCascade:
+    """单个字段的规则级联"""
+
+    def __init__(self, field: str, rules: List[ExtractionRule]):
+        """
+        初始化级联
+
+        Args:
+            field: 字段名
+            rules: 规则列表，列表顺序即无统计时的初始顺序
+        """
+        self.field = field
+        self.rules = list(rules)
+        self.priority = {rule.name: i for i, rule in enumerate(rules)}
+        self.by_name = {rule.name: rule for rule in rules}
+
+    def apply(self, doc, cache: Dict) -> Tuple[Optional[str], Optional[str], List[str]]:
+        """
+        依次尝试规则直到命中
+
+        Returns:
+            (提取到的值, 命中的规则名, 尝试过的规则名列表)，都未命中时前两项为 None
+        """
+        tried = []
+        for rule in self.rules:
+            tried.append(rule.name)
+            value = rule.extract(doc, cache)
+            if value:
+                return value, rule.name, tried
+        return None, None, tried
+
+    def record(self, tried: List[str], winner: Optional[str]):
+        """记录一次级联的结果；命中的规则不在首位时重新排序"""
+        for name in tried:
+            rule = self.by_name.get(name)
+            if rule is None:
+                continue
+            rule.attempts += 1
+            if name == winner:
+                rule.hits += 1
+        if self.rules[0].name != winner:
+            self.reorder()
+
+    def reorder(self):
+        """按（是否兜底, 命中率降序, 初始顺序）重新排序"""
+        self.rules.sort(key=lambda rule: (rule.fallback, -rule.success_rate, self.priority[rule.name]))
+
+
+class RuleSet:
+    """所有字段的规则级联及其统计持久化"""
+
+    def __init__(self, cascades: List[RuleCascade]):
+        self.cascades = {cascade.field: cascade for cascade in cascades}
+        # 从上次运行加载时每个字段排在首位的规则，用于发现模板变化
+        self.expected_first: Dict[str, str] = {}
+        self.changes_reported = set()
+
+    def extract(self, doc, cache: Optional[Dict] = None) -> Tuple[Dict[str, Optional[str]], Dict]:
+        """
+        对文档运行所有字段的级联
+
+        Returns:
+            (字段值字典, 级联轨迹字典 {字段: (尝试过的规则, 命中的规则)})
+        """
+        cache = {} if cache is None else cache
+        values, trace = {}, {}
+        for field, cascade in self.cascades.items():
+            value, winner, tried = cascade.apply(doc, cache)
+            values[field] = value
+            trace[field] = (tried, winner)
+        return values, trace
+
+    def record(self, trace: Dict) -> List[str]:
+        """
+        记录一次提取的轨迹（可以来自其他进程）
+
+        Returns:
+            本次首次发现的模板变化提示，例如某字段改由其他规则命中
+        """
+        notices = []
+        for field, (tried, winner) in trace.items():
+            cascade = self.cascades.get(field)
+            if cascade is None:
+                continue
+            cascade.record(tried, winner)
+            expected = self.expected_first.get(field)
+            key = (field, winner)
+            if expected and winner != expected and key not in self.changes_reported:
+                self.changes_reported.add(key)
+                if winner is None:
+                    notices.append(f"字段 '{field}' 的所有规则都未命中（此前为 '{expected}'），页面模板可能已变化")
+                else:
+                    notices.append(f"字段 '{field}' 改由规则 '{winner}' 命中（此前为 '{expected}'），页面模板可能已变化")
+        return notices
+
+    def load(self, path: str):
+        """加载上次运行保存的统计并据此排序，文件不存在或损坏时保持初始顺序"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for field, entries in saved.items():
+            cascade = self.cascades.get(field)
+            if cascade is None:
+                continue
+            for entry in entries:
+                rule = cascade.by_name.get(entry.get('name'))
+                if rule is not None:
+                    rule.attempts = entry.get('attempts', 0) * STATS_DECAY
+                    rule.hits = entry.get('hits', 0) * STATS_DECAY
+            cascade.reorder()
+            self.expected_first[field] = cascade.rules[0].name
+
+    def save(self, path: str):
+        """保存当前排序和统计"""
+        data = {field: [{'name': rule.name, 'attempts': rule.attempts, 'hits': rule.hits}
+                        for rule in cascade.rules]
+                for field, cascade in self.cascades.items()}
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def report(self) -> str:
+        """返回各字段规则的命中统计表"""
+        lines = []
+        for field, cascade in self.cascades.items():
+            lines.append(f"[{field}]")
+            for rule in cascade.rules:
+                flag = " (兜底)" if rule.fallback else ""
+                lines.append(f"  {rule.name:<32} 命中 {rule.hits:>7.1f} / 尝试 {rule.attempts:>7.1f}  "
+                             f"命中率 {rule.success_rate:.1%}{flag}")
+        return "\n".join(lines)
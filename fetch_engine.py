@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+并发抓取引擎 - 为 scrape_papers.py 提供有界并发和按主机限速
+网络 I/O 在线程池中完成，解析交给调用方处理
+并发数由 AIMD 控制器根据延迟和 429/5xx 比例自适应调整，失败请求带抖动指数退避重试
+"""
+
+import heapq
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+
+@dataclass
+class FetchResult:
+    """单个 URL 的抓取结果"""
+    index: int
+    url: str
+    content: Optional[bytes] = None
+    error: Optional[Exception] = None
+    elapsed: float = 0.0
+    attempts: int = 1
+
+
+# 错误分类：节流 (429)、服务器错误 (5xx)、网络错误（超时/连接失败）、客户端错误（其余 4xx）
+THROTTLED = 'throttled'
+SERVER_ERROR = 'server_error'
+NETWORK_ERROR = 'network_error'
+CLIENT_ERROR = 'client_error'
+
+# 这些错误说明服务器压力过大或网络拥塞，需要降低并发并重试
+CONGESTION_ERRORS = (THROTTLED, SERVER_ERROR, NETWORK_ERROR)
+
+
+def classify_error(error: Exception) -> Tuple[str, Optional[float]]:
+    """
+    对抓取异常进行分类
+
+    Args:
+        error: 抓取函数抛出的异常（如 requests.HTTPError）
+
+    Returns:
+        (错误类别, Retry-After 秒数或 None)
+    """
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is None:
+        return NETWORK_ERROR, None
+
+    retry_after = None
+    headers = getattr(response, 'headers', None) or {}
+    value = headers.get('Retry-After')
+    if value:
+        try:
+            retry_after = max(0.0, float(value))
+        except ValueError:
+            retry_after = None
+
+    if status == 429:
+        return THROTTLED, retry_after
+    if status >= 500:
+        return SERVER_ERROR, retry_after
+    return CLIENT_ERROR, retry_after
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0,
+                  retry_after: Optional[float] = None) -> float:
+    """
+    计算带完全抖动 (full jitter) 的指数退避时间
+
+    Args:
+        attempt: 已失败的次数（从 1 开始）
+        base: 初始退避时间（秒）
+        cap: 退避时间上限（秒）
+        retry_after: 服务器要求的最短等待时间
+
+    Returns:
+        下次重试前需要等待的秒数
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, cap))
+    return delay
+
+
+class AIMDController:
+    """
+    加性增、乘性减 (AIMD) 并发控制器
+
+    每次成功请求使并发上限增加 increase / limit（约每轮往返加 1）；
+    出现 429/5xx/网络错误，或平滑延迟超过基线的 latency_tolerance 倍时，
+    并发上限乘以 decrease。每个延迟周期内最多降低一次，避免同一批失败反复惩罚。
+    """
+
+    def __init__(self, initial: int = 2, min_limit: int = 1, max_limit: int = 16,
+                 increase: float = 1.0, decrease: float = 0.5,
+                 latency_tolerance: float = 2.0, ewma_alpha: float = 0.2):
+        """
+        初始化控制器
+
+        Args:
+            initial: 初始并发数
+            min_limit: 并发下限
+            max_limit: 并发上限
+            increase: 加性增量（每轮往返）
+            decrease: 乘性减因子
+            latency_tolerance: 平滑延迟超过基线多少倍时视为拥塞
+            ewma_alpha: 延迟指数加权平均的平滑系数
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.ewma_alpha = ewma_alpha
+        self.latency_ewma: Optional[float] = None
+        self.latency_baseline: Optional[float] = None
+        self.last_decrease = 0.0
+        self.stats = {'success': 0, THROTTLED: 0, SERVER_ERROR: 0, NETWORK_ERROR: 0,
+                      CLIENT_ERROR: 0, 'decreases': 0}
+        self.lock = threading.Lock()
+
+    @property
+    def window(self) -> int:
+        """当前允许的进行中请求数"""
+        return max(self.min_limit, int(self.limit))
+
+    def _update_latency(self, latency: float):
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += self.ewma_alpha * (latency - self.latency_ewma)
+        if self.latency_baseline is None or self.latency_ewma < self.latency_baseline:
+            self.latency_baseline = self.latency_ewma
+
+    def _decrease(self):
+        now = time.monotonic()
+        cooldown = self.latency_ewma if self.latency_ewma is not None else 1.0
+        if now - self.last_decrease < cooldown:
+            return
+        self.last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * self.decrease)
+        self.stats['decreases'] += 1
+
+    def record_success(self, latency: float):
+        """记录一次成功请求及其延迟"""
+        with self.lock:
+            self.stats['success'] += 1
+            self._update_latency(latency)
+            if self.latency_ewma > self.latency_tolerance * self.latency_baseline:
+                self._decrease()
+            else:
+                self.limit = min(float(self.max_limit), self.limit + self.increase / self.limit)
+
+    def record_failure(self, kind: str, latency: float):
+        """记录一次失败请求"""
+        with self.lock:
+            self.stats[kind] += 1
+            if kind != NETWORK_ERROR:
+                self._update_latency(latency)
+            if kind in CONGESTION_ERRORS:
+                self._decrease()
+
+    def summary(self) -> str:
+        """返回控制器统计信息的简短描述"""
+        with self.lock:
+            total = sum(self.stats[k] for k in ('success', THROTTLED, SERVER_ERROR, NETWORK_ERROR, CLIENT_ERROR))
+            congested = sum(self.stats[k] for k in CONGESTION_ERRORS)
+            rate = congested / total if total else 0.0
+            latency = self.latency_ewma or 0.0
+            return (f"并发上限 {self.window}, 平滑延迟 {latency:.2f}s, "
+                    f"请求 {total} 次, 429 {self.stats[THROTTLED]} 次, 5xx {self.stats[SERVER_ERROR]} 次, "
+                    f"网络错误 {self.stats[NETWORK_ERROR]} 次 (拥塞率 {rate:.1%}), "
+                    f"降速 {self.stats['decreases']} 次")
+
+
+class TokenBucket:
+    """令牌桶限速器（线程安全）"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数（即平均请求速率）
+            capacity: 桶容量（允许的突发请求数）
+        """
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """取走一个令牌，令牌不足时阻塞等待"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait_time = (1.0 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+
+class HostRateLimiter:
+    """按主机名分配独立令牌桶的限速器"""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        """
+        初始化限速器
+
+        Args:
+            rate: 每个主机每秒允许的请求数，<= 0 表示不限速
+            burst: 每个主机允许的突发请求数
+        """
+        self.rate = rate
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, url: str):
+        """在向 url 所在主机发送请求前调用"""
+        if self.rate <= 0:
+            return
+        host = urlparse(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self.buckets[host] = bucket
+        bucket.acquire()
+
+
+class FetchEngine:
+    """自适应并发抓取引擎"""
+
+    def __init__(self, fetch_func: Callable[[str], bytes],
+                 concurrency: int = 8, rate: float = 5.0, burst: float = 2.0,
+                 max_retries: int = 4, backoff_base: float = 1.0, backoff_cap: float = 60.0,
+                 controller: Optional[AIMDController] = None):
+        """
+        初始化抓取引擎
+
+        Args:
+            fetch_func: 下载单个 URL 并返回页面内容的函数
+            concurrency: 同时进行中的请求数上限（AIMD 控制器在此范围内调整）
+            rate: 每个主机每秒请求数上限
+            burst: 每个主机允许的突发请求数
+            max_retries: 可重试错误（429/5xx/网络错误）的最大重试次数
+            backoff_base: 指数退避的初始时间（秒）
+            backoff_cap: 退避时间上限（秒）
+            controller: 自定义并发控制器，默认按 concurrency 创建
+        """
+        self.fetch_func = fetch_func
+        self.concurrency = max(1, concurrency)
+        self.limiter = HostRateLimiter(rate, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.controller = controller or AIMDController(
+            initial=min(2, self.concurrency), max_limit=self.concurrency)
+
+    def _fetch_one(self, index: int, url: str, attempt: int) -> FetchResult:
+        """在工作线程中抓取单个 URL，异常记录在结果中而不是抛出"""
+        self.limiter.acquire(url)
+        start = time.monotonic()
+        try:
+            content = self.fetch_func(url)
+            elapsed = time.monotonic() - start
+            self.controller.record_success(elapsed)
+            return FetchResult(index, url, content=content, elapsed=elapsed, attempts=attempt)
+        except Exception as e:
+            elapsed = time.monotonic() - start
+            kind, _ = classify_error(e)
+            self.controller.record_failure(kind, elapsed)
+            return FetchResult(index, url, error=e, elapsed=elapsed, attempts=attempt)
+
+    def _retry_delay(self, result: FetchResult) -> Optional[float]:
+        """判断失败结果是否需要重试，需要则返回等待时间"""
+        if result.error is None or result.attempts > self.max_retries:
+            return None
+        kind, retry_after = classify_error(result.error)
+        if kind not in CONGESTION_ERRORS:
+            return None
+        return backoff_delay(result.attempts, self.backoff_base, self.backoff_cap, retry_after)
+
+    def fetch_all(self, urls: Iterable[str]) -> Iterator[FetchResult]:
+        """
+        并发抓取所有 URL
+
+        URL 按需从可迭代对象中读取，进行中的请求数不超过控制器给出的当前窗口。
+        可重试的失败请求进入退避队列，到期后优先重新提交；只有最终成功或
+        重试耗尽的结果才会产出。结果按完成顺序产出，调用方可通过
+        FetchResult.index 恢复原始顺序。
+
+        Args:
+            urls: URL 可迭代对象
+
+        Returns:
+            FetchResult 迭代器
+        """
+        url_iter = enumerate(urls)
+        pending = {}
+        retry_queue = []  # (到期时间, index, url, 下一次尝试序号)
+        exhausted = False
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while True:
+                now = time.monotonic()
+                while len(pending) < self.controller.window:
+                    if retry_queue and retry_queue[0][0] <= now:
+                        _, index, url, attempt = heapq.heappop(retry_queue)
+                    elif not exhausted:
+                        try:
+                            index, url = next(url_iter)
+                        except StopIteration:
+                            exhausted = True
+                            continue
+                        attempt = 1
+                    else:
+                        break
+                    pending[pool.submit(self._fetch_one, index, url, attempt)] = index
+
+                if not pending and not retry_queue:
+                    break
+
+                timeout = max(0.0, retry_queue[0][0] - now) if retry_queue else None
+                if not pending:
+                    time.sleep(timeout)
+                    continue
+
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del pending[future]
+                    result = future.result()
+                    delay = self._retry_delay(result)
+                    if delay is None:
+                        yield result
+                    else:
+                        heapq.heappush(retry_queue, (time.monotonic() + delay, result.index,
+                                                     result.url, result.attempts + 1))
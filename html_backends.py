@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+HTML 解析后端 - 为详情页解析提供统一的节点查询接口
+支持 BeautifulSoup (html.parser / lxml) 和 selectolax 三种后端，
+BeautifulSoup 后端可用 SoupStrainer 只解析标题、paper-data 和 entry-content 区域
+"""
+
+from typing import List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401  lxml 是可选依赖
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser  # selectolax 是可选依赖
+except ImportError:
+    SelectolaxParser = None
+
+BACKENDS = ('html.parser', 'lxml', 'selectolax')
+
+# 详情页中需要的区域：标题元素以及包含作者和摘要的 paper-data / entry-content
+REGION_CLASSES = ['entry-title', 'wp-block-heading', 'page-title', 'post-title',
+                  'paper-data', 'entry-content']
+
+_REGION_STRAINER = SoupStrainer(class_=REGION_CLASSES)
+
+
+def available_backends() -> List[str]:
+    """返回当前环境中可用的解析后端"""
+    backends = ['html.parser']
+    if HAS_LXML:
+        backends.append('lxml')
+    if SelectolaxParser is not None:
+        backends.append('selectolax')
+    return backends
+
+
+def default_backend() -> str:
+    """返回可用后端中最快的一个"""
+    return available_backends()[-1]
+
+
+class SoupNode:
+    """BeautifulSoup 节点包装"""
+
+    __slots__ = ('tag',)
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    @property
+    def name(self) -> str:
+        return self.tag.name
+
+    def text(self) -> str:
+        return self.tag.get_text(strip=True)
+
+    def select(self, selector: str) -> List['SoupNode']:
+        return [SoupNode(tag) for tag in self.tag.select(selector)]
+
+    def select_one(self, selector: str) -> Optional['SoupNode']:
+        tag = self.tag.select_one(selector)
+        return SoupNode(tag) if tag is not None else None
+
+    def next_sibling(self, names) -> Optional['SoupNode']:
+        tag = self.tag.find_next_sibling(list(names))
+        return SoupNode(tag) if tag is not None else None
+
+    def parent(self) -> Optional['SoupNode']:
+        return SoupNode(self.tag.parent) if self.tag.parent is not None else None
+
+
+class SelectolaxNode:
+    """selectolax 节点包装"""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def name(self) -> str:
+        return self.node.tag
+
+    def text(self) -> str:
+        return self.node.text(strip=True)
+
+    def select(self, selector: str) -> List['SelectolaxNode']:
+        return [SelectolaxNode(node) for node in self.node.css(selector)]
+
+    def select_one(self, selector: str) -> Optional['SelectolaxNode']:
+        node = self.node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def next_sibling(self, names) -> Optional['SelectolaxNode']:
+        node = self.node.next
+        while node is not None:
+            if node.tag in names:
+                return SelectolaxNode(node)
+            node = node.next
+        return None
+
+    def parent(self) -> Optional['SelectolaxNode']:
+        return SelectolaxNode(self.node.parent) if self.node.parent is not None else None
+
+
+def parse_document(content, backend: str = 'html.parser', scoped: bool = False):
+    """
+    解析 HTML 文档
+
+    Args:
+        content: 页面原始字节或字符串
+        backend: 解析后端，见 BACKENDS
+        scoped: 是否只解析 REGION_CLASSES 所在区域（仅对 BeautifulSoup 后端生效；
+                selectolax 的完整解析本身已足够快）
+
+    Returns:
+        文档根节点（SoupNode 或 SelectolaxNode）
+    """
+    if backend == 'selectolax':
+        if SelectolaxParser is None:
+            raise RuntimeError("selectolax 后端需要安装 selectolax: pip install selectolax")
+        if isinstance(content, bytes):
+            content = content.decode('utf-8', errors='replace')
+        return SelectolaxNode(SelectolaxParser(content).root)
+
+    if backend not in ('html.parser', 'lxml'):
+        raise ValueError(f"未知的解析后端: {backend}")
+    if backend == 'lxml' and not HAS_LXML:
+        raise RuntimeError("lxml 后端需要安装 lxml: pip install lxml")
+    soup = BeautifulSoup(content, backend, parse_only=_REGION_STRAINER if scoped else None)
+    return SoupNode(soup)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+HTTP 连接池与磁盘条件请求缓存
+共享 requests.Session 复用 keep-alive 连接；缓存按 URL 保存 ETag/Last-Modified 和页面内容，
+重复抓取时发送 If-None-Match/If-Modified-Since，页面未变化时服务器只需返回 304
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from page_store import PageStore
+
+
+def create_session(pool_size: int = 8, headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    创建带连接池的共享会话
+
+    Args:
+        pool_size: 每个主机保持的最大连接数，应不小于抓取并发数
+        headers: 每个请求默认携带的请求头
+
+    Returns:
+        requests.Session 对象
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class HttpCache:
+    """按 URL 索引的磁盘 HTTP 缓存（线程安全）"""
+
+    def __init__(self, cache_dir: str = '.http_cache', store: Optional[PageStore] = None):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录，每个 URL 对应一个 .json 元数据文件
+            store: 内容寻址页面存储；提供时页面内容保存在其中，否则保存为同名 .body 文件
+        """
+        self.cache_dir = cache_dir
+        self.store = store
+        os.makedirs(cache_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.stats = {'not_modified': 0, 'fetched': 0, 'uncached': 0}
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        读取缓存条目
+
+        Returns:
+            包含 etag、last_modified 和 body 的字典，不存在或已损坏时返回 None
+        """
+        try:
+            with open(self._path(url, '.json'), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get('sha256') and self.store is not None:
+                entry['body'] = self.store.get(entry['sha256'])
+            else:
+                with open(self._path(url, '.body'), 'rb') as f:
+                    entry['body'] = f.read()
+            return entry
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, url: str, response: requests.Response):
+        """
+        保存响应内容及其校验头；服务器未提供任何校验头时不缓存
+
+        有页面存储时，内容无论是否可缓存都写入存储（每个页面只写一次，fetch_page 不必再写）。
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            if self.store is not None:
+                self.store.put(url, response.content)
+            self._count('uncached')
+            return
+
+        # 先写临时文件再原子替换，避免并发写入或中断产生半个文件
+        meta = {'url': url, 'etag': etag, 'last_modified': last_modified}
+        if self.store is not None:
+            meta['sha256'] = self.store.put(url, response.content)
+        else:
+            body_path = self._path(url, '.body')
+            tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(response.content)
+            os.replace(tmp_path, body_path)
+
+        meta_path = self._path(url, '.json')
+        tmp_path = f"{meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+        self._count('fetched')
+
+    def _count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def summary(self) -> str:
+        """返回缓存命中情况的简短描述"""
+        with self.lock:
+            total = sum(self.stats.values())
+            return (f"请求 {total} 次, 304 未修改 {self.stats['not_modified']} 次, "
+                    f"重新下载 {self.stats['fetched'] + self.stats['uncached']} 次")
+
+
+def cached_get(session: requests.Session, url: str, cache: Optional[HttpCache] = None,
+               timeout: float = 30) -> bytes:
+    """
+    发送条件 GET 请求并返回页面内容
+
+    如果缓存中有该 URL 的 ETag/Last-Modified，则附带 If-None-Match/If-Modified-Since；
+    服务器返回 304 时直接使用缓存内容。请求失败时抛出 requests 异常。
+
+    Args:
+        session: 共享会话
+        url: 页面地址
+        cache: 磁盘缓存，为 None 时退化为普通 GET
+        timeout: 请求超时（秒）
+
+    Returns:
+        页面原始字节
+    """
+    entry = cache.get(url) if cache is not None else None
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    response = session.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and entry:
+        cache._count('not_modified')
+        return entry['body']
+
+    response.raise_for_status()  # 如果请求失败则抛出异常
+    if cache is not None:
+        cache.put(url, response)
+    return response.content
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+多关键词匹配引擎 - 以词为字母表的 Aho-Corasick 自动机
+文本规范化为小写单词序列后一次扫描找出全部关键词，匹配只发生在完整单词上
+（'rsa' 不会匹配 "adversarial"），关键词最后一个词的复数形式 (-s / -es) 也算命中
+"""
+
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """转小写并按非字母数字字符切分为单词（连字符与空格等价，"zero-knowledge" -> zero, knowledge）"""
+    return _NON_WORD.sub(' ', text.lower()).split()
+
+
+def _plural_variants(words: Tuple[str, ...]) -> List[Tuple[str, ...]]:
+    """关键词本身及其最后一个词加 -s / -es 的形式"""
+    *head, last = words
+    variants = [words, (*head, last + 's')]
+    if last.endswith(('s', 'x', 'z', 'ch', 'sh')):
+        variants.append((*head, last + 'es'))
+    return variants
+
+
+class KeywordMatcher:
+    """
+    编译后的多关键词自动机
+
+    状态转移表以单词为边，每个状态保存沿失败链合并后的输出关键词，
+    因此扫描一段文本只需对每个单词做常数次字典查找，与关键词数量无关。
+    """
+
+    def __init__(self, keywords: Iterable[str], plurals: bool = True):
+        """
+        编译关键词
+
+        Args:
+            keywords: 关键词列表（原样作为匹配结果返回）
+            plurals: 是否同时匹配最后一个词的复数形式
+        """
+        self.keywords: List[str] = []
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[Tuple[int, ...]] = [()]
+
+        outputs: List[Set[int]] = [set()]
+        for keyword in keywords:
+            words = tuple(tokenize(keyword))
+            if not words:
+                continue
+            keyword_id = len(self.keywords)
+            self.keywords.append(keyword)
+            for variant in (_plural_variants(words) if plurals else [words]):
+                state = 0
+                for word in variant:
+                    next_state = self.goto[state].get(word)
+                    if next_state is None:
+                        next_state = len(self.goto)
+                        self.goto[state][word] = next_state
+                        self.goto.append({})
+                        self.fail.append(0)
+                        outputs.append(set())
+                    state = next_state
+                outputs[state].add(keyword_id)
+
+        # 广度优先计算失败链接，并把失败状态的输出并入当前状态
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for word, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(word, 0)
+                outputs[child] |= outputs[self.fail[child]]
+        self.output = [tuple(sorted(ids)) for ids in outputs]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find_ids(self, text: str) -> Set[int]:
+        """返回文本中出现的关键词编号集合"""
+        goto, fail, output = self.goto, self.fail, self.output
+        root = goto[0]
+        found: Set[int] = set()
+        state = 0
+        for word in tokenize(text):
+            # 大多数单词不属于任何关键词，停留在根状态时只需一次查找
+            if state == 0:
+                state = root.get(word, 0)
+            else:
+                while True:
+                    next_state = goto[state].get(word)
+                    if next_state is not None:
+                        state = next_state
+                        break
+                    if state == 0:
+                        break
+                    state = fail[state]
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def find(self, text: str) -> Set[str]:
+        """返回文本中出现的关键词集合"""
+        return {self.keywords[i] for i in self.find_ids(text)}
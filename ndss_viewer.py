@@ -7,18 +7,31 @@ NDSS 2025 Paper List Viewer
 
 import json
 import html
+import os
 from datetime import datetime
 
+from corpus_binary import is_binary_corpus, open_corpus
+
+# 报告用到的字段；二进制语料只读取这些字段（不读摘要）
+REPORT_FIELDS = ('title', 'title_chinese', 'authors', 'url')
+
+def load_report_data(json_file: str):
+    """读取论文列表和顶层的其余字段（JSON 文件，或 corpus_binary.py 转换的二进制语料）"""
+    if is_binary_corpus(json_file):
+        corpus = open_corpus(json_file)
+        return list(corpus.iter_records(REPORT_FIELDS)), corpus.meta
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.pop('papers', []), data
+
 def generate_html_report(json_file: str, output_file: str = "ndss2025_papers_report.html"):
     """生成HTML格式的论文报告"""
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        papers, data = load_report_data(json_file)
     except Exception as e:
         print(f"读取JSON文件失败: {e}")
         return False
     
-    papers = data.get('papers', [])
     total_papers = data.get('total_papers', len(papers))
     
     # HTML模板
@@ -271,6 +284,8 @@ def generate_html_report(json_file: str, output_file: str = "ndss2025_papers_rep
 def main():
     """主函数"""
     json_file = "ndss2025_papers_translated.json"
+    if not os.path.exists(json_file) and os.path.exists("ndss2025_papers_translated.ndssbin"):
+        json_file = "ndss2025_papers_translated.ndssbin"
     html_file = "ndss2025_papers_report.html"
     
     print("生成NDSS 2025论文HTML报告...")
@@ -281,10 +296,7 @@ def main():
         
         # 显示一些统计信息
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            papers = data.get('papers', [])
+            papers, _ = load_report_data(json_file)
             print(f"\n统计信息:")
             print(f"- 论文总数: {len(papers)}")
             print(f"- 有中文翻译: {sum(1 for p in papers if 'title_chinese' in p)}")
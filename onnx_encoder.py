@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+ONNX Runtime 句子编码器 - PyTorch SentenceTransformer 的轻量替代
+把模型的 Transformer 部分导出为 ONNX（可选 int8 动态量化），推理时只需要 onnxruntime 和 tokenizers，
+不导入 torch；池化和归一化在 NumPy 中完成，结果与 PyTorch 路径在容差内一致
+
+导出并校验: python onnx_encoder.py --model paraphrase-MiniLM-L6-v2 [--int8]
+"""
+
+import argparse
+import json
+import os
+import re
+from typing import List, Optional
+
+import numpy as np
+
+ONNX_DIR = '.onnx_models'
+MODEL_FILE = 'model.onnx'
+INT8_MODEL_FILE = 'model.int8.onnx'
+CONFIG_FILE = 'encoder_config.json'
+
+# 与 PyTorch 路径比较时的容差：float32 导出要求逐元素误差很小，int8 量化只要求方向基本一致
+FP32_MAX_ABS_DIFF = 1e-4
+INT8_MIN_COSINE = 0.98
+
+
+def default_onnx_dir(model_name: str) -> str:
+    """模型导出目录：.onnx_models/<模型名>"""
+    return os.path.join(ONNX_DIR, re.sub(r'[^A-Za-z0-9._-]+', '_', model_name))
+
+
+def _pooling_mode(config: dict) -> str:
+    """从 Pooling 模块配置中取池化方式（兼容新旧版本 sentence-transformers 的配置格式）"""
+    if 'pooling_mode' in config:
+        return config['pooling_mode']
+    for mode in ('cls_token', 'max_tokens', 'mean_tokens'):
+        if config.get(f'pooling_mode_{mode}'):
+            return {'cls_token': 'cls', 'max_tokens': 'max', 'mean_tokens': 'mean'}[mode]
+    return 'mean'
+
+
+def export_onnx(model_name: str, output_dir: Optional[str] = None, int8: bool = False) -> str:
+    """
+    导出 SentenceTransformer 模型为 ONNX（需要 torch 和 sentence-transformers）
+
+    Args:
+        model_name: 句子嵌入模型名称或路径
+        output_dir: 导出目录，默认 default_onnx_dir(model_name)
+        int8: 是否同时生成 int8 动态量化版本
+
+    Returns:
+        导出目录
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    output_dir = output_dir or default_onnx_dir(model_name)
+    os.makedirs(output_dir, exist_ok=True)
+    model = SentenceTransformer(model_name, device='cpu')
+    transformer, pooling = model[0], model[1]
+    tokenizer = transformer.tokenizer
+    input_names = [name for name in tokenizer.model_input_names
+                   if name in ('input_ids', 'attention_mask', 'token_type_ids')]
+
+    class Wrapper(torch.nn.Module):
+        """只输出 last_hidden_state，输入按位置传入"""
+
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, *inputs):
+            return self.auto_model(**dict(zip(input_names, inputs))).last_hidden_state
+
+    sample = tokenizer(["an example sentence for export", "short"], padding=True, return_tensors='pt')
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+    wrapper = Wrapper(transformer.auto_model).eval()
+    with torch.no_grad():
+        torch.onnx.export(wrapper, tuple(sample[name] for name in input_names),
+                          os.path.join(output_dir, MODEL_FILE), input_names=input_names,
+                          output_names=['last_hidden_state'], dynamic_axes=dynamic_axes,
+                          opset_version=17, dynamo=False)
+
+    tokenizer.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, CONFIG_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'model_name': model_name, 'input_names': input_names,
+                   'max_seq_length': transformer.max_seq_length,
+                   'pooling_mode': _pooling_mode(pooling.get_config_dict())}, f, indent=4)
+
+    if int8:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(os.path.join(output_dir, MODEL_FILE), os.path.join(output_dir, INT8_MODEL_FILE),
+                         weight_type=QuantType.QInt8)
+    return output_dir
+
+
+class OnnxEncoder:
+    """
+    ONNX Runtime 编码器，encode() 与 SentenceTransformer.encode 的常用参数兼容，
+    可直接作为 PaperFilter 的模型使用
+    """
+
+    def __init__(self, model_dir: str, int8: bool = False, threads: Optional[int] = None):
+        """
+        加载导出的模型
+
+        Args:
+            model_dir: export_onnx 的导出目录
+            int8: 是否使用 int8 量化模型
+            threads: onnxruntime 的线程数，默认由 onnxruntime 决定
+        """
+        # onnxruntime 和 tokenizers 是可选依赖，只在创建编码器时导入，
+        # 导入本模块（例如只为 default_onnx_dir）不会加载它们
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError:
+            raise RuntimeError("ONNX 编码器需要安装 onnxruntime 和 tokenizers: "
+                               "pip install onnxruntime tokenizers") from None
+        model_file = os.path.join(model_dir, INT8_MODEL_FILE if int8 else MODEL_FILE)
+        if not os.path.exists(model_file):
+            raise FileNotFoundError(f"找不到 {model_file}，请先运行: python onnx_encoder.py --model <模型名>"
+                                    + (" --int8" if int8 else ""))
+
+        with open(os.path.join(model_dir, CONFIG_FILE), 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+        self.input_names = self.config['input_names']
+        self.pooling_mode = self.config['pooling_mode']
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(max_length=self.config['max_seq_length'])
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_file, options, providers=['CPUExecutionProvider'])
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        arrays = {
+            'input_ids': np.array([e.ids for e in encodings], dtype=np.int64),
+            'attention_mask': np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            'token_type_ids': np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        hidden = self.session.run(None, {name: arrays[name] for name in self.input_names})[0]
+        mask = arrays['attention_mask'][:, :, None].astype(np.float32)
+
+        if self.pooling_mode == 'cls':
+            return hidden[:, 0]
+        if self.pooling_mode == 'max':
+            return np.where(mask > 0, hidden, -1e9).max(axis=1)
+        return (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+    def encode(self, texts, batch_size: int = 32, normalize_embeddings: bool = True, **kwargs) -> np.ndarray:
+        """
+        编码文本
+
+        Args:
+            texts: 文本或文本列表
+            batch_size: 批大小（文本先按长度排序，同批长度相近以减少填充）
+            normalize_embeddings: 是否 L2 归一化
+            **kwargs: 为兼容 SentenceTransformer.encode 接受但忽略的参数
+
+        Returns:
+            (n, dim) float32 嵌入；输入为单个字符串时返回 (dim,)
+        """
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        result = None
+        for start in range(0, len(texts), batch_size):
+            batch = order[start:start + batch_size]
+            embeddings = self._encode_batch([texts[i] for i in batch])
+            if result is None:
+                result = np.empty((len(texts), embeddings.shape[1]), dtype=np.float32)
+            result[batch] = embeddings
+
+        if normalize_embeddings:
+            norms = np.linalg.norm(result, axis=1, keepdims=True)
+            result /= np.where(norms > 0, norms, 1.0)
+        return result[0] if single else result
+
+
+def verify(model_name: str, model_dir: str, texts: List[str], int8: bool = False) -> bool:
+    """
+    比较 ONNX 编码器与 PyTorch SentenceTransformer 的嵌入
+
+    Returns:
+        是否在容差内（float32: 最大逐元素误差 <= FP32_MAX_ABS_DIFF；int8: 最小余弦相似度 >= INT8_MIN_COSINE）
+    """
+    from sentence_transformers import SentenceTransformer
+    reference = SentenceTransformer(model_name, device='cpu').encode(
+        texts, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+    embeddings = OnnxEncoder(model_dir, int8=int8).encode(texts)
+
+    max_diff = float(np.abs(embeddings - reference).max())
+    min_cosine = float((embeddings * reference).sum(axis=1).min())
+    passed = min_cosine >= INT8_MIN_COSINE if int8 else max_diff <= FP32_MAX_ABS_DIFF
+    label = 'int8' if int8 else 'float32'
+    print(f"{label}: 最大逐元素误差 {max_diff:.2e}, 最小余弦相似度 {min_cosine:.6f} -> {'通过' if passed else '未通过'}")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="导出句子嵌入模型为 ONNX 并与 PyTorch 结果比对")
+    parser.add_argument('--model', default='paraphrase-MiniLM-L6-v2', help="句子嵌入模型名称或路径")
+    parser.add_argument('--output-dir', default=None, help="导出目录，默认 .onnx_models/<模型名>")
+    parser.add_argument('--int8', action='store_true', help="同时生成 int8 动态量化模型")
+    parser.add_argument('--input', default='ndss_papers_2025.json', help="用于比对的论文数据")
+    parser.add_argument('--samples', type=int, default=64, help="用于比对的摘要数")
+    args = parser.parse_args()
+
+    output_dir = export_onnx(args.model, args.output_dir, args.int8)
+    print(f"已导出到: {output_dir}")
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        texts = [paper.get('abstract', '') for paper in json.load(f)][:args.samples]
+    passed = verify(args.model, output_dir, texts)
+    if args.int8:
+        passed = verify(args.model, output_dir, texts, int8=True) and passed
+    if not passed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
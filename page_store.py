@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+内容寻址的原始 HTML 存储
+每个抓取到的页面按 SHA-256 保存为压缩对象（安装了 zstandard 时使用 zstd，否则使用 gzip），
+URL 到内容哈希的映射记录在追加写入的 index.jsonl 中，供离线重新解析使用
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstandard 是可选依赖
+    zstandard = None
+
+
+class PageStore:
+    """内容寻址的页面存储（线程安全）"""
+
+    def __init__(self, root: str = '.page_store', level: int = 10):
+        """
+        初始化页面存储
+
+        Args:
+            root: 存储根目录
+            level: 压缩级别（zstd 1-22，gzip 1-9 时自动截断）
+        """
+        self.root = root
+        self.level = level
+        self.objects_dir = os.path.join(root, 'objects')
+        self.index_path = os.path.join(root, 'index.jsonl')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self._index: Optional[Dict[str, str]] = None
+
+    def _object_path(self, digest: str, suffix: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest + suffix)
+
+    def _compress(self, content: bytes):
+        if zstandard is not None:
+            return zstandard.ZstdCompressor(level=self.level).compress(content), '.zst'
+        return gzip.compress(content, compresslevel=min(self.level, 9)), '.gz'
+
+    def put(self, url: str, content: bytes) -> str:
+        """
+        保存页面内容并记录 URL 映射
+
+        相同内容只保存一次；URL 映射未变化时不会重复追加索引。
+
+        Args:
+            url: 页面地址
+            content: 页面原始字节
+
+        Returns:
+            内容的 SHA-256 十六进制摘要
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        if not self.has(digest):
+            data, suffix = self._compress(content)
+            path = self._object_path(digest, suffix)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        with self.lock:
+            index = self._load_index()
+            if index.get(url) != digest:
+                index[url] = digest
+                with open(self.index_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'url': url, 'sha256': digest, 'stored_at': time.time()}) + '\n')
+        return digest
+
+    def has(self, digest: str) -> bool:
+        """判断内容对象是否已存在"""
+        return any(os.path.exists(self._object_path(digest, suffix)) for suffix in ('.zst', '.gz'))
+
+    def get(self, digest: str) -> bytes:
+        """
+        读取并解压内容对象
+
+        Raises:
+            KeyError: 对象不存在
+            RuntimeError: 对象为 zstd 格式但未安装 zstandard
+        """
+        path = self._object_path(digest, '.zst')
+        if os.path.exists(path):
+            if zstandard is None:
+                raise RuntimeError("读取 .zst 对象需要安装 zstandard: pip install zstandard")
+            with open(path, 'rb') as f:
+                return zstandard.ZstdDecompressor().decompress(f.read())
+
+        path = self._object_path(digest, '.gz')
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return gzip.decompress(f.read())
+
+        raise KeyError(digest)
+
+    def _load_index(self) -> Dict[str, str]:
+        if self._index is None:
+            self._index = {}
+            if os.path.exists(self.index_path):
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        self._index[entry['url']] = entry['sha256']
+        return self._index
+
+    def urls(self) -> Dict[str, str]:
+        """返回 URL 到最新内容摘要的映射（按首次存储顺序）"""
+        with self.lock:
+            return dict(self._load_index())
@@ -4,13 +4,60 @@ AI+规则辅助筛选器 - NDSS 2025论文智能筛选工具
 基于语义相似度和规则的论文推荐系统
 """
 
+import argparse
 import json
+import os
+import time
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 import re
-from dataclasses import dataclass
-from sentence_transformers import SentenceTransformer, util
-import torch
+from dataclasses import dataclass, replace
+
+from ann_index import DEFAULT_NPROBE, INDEX_DIRNAME, IVFIndex, top_k_indices
+from bm25_index import BM25Index, index_path_for, load_or_build
+from corpus_binary import is_binary_corpus, open_corpus
+from corpus_reader import batched, iter_records, prefetch
+from corpus_update import (CorpusDiff, CorpusSnapshot, diff_corpus, paper_digest, paper_key, rules_fingerprint,
+                           snapshot_path_for)
+from embedding_store import EmbeddingStore
+from onnx_encoder import default_onnx_dir
+from paper_table import PaperTable, PaperTableBuilder, Papers, column_of, take
+from quantized_embeddings import QUANTIZATION_MODES, QuantizedEmbeddings, rescore_top
+from reranker import (DEFAULT_RERANK_MODEL, RERANK_BUDGET, RERANK_CANDIDATES, CrossEncoderReranker,
+                      paper_text, rerank_order)
+from keyword_matcher import KeywordMatcher
+
+# 近似最近邻搜索时每个研究兴趣取回的候选数；候选之外的论文语义分数视为候选中的最低分
+ANN_CANDIDATES = 1000
+# 建索引后新增的嵌入超过已索引数量的这一比例时自动重建索引
+ANN_REBUILD_RATIO = 0.25
+
+# 句子编码器后端：PyTorch SentenceTransformer，或导出的 ONNX 模型（float32 / int8 量化）
+ENCODERS = ('torch', 'onnx', 'onnx-int8')
+
+# 量化打分后每个研究兴趣用 float32 精确重算的候选数
+RESCORE_CANDIDATES = 200
+
+# 语义分数与 BM25 词法分数的混合方式：加权求和，或倒数排名融合 (RRF)
+HYBRID_METHODS = (None, 'weighted', 'rrf')
+LEXICAL_WEIGHT = 0.3
+RRF_K = 60
+
+# 级联模式下每个研究兴趣进入语义打分的候选数
+CASCADE_CANDIDATES = 500
+
+# 流式加载时每批的论文数：每批解析完即计算规则分数并编码摘要
+STREAM_BATCH_SIZE = 1024
+
+# 各阶段耗时的显示名称
+STAGE_NAMES = {'rules': '规则', 'lexical': 'BM25', 'semantic': '语义', 'fusion': '融合',
+               'rerank_load': '加载重排模型', 'rerank': '重排'}
+
+# 多兴趣排序的融合方式
+FUSION_METHODS = (None, 'max', 'mean')
+
+# 嵌入缓存目录：按模型名和文本哈希保存已编码的摘要和研究兴趣
+EMBEDDING_CACHE_DIR = '.embedding_cache'
 
 @dataclass
 class Paper:
@@ -22,20 +69,166 @@ class Paper:
     similarity_score: float = 0.0
     rule_score: float = 0.0
     final_score: float = 0.0
+    lexical_score: float = 0.0
+    rerank_score: Optional[float] = None  # 交叉编码器分数，未重排（或超出时间预算）时为 None
+
+def scored_copy(paper, **scores) -> Paper:
+    """带分数的 Paper 副本，paper 可以是 Paper 或 PaperTable 的行视图"""
+    if isinstance(paper, Paper):
+        return replace(paper, **scores)
+    return Paper(title=paper.title, authors=paper.authors, abstract=paper.abstract, url=paper.url, **scores)
+
+
+def embedding_store_name(model_name: str, encoder: str = 'torch') -> str:
+    """嵌入缓存使用的模型名：float32 ONNX 与 PyTorch 的嵌入在容差内一致，共用缓存；int8 量化模型单独缓存"""
+    return f"{model_name}#int8" if encoder == 'onnx-int8' else model_name
+
+
+def _minmax(scores: np.ndarray) -> np.ndarray:
+    """沿最后一维最小-最大归一化到 0-1，全部相同时为 0"""
+    if scores.shape[-1] == 0:
+        return scores.astype(np.float64)
+    low = scores.min(axis=-1, keepdims=True)
+    span = scores.max(axis=-1, keepdims=True) - low
+    return (scores - low) / np.where(span > 0, span, np.inf)
+
+
+def fuse_scores(similarity: np.ndarray, rule: np.ndarray,
+                semantic_weight: float = 0.7, rule_weight: float = 0.3) -> np.ndarray:
+    """
+    归一化并加权合并语义分数和规则分数
+    
+    Args:
+        similarity: 语义相似度，形状 (论文数,) 或 (兴趣数, 论文数)，每行分别归一化
+        rule: 规则分数，形状 (论文数,)
+        semantic_weight: 语义相似度权重
+        rule_weight: 规则分数权重
+        
+    Returns:
+        与 similarity 形状相同的综合分数
+    """
+    similarity = np.asarray(similarity, dtype=np.float64)
+    rule = np.asarray(rule, dtype=np.float64)
+    return semantic_weight * _minmax(similarity) + rule_weight * _minmax(rule)
+
+
+def hybrid_scores(dense: np.ndarray, lexical: np.ndarray, method: str = 'weighted',
+                  lexical_weight: float = LEXICAL_WEIGHT, rrf_k: int = RRF_K) -> np.ndarray:
+    """
+    混合语义分数和 BM25 分数，沿最后一维（论文）进行
+    
+    Args:
+        dense: 语义相似度
+        lexical: BM25 分数，形状与 dense 相同
+        method: 'weighted' 为归一化后加权求和；'rrf' 为倒数排名融合 1 / (rrf_k + 名次)，
+                没有命中任何查询词项的论文不获得词法部分
+        lexical_weight: 词法部分的权重
+        rrf_k: RRF 的平滑常数
+        
+    Returns:
+        与 dense 形状相同的混合分数
+    """
+    dense = np.asarray(dense, dtype=np.float64)
+    lexical = np.asarray(lexical, dtype=np.float64)
+    if method == 'weighted':
+        return (1 - lexical_weight) * _minmax(dense) + lexical_weight * _minmax(lexical)
+    if method != 'rrf':
+        raise ValueError(f"未知的混合方式: {method}")
+    
+    def reciprocal_rank(scores):
+        ranks = np.argsort(np.argsort(-scores, axis=-1, kind='stable'), axis=-1)
+        return 1.0 / (rrf_k + ranks + 1)
+    
+    return ((1 - lexical_weight) * reciprocal_rank(dense)
+            + lexical_weight * np.where(lexical > 0, reciprocal_rank(lexical), 0.0))
+
+
+def cascade_candidates(lexical: np.ndarray, rule: np.ndarray, size: int,
+                       semantic_weight: float = 0.7) -> np.ndarray:
+    """
+    级联的廉价预筛选阶段：用 BM25 分数代替语义分数与规则分数融合，取每个研究兴趣的前 size 篇
+    
+    Args:
+        lexical: BM25 分数，形状 (兴趣数, 论文数)
+        rule: 规则分数，形状 (论文数,)
+        size: 每个研究兴趣的候选数
+        semantic_weight: 语义相似度权重（此处用于 BM25 分数）
+        
+    Returns:
+        所有研究兴趣候选的并集，升序排列的论文下标
+    """
+    prefilter = fuse_scores(lexical, rule, semantic_weight, 1 - semantic_weight)
+    return np.unique(np.concatenate([top_k_indices(row, size) for row in prefilter]))
+
 
 class PaperFilter:
     """论文筛选器类"""
     
-    def __init__(self, model_name: str = 'paraphrase-MiniLM-L6-v2'):
+    def __init__(self, model_name: str = 'paraphrase-MiniLM-L6-v2',
+                 cache_dir: Optional[str] = EMBEDDING_CACHE_DIR,
+                 use_ann: bool = False, nprobe: int = DEFAULT_NPROBE,
+                 ann_candidates: int = ANN_CANDIDATES,
+                 quantization: Optional[str] = None, rescore_candidates: int = RESCORE_CANDIDATES,
+                 encoder: str = 'torch', onnx_dir: Optional[str] = None,
+                 hybrid: Optional[str] = None, lexical_weight: float = LEXICAL_WEIGHT, rrf_k: int = RRF_K,
+                 cascade: Optional[int] = None, rerank_model: Optional[str] = None,
+                 rerank_candidates: int = RERANK_CANDIDATES, rerank_budget: float = RERANK_BUDGET):
         """
         初始化筛选器
         
         Args:
             model_name: 使用的句子嵌入模型名称
+            cache_dir: 嵌入缓存目录，为 None 时每次都重新编码
+            use_ann: 是否用近似最近邻索引代替精确的语义搜索（需要嵌入缓存）
+            nprobe: 近似搜索扫描的簇数，越大召回率越高、速度越慢
+            ann_candidates: 近似搜索为每个研究兴趣取回的候选数
+            quantization: 在 'float16' 或 'int8' 量化嵌入上打分（需要嵌入缓存），None 表示使用 float32
+            rescore_candidates: 量化打分后用 float32 精确重算的候选数
+            encoder: 编码器后端，见 ENCODERS；ONNX 后端不导入 torch
+            onnx_dir: ONNX 模型导出目录，默认 .onnx_models/<模型名>
+            hybrid: 与 BM25 词法检索混合的方式，见 HYBRID_METHODS，None 表示只用语义分数
+            lexical_weight: 混合时词法部分的权重
+            rrf_k: 倒数排名融合的平滑常数
+            cascade: 级联模式的候选数：先用 BM25 和规则分数为每个研究兴趣预筛选这么多篇论文，
+                     只对候选编码和计算语义相似度；None 表示对全部论文计算
+            rerank_model: 交叉编码器模型名称，设置后对融合排序的前 rerank_candidates 篇重排
+            rerank_candidates: 重排的论文数
+            rerank_budget: 每个研究兴趣的重排时间预算（秒），超出后其余论文保持融合顺序
         """
-        print(f"正在加载语义嵌入模型: {model_name}")
-        self.model = SentenceTransformer(model_name)
-        print("模型加载完成!")
+        self.model_name = model_name
+        self._model = None
+        self._matcher = None
+        self.use_ann = use_ann
+        self.nprobe = nprobe
+        self.ann_candidates = ann_candidates
+        self._ann_index = None
+        if quantization not in (None,) + QUANTIZATION_MODES:
+            raise ValueError(f"未知的量化方式: {quantization}")
+        self.quantization = quantization
+        self.rescore_candidates = rescore_candidates
+        self._quantized = None
+        if encoder not in ENCODERS:
+            raise ValueError(f"未知的编码器后端: {encoder}")
+        self.encoder = encoder
+        self.onnx_dir = onnx_dir or (default_onnx_dir(model_name) if encoder != 'torch' else None)
+        if hybrid not in HYBRID_METHODS:
+            raise ValueError(f"未知的混合方式: {hybrid}")
+        self.hybrid = hybrid
+        self.lexical_weight = lexical_weight
+        self.rrf_k = rrf_k
+        self.cascade = cascade
+        self.last_candidates = None
+        self.reranker = CrossEncoderReranker(rerank_model, rerank_budget) if rerank_model else None
+        self.rerank_candidates = rerank_candidates
+        # 最近一次筛选各阶段的耗时（秒）
+        self.stage_timings: Dict[str, float] = {}
+        self.corpus_file = None
+        self._bm25 = None
+        self._bm25_papers = None
+        # update_corpus 得到的 (论文列表, 关键词权重指纹, 规则分数)
+        self._rule_cache = None
+        self.embedding_store = (EmbeddingStore(cache_dir, embedding_store_name(model_name, encoder))
+                                if cache_dir else None)
         
         # 定义关键词权重映射
         self.keyword_weights = {
@@ -87,33 +280,468 @@ class PaperFilter:
         从JSON文件加载论文数据
         
         Args:
-            json_file: JSON文件路径
+            json_file: JSON文件路径（JSON 数组、{'papers': [...]} 或 .jsonl）
             
         Returns:
             论文对象列表
         """
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            papers = []
-            for item in data:
-                paper = Paper(
-                    title=item.get('title', ''),
-                    authors=item.get('authors', ''),
-                    abstract=item.get('abstract', ''),
-                    url=item.get('url', '')
-                )
-                papers.append(paper)
+            papers = list(self.iter_papers(json_file))
             
             print(f"成功加载 {len(papers)} 篇论文")
+            self.corpus_file = json_file
             return papers
             
         except Exception as e:
             print(f"加载JSON文件时出错: {e}")
             return []
     
-    def calculate_semantic_similarity(self, research_interest: str, papers: List[Paper]) -> List[Paper]:
+    def iter_papers(self, json_file: str) -> Iterator[Paper]:
+        """
+        逐篇读取论文，JSON 数组增量解析、JSONL 逐行读取，不会先把整个文件解析成树
+        
+        Args:
+            json_file: JSON文件路径（JSON 数组、{'papers': [...]} 或 .jsonl）
+            
+        Returns:
+            论文对象的生成器
+        """
+        for item in iter_records(json_file):
+            yield Paper(
+                title=item.get('title', ''),
+                authors=item.get('authors', ''),
+                abstract=item.get('abstract', ''),
+                url=item.get('url', '')
+            )
+    
+    def load_paper_table(self, json_file: str) -> Optional[PaperTable]:
+        """
+        从JSON文件加载论文数据为列式的 PaperTable（大规模语料时内存占用远小于 Paper 列表）
+        
+        Args:
+            json_file: JSON文件路径，或二进制语料（文本列直接映射，不解析）
+            
+        Returns:
+            PaperTable，加载失败时返回 None
+        """
+        try:
+            if is_binary_corpus(json_file):
+                table = open_corpus(json_file).table()
+            else:
+                table = PaperTable.from_records(iter_records(json_file))
+            
+            print(f"成功加载 {len(table)} 篇论文")
+            self.corpus_file = json_file
+            return table
+            
+        except Exception as e:
+            print(f"加载JSON文件时出错: {e}")
+            return None
+    
+    def stream_corpus(self, json_file: str, batch_size: int = STREAM_BATCH_SIZE,
+                      encode: bool = True, score_rules: bool = True) -> Optional[PaperTable]:
+        """
+        以生成器流水线加载语料：后台线程逐条解析记录，每凑满一批就计算这批的规则分数，
+        并把嵌入缓存中没有的摘要编码写入缓存，解析与编码重叠进行
+        
+        规则分数留给之后的 rule_scores 直接复用；之后的语义打分只需读取嵌入缓存。
+        二进制语料不需要解析，直接映射为 PaperTable；文件带有同一模型的嵌入块时，缓存中缺少的嵌入从中取得。
+        
+        Args:
+            json_file: JSON文件路径（JSON 数组、{'papers': [...]}、.jsonl 或 .ndssbin）
+            batch_size: 每批的论文数
+            encode: 是否边加载边编码摘要（需要嵌入缓存；纯规则模式或级联模式应关闭）
+            score_rules: 是否边加载边计算规则分数（增量模式应关闭，由 update_corpus 只为变化部分计算）
+            
+        Returns:
+            PaperTable，加载失败时返回 None
+        """
+        encode = encode and self.embedding_store is not None
+        try:
+            if is_binary_corpus(json_file):
+                return self._open_binary_corpus(json_file, encode, score_rules)
+            builder, rules = PaperTableBuilder(), []
+            for records in prefetch(batched(iter_records(json_file), batch_size)):
+                part = PaperTable.from_records(records)
+                if score_rules:
+                    rules.append(self.rule_scores(part))
+                if encode:
+                    self.embedding_store.rows_or_encode(list(part.columns['abstract']), self._encode)
+                builder.append(part)
+            table = builder.build()
+            
+            print(f"成功加载 {len(table)} 篇论文")
+            self.corpus_file = json_file
+            if score_rules:
+                self._rule_cache = (table, rules_fingerprint(self.keyword_weights),
+                                    np.concatenate(rules) if rules else np.zeros(0, dtype=np.float64))
+            return table
+            
+        except Exception as e:
+            print(f"加载JSON文件时出错: {e}")
+            return None
+    
+    def _open_binary_corpus(self, corpus_file: str, encode: bool, score_rules: bool) -> PaperTable:
+        """stream_corpus 的二进制语料分支"""
+        corpus = open_corpus(corpus_file)
+        table = corpus.table()
+        if encode:
+            encode_fn = corpus.cached_encoder(self.embedding_store.model_name, self._encode)
+            self.embedding_store.rows_or_encode(list(table.columns['abstract']), encode_fn)
+        
+        print(f"成功加载 {len(table)} 篇论文")
+        self.corpus_file = corpus_file
+        if score_rules:
+            self._rule_cache = (table, rules_fingerprint(self.keyword_weights), self.rule_scores(table))
+        return table
+    
+    @property
+    def keyword_matcher(self) -> KeywordMatcher:
+        """由 keyword_weights 编译的关键词自动机，关键词变化时自动重建"""
+        if self._matcher is None or self._matcher.keywords != list(self.keyword_weights):
+            self._matcher = KeywordMatcher(self.keyword_weights)
+        return self._matcher
+    
+    @property
+    def ann_index_dir(self) -> str:
+        return os.path.join(self.embedding_store.dir, INDEX_DIRNAME)
+    
+    def build_ann_index(self, nlist: Optional[int] = None) -> IVFIndex:
+        """
+        在嵌入缓存的全部嵌入上建立近似最近邻索引并保存
+        
+        Args:
+            nlist: 簇数，默认约为 4 * sqrt(嵌入数)
+            
+        Returns:
+            新建的索引
+        """
+        if self.embedding_store is None:
+            raise RuntimeError("近似最近邻索引需要启用嵌入缓存")
+        print(f"正在为 {len(self.embedding_store)} 个嵌入建立近似最近邻索引...")
+        self._ann_index = IVFIndex.build(self.embedding_store.matrix, nlist)
+        self._ann_index.save(self.ann_index_dir)
+        print(f"索引建立完成: {self._ann_index.nlist} 个簇")
+        return self._ann_index
+    
+    @property
+    def ann_index(self) -> IVFIndex:
+        """近似最近邻索引：从磁盘加载，不存在或新增嵌入过多时重新建立"""
+        if self._ann_index is None:
+            self._ann_index = IVFIndex.load(self.ann_index_dir)
+        store_rows = len(self.embedding_store)
+        if self._ann_index is None or store_rows - self._ann_index.n_rows > ANN_REBUILD_RATIO * self._ann_index.n_rows:
+            self.build_ann_index()
+        return self._ann_index
+    
+    @property
+    def quantized_embeddings(self) -> QuantizedEmbeddings:
+        """嵌入缓存的量化副本，每次访问时补齐新增的行"""
+        if self._quantized is None:
+            self._quantized = QuantizedEmbeddings(self.embedding_store, self.quantization)
+        else:
+            self._quantized.sync()
+        return self._quantized
+    
+    def bm25_index(self, papers: Papers) -> BM25Index:
+        """
+        论文标题和摘要上的 BM25 索引
+        
+        语料来自 load_papers_from_json 时索引保存在语料文件旁，之后按内容指纹复用；
+        同一个论文列表在本次运行中只加载一次。
+        """
+        if self._bm25 is None or self._bm25_papers is not papers or len(self._bm25) != len(papers):
+            documents = list(zip(column_of(papers, 'title'), column_of(papers, 'abstract')))
+            path = index_path_for(self.corpus_file) if self.corpus_file else None
+            self._bm25 = load_or_build(documents, path)
+            self._bm25_papers = papers
+        return self._bm25
+    
+    def update_corpus(self, papers: Papers) -> CorpusDiff:
+        """
+        与上次运行的语料快照按 url 比较，只为新增和修改的论文重新计算规则分数和 BM25 倒排表
+        
+        嵌入缓存按摘要内容寻址，之后的语义打分同样只会编码新增或修改的摘要。
+        计算结果在本次运行中直接复用，并写回快照和索引文件。
+        
+        Args:
+            papers: 由 load_papers_from_json 加载的论文列表
+            
+        Returns:
+            语料差异
+        """
+        if self.corpus_file is None:
+            raise ValueError("增量更新需要先用 load_papers_from_json 加载语料")
+        snapshot_path = snapshot_path_for(self.corpus_file)
+        snapshot = CorpusSnapshot.load(snapshot_path)
+        titles, abstracts = column_of(papers, 'title'), column_of(papers, 'abstract')
+        documents = list(zip(titles, abstracts))
+        keys = [paper_key(url, title) for url, (title, _) in zip(column_of(papers, 'url'), documents)]
+        digests = [paper_digest(title, abstract) for title, abstract in documents]
+        diff = diff_corpus(snapshot, keys, digests)
+        dirty = bool(diff.added or diff.removed or diff.changed)
+        
+        # 规则分数：关键词权重没有变化时复用未变论文的旧分数
+        rules_key = rules_fingerprint(self.keyword_weights)
+        rules_valid = snapshot is not None and snapshot.rules_fingerprint == rules_key
+        sources = diff.sources if rules_valid else np.full(len(papers), -1, dtype=np.int64)
+        reused = np.flatnonzero(sources >= 0)
+        fresh = np.flatnonzero(sources < 0)
+        rule = np.empty(len(papers), dtype=np.float64)
+        rule[reused] = np.asarray(snapshot.rule_scores, dtype=np.float64)[sources[reused]] if len(reused) else 0.0
+        cache = self._rule_cache
+        if cache is not None and cache[0] is papers and cache[1] == rules_key and len(cache[2]) == len(papers):
+            # 加载时已经算过全部规则分数（stream_corpus 未关闭 score_rules）
+            rule[fresh] = cache[2][fresh]
+        else:
+            self._rule_cache = None
+            rule[fresh] = self.rule_scores(take(papers, fresh))
+        self._rule_cache = (papers, rules_key, rule)
+        
+        # BM25：快照与索引文件对应同一份语料时合并增量，否则完整重建
+        index_path = index_path_for(self.corpus_file)
+        index = BM25Index.load(index_path) if snapshot is not None else None
+        if index is not None and index.fingerprint == snapshot.fingerprint and len(index) == len(snapshot.keys):
+            if dirty:
+                index = index.updated(diff.sources, documents)
+                index.save(index_path)
+        else:
+            index = load_or_build(documents, index_path)
+            dirty = True
+        self._bm25, self._bm25_papers = index, papers
+        
+        if dirty or not rules_valid:
+            CorpusSnapshot(keys, digests, rule.tolist(), rules_key, index.fingerprint).save(snapshot_path)
+        return diff
+    
+    def lexical_scores(self, research_interests: List[str], papers: Papers) -> np.ndarray:
+        """
+        计算每个研究兴趣对所有论文的 BM25 分数
+        
+        Returns:
+            (兴趣数, 论文数) 的分数矩阵
+        """
+        index = self.bm25_index(papers)
+        return np.stack([index.scores(interest) for interest in research_interests]) if research_interests \
+            else np.zeros((0, len(papers)), dtype=np.float32)
+    
+    def _score(self, research_interests: List[str], papers: Papers,
+               semantic_weight: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        计算所有研究兴趣的各项分数
+        
+        启用级联时先由 BM25 和规则分数选出候选，只对候选计算语义相似度，
+        候选之外的论文语义分数记为候选中的最低分（与近似最近邻搜索相同）。
+        
+        Returns:
+            (语义相似度, BM25 分数, 最终分数) 三个 (兴趣数, 论文数) 矩阵，以及 (论文数,) 的规则分数
+        """
+        timings = self.stage_timings = {}
+        start = time.perf_counter()
+        print("正在应用规则筛选...")
+        rule = self.rule_scores(papers)
+        timings['rules'] = time.perf_counter() - start
+        
+        lexical = None
+        if self.hybrid or self.cascade:
+            start = time.perf_counter()
+            print("正在计算 BM25 词法分数...")
+            lexical = self.lexical_scores(research_interests, papers)
+            timings['lexical'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        if self.cascade and self.cascade < len(papers):
+            candidates = cascade_candidates(lexical, rule, self.cascade, semantic_weight)
+            print(f"级联预筛选: {len(candidates)}/{len(papers)} 篇论文进入语义打分")
+            scores = self.calculate_similarity_matrix(research_interests, take(papers, candidates))
+            similarity = np.repeat(scores.min(axis=1, keepdims=True), len(papers), axis=1)
+            similarity[:, candidates] = scores
+        else:
+            candidates = np.arange(len(papers))
+            similarity = self.calculate_similarity_matrix(research_interests, papers)
+        self.last_candidates = candidates
+        timings['semantic'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        if lexical is None:
+            lexical = np.zeros_like(similarity)
+        relevance = (hybrid_scores(similarity, lexical, self.hybrid, self.lexical_weight, self.rrf_k)
+                     if self.hybrid else similarity)
+        final = fuse_scores(relevance, rule, semantic_weight, 1 - semantic_weight)
+        timings['fusion'] = time.perf_counter() - start
+        return similarity, lexical, final, rule
+    
+    def _rank(self, research_interest: Optional[str], papers: Papers, final: np.ndarray,
+              top_k: int) -> Tuple[np.ndarray, List[Optional[float]]]:
+        """
+        按综合分数选出前k篇，启用重排时再用交叉编码器重排前 rerank_candidates 篇
+        
+        Args:
+            research_interest: 研究兴趣，为 None 时（如融合排序）不重排
+            papers: 论文列表
+            final: (论文数,) 综合分数
+            top_k: 返回前k篇
+            
+        Returns:
+            (前k篇论文的下标, 对应的交叉编码器分数，未打分为 None)
+        """
+        if self.reranker is None or research_interest is None or self.rerank_candidates <= 0:
+            return top_k_indices(final, top_k), [None] * min(top_k, len(final))
+        
+        if not self.reranker.loaded and self.reranker.budget > 0:
+            # 模型加载不计入时间预算，单独记录
+            start = time.perf_counter()
+            self.reranker.load()
+            self.stage_timings['rerank_load'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        ranked = top_k_indices(final, max(top_k, self.rerank_candidates))
+        head = ranked[:self.rerank_candidates]
+        scores = self.reranker.score(research_interest, [paper_text(papers[i].title, papers[i].abstract)
+                                                         for i in head])
+        order = rerank_order(scores)
+        ranked = np.concatenate([head[order], ranked[len(head):]])[:top_k]
+        rerank_scores = [float(score) if np.isfinite(score) else None for score in scores[order]]
+        rerank_scores = (rerank_scores + [None] * len(ranked))[:len(ranked)]
+        
+        scored = int(np.isfinite(scores).sum())
+        self.stage_timings['rerank'] = self.stage_timings.get('rerank', 0.0) + time.perf_counter() - start
+        print(f"交叉编码器重排: {scored}/{len(head)} 篇"
+              + ("" if scored == len(head) else "（超出时间预算，其余保持综合排序）"))
+        return ranked, rerank_scores
+    
+    def print_stage_timings(self):
+        """打印最近一次筛选各阶段的耗时"""
+        if self.stage_timings:
+            print("⏱️ 各阶段耗时: " + ", ".join(f"{STAGE_NAMES.get(stage, stage)} {seconds * 1000:.1f} ms"
+                                          for stage, seconds in self.stage_timings.items()))
+    
+    def evaluate_cascade(self, research_interests: List[str], papers: Papers,
+                         top_k: int = 10, semantic_weight: float = 0.7) -> Dict[str, float]:
+        """
+        比较级联模式与完整流程（对全部论文计算语义相似度）的结果
+        
+        Args:
+            research_interests: 研究兴趣列表
+            papers: 论文列表
+            top_k: 比较前k篇论文
+            semantic_weight: 语义相似度权重
+            
+        Returns:
+            统计字典：candidates（候选数）, papers（论文数）,
+            candidate_recall（完整流程的前k篇落在候选中的比例）, top_k_overlap（两种结果前k篇的重合率）
+        """
+        _, _, final, _ = self._score(research_interests, papers, semantic_weight)
+        candidates = self.last_candidates
+        cascade, self.cascade = self.cascade, None
+        try:
+            _, _, full_final, _ = self._score(research_interests, papers, semantic_weight)
+        finally:
+            self.cascade = cascade
+            self.last_candidates = candidates
+        
+        recall, overlap = [], []
+        for row, full_row in zip(final, full_final):
+            expected = top_k_indices(full_row, top_k)
+            recall.append(np.isin(expected, candidates).mean() if len(expected) else 1.0)
+            overlap.append(len(np.intersect1d(expected, top_k_indices(row, top_k))) / max(len(expected), 1))
+        return {'candidates': len(candidates), 'papers': len(papers),
+                'candidate_recall': float(np.mean(recall)), 'top_k_overlap': float(np.mean(overlap))}
+    
+    @property
+    def model(self):
+        """句子嵌入模型，第一次访问时才导入 sentence_transformers（或 onnxruntime）并加载"""
+        if self._model is None:
+            print(f"正在加载语义嵌入模型: {self.model_name} ({self.encoder})")
+            if self.encoder == 'torch':
+                # sentence_transformers（及其依赖的 torch）导入耗时数秒，只在第一次需要编码时才导入，
+                # 纯规则模式和完全命中嵌入缓存的运行都不会加载它们
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.model_name)
+            else:
+                from onnx_encoder import OnnxEncoder
+                self._model = OnnxEncoder(self.onnx_dir, int8=self.encoder == 'onnx-int8')
+            print("模型加载完成!")
+        return self._model
+    
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        编码文本为 L2 归一化的嵌入矩阵，启用缓存时只编码缓存中没有的文本
+        
+        Args:
+            texts: 文本列表
+            
+        Returns:
+            (len(texts), dim) 的 float32 矩阵
+        """
+        if self.embedding_store is None:
+            return self._encode(texts)
+        return self.embedding_store.get_or_encode(texts, self._encode)
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """用模型批量编码文本"""
+        if texts:
+            print(f"正在编码 {len(texts)} 条文本...")
+        return self.model.encode(texts, convert_to_numpy=True, normalize_embeddings=True,
+                                 show_progress_bar=False).astype(np.float32)
+    
+    def calculate_similarity_matrix(self, research_interests: List[str], papers: Papers) -> np.ndarray:
+        """
+        一次性计算多个研究兴趣与所有论文摘要的余弦相似度
+        
+        Args:
+            research_interests: 研究兴趣描述列表
+            papers: 论文列表
+            
+        Returns:
+            (兴趣数, 论文数) 的相似度矩阵
+        """
+        # 编码研究兴趣（同样走缓存，重复查询无需再编码）
+        interest_embeddings = self.encode_texts(research_interests)
+        
+        abstracts = list(column_of(papers, 'abstract'))
+        if self.use_ann and self.embedding_store is not None:
+            return self._approximate_similarity(interest_embeddings, abstracts)
+        if self.quantization and self.embedding_store is not None:
+            return self._quantized_similarity(interest_embeddings, abstracts)
+        
+        # 编码所有论文摘要（只编码缓存中没有的新摘要或已修改的摘要）
+        abstract_embeddings = self.encode_texts(abstracts)
+        
+        # 嵌入已归一化，余弦相似度即一次矩阵乘法
+        return interest_embeddings @ abstract_embeddings.T
+    
+    def _approximate_similarity(self, interest_embeddings: np.ndarray, abstracts: List[str]) -> np.ndarray:
+        """
+        用近似最近邻索引计算相似度矩阵
+        
+        每个研究兴趣只取回 ann_candidates 个最相近的嵌入并得到精确分数，
+        其余论文的分数记为候选中的最低分，归一化后语义分数为 0。
+        """
+        store = self.embedding_store
+        paper_rows = store.rows_or_encode(abstracts, self._encode)
+        index = self.ann_index
+        
+        similarity = np.empty((len(interest_embeddings), len(abstracts)), dtype=np.float32)
+        for n, query in enumerate(interest_embeddings):
+            scores, rows = index.search(query, self.ann_candidates, self.nprobe, matrix=store.matrix)
+            row_scores = np.full(len(store), np.nan, dtype=np.float32)
+            row_scores[rows] = scores
+            found = row_scores[paper_rows]
+            floor = np.nanmin(found) if np.isfinite(found).any() else 0.0
+            similarity[n] = np.where(np.isnan(found), floor, found)
+        return similarity
+    
+    def _quantized_similarity(self, interest_embeddings: np.ndarray, abstracts: List[str]) -> np.ndarray:
+        """
+        在量化嵌入上近似打分，再对每个研究兴趣的前 rescore_candidates 篇用 float32 精确重算
+        """
+        store = self.embedding_store
+        paper_rows = store.rows_or_encode(abstracts, self._encode)
+        scores = self.quantized_embeddings.score(interest_embeddings, paper_rows)
+        return rescore_top(scores, interest_embeddings, store.matrix, paper_rows, self.rescore_candidates)
+    
+    def calculate_semantic_similarity(self, research_interest: str, papers: Papers) -> Papers:
         """
         计算语义相似度
         
@@ -126,60 +754,74 @@ class PaperFilter:
         """
         print("正在计算语义相似度...")
         
-        # 编码研究兴趣
-        interest_embedding = self.model.encode(research_interest, convert_to_tensor=True)
-        
-        # 编码所有论文摘要
-        abstracts = [paper.abstract for paper in papers]
-        abstract_embeddings = self.model.encode(abstracts, convert_to_tensor=True)
-        
-        # 计算余弦相似度
-        cos_scores = util.cos_sim(interest_embedding, abstract_embeddings)[0]
+        cos_scores = self.calculate_similarity_matrix([research_interest], papers)[0]
         
         # 更新论文的相似度分数
-        for i, paper in enumerate(papers):
-            paper.similarity_score = float(cos_scores[i])
+        if isinstance(papers, PaperTable):
+            papers.scores['similarity_score'][:] = cos_scores
+        else:
+            for i, paper in enumerate(papers):
+                paper.similarity_score = float(cos_scores[i])
         
         print("语义相似度计算完成!")
         return papers
     
-    def apply_rule_based_filtering(self, papers: List[Paper]) -> List[Paper]:
+    def rule_scores(self, papers: Papers) -> np.ndarray:
         """
-        应用基于规则的筛选
+        计算每篇论文的关键词规则分数
         
         Args:
             papers: 论文列表
             
         Returns:
-            更新了规则分数的论文列表
+            规则分数数组
         """
-        print("正在应用规则筛选...")
+        cache = self._rule_cache
+        if (cache is not None and cache[0] is papers and len(cache[2]) == len(papers)
+                and cache[1] == rules_fingerprint(self.keyword_weights)):
+            return cache[2]
         
-        for paper in papers:
-            rule_score = 0.0
+        # 关键词按整词匹配（允许复数形式），标题和摘要各扫描一次
+        matcher = self.keyword_matcher
+        weights = [self.keyword_weights[keyword] for keyword in matcher.keywords]
+        
+        scores = np.zeros(len(papers), dtype=np.float64)
+        for n, (title, abstract) in enumerate(zip(column_of(papers, 'title'), column_of(papers, 'abstract'))):
+            title_hits = matcher.find_ids(title)
             
-            # 合并标题和摘要进行关键词匹配
-            text = (paper.title + " " + paper.abstract).lower()
+            # 标题或摘要中出现的关键词计算规则分数
+            rule_score = sum(weights[i] for i in title_hits | matcher.find_ids(abstract))
             
-            # 根据关键词计算规则分数
-            for keyword, weight in self.keyword_weights.items():
-                if keyword in text:
-                    rule_score += weight
-                    
             # 标题中的关键词给予额外权重
-            title_lower = paper.title.lower()
-            for keyword, weight in self.keyword_weights.items():
-                if keyword in title_lower and weight > 0:
-                    rule_score += weight * 0.5  # 标题关键词额外加分
+            rule_score += sum(weights[i] * 0.5 for i in title_hits if weights[i] > 0)  # 标题关键词额外加分
+            
+            scores[n] = rule_score
+        return scores
+    
+    def apply_rule_based_filtering(self, papers: Papers) -> Papers:
+        """
+        应用基于规则的筛选
+        
+        Args:
+            papers: 论文列表
             
-            paper.rule_score = rule_score
+        Returns:
+            更新了规则分数的论文列表
+        """
+        print("正在应用规则筛选...")
+        
+        if isinstance(papers, PaperTable):
+            papers.scores['rule_score'][:] = self.rule_scores(papers)
+        else:
+            for paper, rule_score in zip(papers, self.rule_scores(papers)):
+                paper.rule_score = float(rule_score)
         
         print("规则筛选完成!")
         return papers
     
-    def calculate_final_scores(self, papers: List[Paper], 
+    def calculate_final_scores(self, papers: Papers, 
                              semantic_weight: float = 0.7, 
-                             rule_weight: float = 0.3) -> List[Paper]:
+                             rule_weight: float = 0.3) -> Papers:
         """
         计算最终综合分数
         
@@ -193,58 +835,100 @@ class PaperFilter:
         """
         print("正在计算最终综合分数...")
         
-        # 归一化语义分数到0-1范围
-        semantic_scores = [paper.similarity_score for paper in papers]
-        if semantic_scores:
-            min_sem = min(semantic_scores)
-            max_sem = max(semantic_scores)
-            sem_range = max_sem - min_sem if max_sem != min_sem else 1
-        
-        # 归一化规则分数到0-1范围
-        rule_scores = [paper.rule_score for paper in papers]
-        if rule_scores:
-            min_rule = min(rule_scores)
-            max_rule = max(rule_scores)
-            rule_range = max_rule - min_rule if max_rule != min_rule else 1
-        
-        for paper in papers:
-            # 归一化分数
-            norm_semantic = (paper.similarity_score - min_sem) / sem_range if sem_range > 0 else 0
-            norm_rule = (paper.rule_score - min_rule) / rule_range if rule_range > 0 else 0
-            
-            # 计算加权综合分数
-            paper.final_score = semantic_weight * norm_semantic + rule_weight * norm_rule
+        if isinstance(papers, PaperTable):
+            papers.scores['final_score'][:] = fuse_scores(papers.scores['similarity_score'], papers.scores['rule_score'],
+                                                          semantic_weight, rule_weight)
+        else:
+            similarity = np.array([paper.similarity_score for paper in papers], dtype=np.float64)
+            rule = np.array([paper.rule_score for paper in papers], dtype=np.float64)
+            for paper, final_score in zip(papers, fuse_scores(similarity, rule, semantic_weight, rule_weight)):
+                paper.final_score = float(final_score)
         
         print("最终分数计算完成!")
         return papers
     
-    def filter_and_rank(self, research_interest: str, papers: List[Paper], 
-                       top_k: int = 10, semantic_weight: float = 0.7) -> List[Paper]:
+    def filter_and_rank(self, research_interest: str, papers: Papers, 
+                       top_k: int = 10, semantic_weight: float = 0.7,
+                       rules_only: bool = False) -> List[Paper]:
         """
         完整的筛选和排序流程
         
+        分数全程以数组计算，只为最终的前k篇论文生成带分数的 Paper 副本。
+        
         Args:
             research_interest: 研究兴趣描述
             papers: 论文列表
             top_k: 返回前k篇论文
             semantic_weight: 语义相似度权重
+            rules_only: 只使用规则分数排序，不计算语义相似度（不会加载模型）
             
         Returns:
             排序后的前k篇论文
         """
-        # 计算语义相似度
-        papers = self.calculate_semantic_similarity(research_interest, papers)
+        if rules_only:
+            start = time.perf_counter()
+            print("正在应用规则筛选...")
+            rule = self.rule_scores(papers)
+            self.stage_timings = {'rules': time.perf_counter() - start}
+            similarity = lexical = np.zeros(len(papers), dtype=np.float64)
+            final = fuse_scores(similarity, rule, 0.0, 1.0)
+            research_interest = None
+        else:
+            # 规则分数、语义相似度（以及可选的 BM25 混合和级联预筛选）
+            print("正在计算语义相似度...")
+            similarity, lexical, final, rule = self._score([research_interest], papers, semantic_weight)
+            similarity, lexical, final = similarity[0], lexical[0], final[0]
+        
+        # 选出前k篇（可选交叉编码器重排）
+        ranked, rerank_scores = self._rank(research_interest, papers, final, top_k)
+        self.print_stage_timings()
+        return [scored_copy(papers[i], similarity_score=float(similarity[i]), rule_score=float(rule[i]),
+                        lexical_score=float(lexical[i]), final_score=float(final[i]), rerank_score=score)
+                for i, score in zip(ranked, rerank_scores)]
+    
+    def filter_and_rank_multi(self, research_interests: List[str], papers: Papers,
+                              top_k: int = 10, semantic_weight: float = 0.7,
+                              fusion: Optional[str] = None) -> Tuple[List[List[Paper]], Optional[List[Paper]]]:
+        """
+        一次性为多个研究兴趣筛选和排序
         
-        # 应用规则筛选
-        papers = self.apply_rule_based_filtering(papers)
+        所有兴趣在一个批次中编码，相似度由一次矩阵乘法得到；规则分数与兴趣无关，只计算一次。
         
-        # 计算最终分数
-        papers = self.calculate_final_scores(papers, semantic_weight, 1 - semantic_weight)
+        Args:
+            research_interests: 研究兴趣描述列表
+            papers: 论文列表
+            top_k: 每个兴趣返回前k篇论文
+            semantic_weight: 语义相似度权重
+            fusion: 融合排序方式，'max' 或 'mean'，为 None 时不生成融合排序
+            
+        Returns:
+            (每个兴趣的前k篇论文列表，与 research_interests 顺序一致（重复的兴趣各有一份）,
+             融合后的前k篇论文或 None)；返回的论文是原论文的副本，分数对应各自的兴趣
+        """
+        if fusion not in FUSION_METHODS:
+            raise ValueError(f"未知的融合方式: {fusion}")
         
-        # 按最终分数排序
-        papers.sort(key=lambda x: x.final_score, reverse=True)
+        print(f"正在为 {len(research_interests)} 个研究兴趣计算语义相似度...")
+        # 与 calculate_final_scores 相同的最小-最大归一化，按行对每个兴趣分别进行
+        similarity, lexical, final, rule = self._score(research_interests, papers, semantic_weight)
         
-        return papers[:top_k]
+        def top_papers(interest, sim_row, lexical_row, final_row) -> List[Paper]:
+            ranked, rerank_scores = self._rank(interest, papers, final_row, top_k)
+            return [scored_copy(papers[i], similarity_score=float(sim_row[i]), rule_score=float(rule[i]),
+                            lexical_score=float(lexical_row[i]), final_score=float(final_row[i]),
+                            rerank_score=score)
+                    for i, score in zip(ranked, rerank_scores)]
+        
+        per_interest = [top_papers(interest, similarity[n], lexical[n], final[n])
+                        for n, interest in enumerate(research_interests)]
+        
+        fused = None
+        if fusion is not None:
+            reduce = np.max if fusion == 'max' else np.mean
+            fused = top_papers(None, reduce(similarity, axis=0), reduce(lexical, axis=0), reduce(final, axis=0))
+        
+        self.print_stage_timings()
+        return per_interest, fused
     
     def print_results(self, papers: List[Paper], show_scores: bool = True):
         """
@@ -266,7 +950,11 @@ class PaperFilter:
             if show_scores:
                 print(f"语义相似度: {paper.similarity_score:.4f}")
                 print(f"规则分数: {paper.rule_score:.2f}")
+                if self.hybrid:
+                    print(f"BM25 分数: {paper.lexical_score:.2f}")
                 print(f"综合分数: {paper.final_score:.4f}")
+                if paper.rerank_score is not None:
+                    print(f"重排分数: {paper.rerank_score:.4f}")
             
             # 显示摘要前200个字符
             abstract_preview = paper.abstract[:200] + "..." if len(paper.abstract) > 200 else paper.abstract
@@ -291,7 +979,9 @@ class PaperFilter:
                 'url': paper.url,
                 'similarity_score': paper.similarity_score,
                 'rule_score': paper.rule_score,
-                'final_score': paper.final_score
+                'final_score': paper.final_score,
+                'lexical_score': paper.lexical_score,
+                'rerank_score': paper.rerank_score
             })
         
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -300,21 +990,129 @@ class PaperFilter:
         print(f"\n结果已导出到: {output_file}")
 
 
+def _interest_path(path: str, n: int) -> str:
+    """
+    第 n 个兴趣的结果文件，例如 filtered_papers.json -> filtered_papers.interest-1.json
+    
+    不使用 filtered_papers_<n>.json，以免与 paper_viewer 查找的 filtered_papers_10.json 等文件名冲突。
+    """
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.interest-{n}{ext}"
+
+
+def run_multi_interest(filter_system: PaperFilter, research_interests: List[str], papers: Papers,
+                       top_k: int, fusion: Optional[str], output_file: str):
+    """
+    多兴趣批量筛选：每个兴趣的结果导出为带序号的文件，融合排序导出为 output_file
+    
+    Args:
+        filter_system: 筛选器
+        research_interests: 研究兴趣列表
+        papers: 论文列表
+        top_k: 每个兴趣返回前k篇论文
+        fusion: 融合方式，None 表示不融合
+        output_file: 输出文件路径
+    """
+    print(f"🎯 批量筛选 {len(research_interests)} 个研究兴趣")
+    per_interest, fused = filter_system.filter_and_rank_multi(
+        research_interests, papers, top_k=top_k, semantic_weight=0.7, fusion=fusion)
+    
+    for n, (interest, top_papers) in enumerate(zip(research_interests, per_interest), 1):
+        print(f"\n🔎 [{n}] {interest}")
+        for rank, paper in enumerate(top_papers[:5], 1):
+            print(f"   {rank}. ({paper.final_score:.4f}) {paper.title}")
+        filter_system.export_results(top_papers, _interest_path(output_file, n))
+    
+    if fused is not None:
+        print(f"\n🔗 融合排序 ({fusion})")
+        filter_system.print_results(fused)
+        filter_system.export_results(fused, output_file)
+    
+    print(f"\n✅ 筛选完成! 从 {len(papers)} 篇论文中为 {len(per_interest)} 个研究兴趣各推荐了 {top_k} 篇论文。")
+
+
 def main():
     """主函数 - 演示使用方法"""
+    parser = argparse.ArgumentParser(description="NDSS 2025 论文智能筛选器")
+    parser.add_argument('--input', default='ndss_papers_2025.json', help="论文数据文件（JSON 数组、JSONL 或 .ndssbin 二进制语料）")
+    parser.add_argument('--output', default='filtered_papers.json', help="筛选结果输出文件")
+    parser.add_argument('--top-k', type=int, default=100, help="返回前多少篇论文")
+    parser.add_argument('--rules-only', action='store_true',
+                        help="只按关键词规则评分，不加载语义模型（启动最快）")
+    parser.add_argument('--cache-dir', default=EMBEDDING_CACHE_DIR, help="嵌入缓存目录")
+    parser.add_argument('--no-cache', action='store_true', help="不使用嵌入缓存")
+    parser.add_argument('--interests', nargs='+', default=None,
+                        help="一个或多个研究兴趣，多个兴趣会在同一批次中一起排序")
+    parser.add_argument('--all-interests', action='store_true',
+                        help="使用代码中 research_interests 列表里的全部研究兴趣")
+    parser.add_argument('--fusion', choices=['max', 'mean'], default=None,
+                        help="多兴趣时额外输出按各兴趣分数取最大值/平均值融合的排序")
+    parser.add_argument('--ann', action='store_true',
+                        help="使用近似最近邻索引代替精确语义搜索（适合大规模语料）")
+    parser.add_argument('--nprobe', type=int, default=DEFAULT_NPROBE,
+                        help="近似搜索扫描的簇数，越大召回率越高、速度越慢")
+    parser.add_argument('--ann-candidates', type=int, default=ANN_CANDIDATES,
+                        help="近似搜索为每个研究兴趣取回的候选数")
+    parser.add_argument('--build-ann', action='store_true', help="编码全部摘要后重新建立近似最近邻索引")
+    parser.add_argument('--nlist', type=int, default=None, help="重建索引时的簇数，默认约为 4 * sqrt(嵌入数)")
+    parser.add_argument('--encoder', choices=ENCODERS, default='torch',
+                        help="编码器后端；onnx / onnx-int8 需先运行 python onnx_encoder.py 导出模型")
+    parser.add_argument('--hybrid', choices=['weighted', 'rrf'], default=None,
+                        help="与 BM25 词法检索混合：加权求和或倒数排名融合")
+    parser.add_argument('--lexical-weight', type=float, default=LEXICAL_WEIGHT, help="混合时 BM25 部分的权重")
+    parser.add_argument('--rrf-k', type=int, default=RRF_K, help="倒数排名融合的平滑常数")
+    parser.add_argument('--cascade', type=int, nargs='?', const=CASCADE_CANDIDATES, default=None,
+                        help=f"级联模式：先用 BM25 和规则分数预筛选候选（默认每个兴趣 {CASCADE_CANDIDATES} 篇），"
+                             "只对候选计算语义相似度")
+    parser.add_argument('--cascade-check', action='store_true',
+                        help="同时运行完整流程，报告级联候选的召回率和前k篇的重合率")
+    parser.add_argument('--rerank', nargs='?', const=DEFAULT_RERANK_MODEL, default=None, metavar='MODEL',
+                        help=f"用交叉编码器重排综合排序的前若干篇（默认模型 {DEFAULT_RERANK_MODEL}）")
+    parser.add_argument('--rerank-candidates', type=int, default=RERANK_CANDIDATES, help="重排的论文数")
+    parser.add_argument('--rerank-budget', type=float, default=RERANK_BUDGET,
+                        help="每个研究兴趣的重排时间预算（秒），超出后其余论文保持综合排序")
+    parser.add_argument('--incremental', action='store_true',
+                        help="与上次运行的语料快照按 url 比较，只为新增和修改的论文重新计算规则分数和 BM25 索引")
+    parser.add_argument('--quantize', choices=QUANTIZATION_MODES, default=None,
+                        help="在 float16 / int8 量化嵌入上打分以减少内存占用")
+    parser.add_argument('--rescore', type=int, default=RESCORE_CANDIDATES,
+                        help="量化打分后用 float32 精确重算的候选数")
+    args = parser.parse_args()
+    
     print("🚀 NDSS 2025 论文智能筛选器")
     print("="*50)
     
-    # 初始化筛选器
-    filter_system = PaperFilter()
+    # 初始化筛选器（模型在第一次需要编码时才加载）
+    filter_system = PaperFilter(cache_dir=None if args.no_cache else args.cache_dir,
+                                use_ann=args.ann, nprobe=args.nprobe, ann_candidates=args.ann_candidates,
+                                quantization=args.quantize, rescore_candidates=args.rescore,
+                                encoder=args.encoder, hybrid=args.hybrid, lexical_weight=args.lexical_weight,
+                                rrf_k=args.rrf_k, cascade=args.cascade, rerank_model=args.rerank,
+                                rerank_candidates=args.rerank_candidates, rerank_budget=args.rerank_budget)
     
     # 加载论文数据
-    papers = filter_system.load_papers_from_json('ndss_papers_2025.json')
+    # 边解析边计算规则分数、编码摘要；纯规则模式不需要嵌入，级联模式只编码候选，
+    # 增量模式由 update_corpus 只为新增和修改的论文计算
+    papers = filter_system.stream_corpus(args.input,
+                                         encode=not args.rules_only and not args.cascade and not args.incremental,
+                                         score_rules=not args.incremental)
     
     if not papers:
         print("❌ 未能加载论文数据，请检查JSON文件")
         return
     
+    if args.incremental:
+        start = time.perf_counter()
+        diff = filter_system.update_corpus(papers)
+        print(f"🔄 增量更新: {diff.summary()}，用时 {(time.perf_counter() - start) * 1000:.1f} ms")
+    
+    if args.build_ann:
+        if filter_system.embedding_store is None:
+            print("❌ 建立近似最近邻索引需要启用嵌入缓存")
+            return
+        filter_system.encode_texts(list(column_of(papers, 'abstract')))
+        filter_system.build_ann_index(args.nlist)
+    
     # 设置默认研究兴趣 - 您可以在这里修改为您感兴趣的领域
     default_research_interest = "zero-knowledge proofs, chameleon hash functions, public key cryptography, digital signatures, and cryptographic protocols"
     
@@ -327,11 +1125,31 @@ def main():
         "lattice-based cryptography and post-quantum security",
     ]
     
+    if args.all_interests:
+        args.interests = research_interests
+    if args.cascade_check and not args.rules_only:
+        if not args.cascade:
+            print("❌ --cascade-check 需要同时指定 --cascade")
+            return
+        stats = filter_system.evaluate_cascade(args.interests or [default_research_interest], papers, args.top_k)
+        print(f"📊 级联候选 {stats['candidates']}/{stats['papers']} 篇: 完整流程前{args.top_k}篇的候选召回率 "
+              f"{stats['candidate_recall']:.3f}, 前{args.top_k}篇重合率 {stats['top_k_overlap']:.3f}")
+    if args.interests and len(args.interests) > 1 and not args.rules_only:
+        try:
+            run_multi_interest(filter_system, args.interests, papers, args.top_k, args.fusion, args.output)
+        except KeyboardInterrupt:
+            print("\n\n👋 用户取消操作")
+        except Exception as e:
+            print(f"\n❌ 程序执行出错: {e}")
+        return
+    
     # 使用默认研究兴趣
-    research_interest = default_research_interest
-    print(f"🎯 使用默认研究兴趣: {research_interest}")
-    print("💡 如需修改研究兴趣，请编辑代码中的 default_research_interest 变量")
+    research_interest = args.interests[0] if args.interests else default_research_interest
+    print(f"🎯 使用研究兴趣: {research_interest}")
+    print("💡 如需修改研究兴趣，请使用 --interests 参数或编辑代码中的 default_research_interest 变量")
     print("🔐 当前偏好: 零知识证明、变色龙哈希、公钥密码学相关论文")
+    if args.rules_only:
+        print("⚡ 纯规则模式: 跳过语义相似度计算")
     
     try:
         
@@ -339,15 +1157,16 @@ def main():
         top_papers = filter_system.filter_and_rank(
             research_interest=research_interest,
             papers=papers,
-            top_k=100,  # 返回前10篇
-            semantic_weight=0.7  # 语义相似度权重70%，规则权重30%
+            top_k=args.top_k,
+            semantic_weight=0.7,  # 语义相似度权重70%，规则权重30%
+            rules_only=args.rules_only
         )
         
         # 显示结果
         filter_system.print_results(top_papers)
         
         # 导出结果
-        output_file = f"filtered_papers.json"
+        output_file = args.output
         filter_system.export_results(top_papers, output_file)
         
         print(f"\n✅ 筛选完成! 从 {len(papers)} 篇论文中为您推荐了 {len(top_papers)} 篇最相关的论文。")
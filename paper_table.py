@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+列式论文表 - 代替逐篇的 Paper 对象保存大规模语料
+文本列以 UTF-8 字节区 + 偏移数组保存（每篇只占两个整数的额外空间），分数列是 NumPy 数组，
+按下标访问得到 __slots__ 行视图，属性读写与 Paper 相同
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+STRING_FIELDS = ('title', 'authors', 'abstract', 'url')
+SCORE_FIELDS = ('similarity_score', 'rule_score', 'final_score', 'lexical_score', 'rerank_score')
+
+
+class StringColumn(Sequence):
+    """
+    字符串列：所有字符串的 UTF-8 编码首尾相接存于 data，第 i 个为 data[offsets[i]:offsets[i + 1]]
+
+    data 和 offsets 可以是普通数组，也可以是内存映射。
+    """
+
+    __slots__ = ('data', 'offsets', '_view')
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+        self._view = memoryview(data) if len(data) else memoryview(b'')
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> 'StringColumn':
+        """由字符串序列构造"""
+        encoded = [s.encode('utf-8') for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.take(np.arange(len(self))[i])
+        if i < 0:
+            i += len(self)
+        return str(self._view[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        view = self._view
+        bounds = self.offsets.tolist()
+        for start, end in zip(bounds, bounds[1:]):
+            yield str(view[start:end], 'utf-8')
+
+    def take(self, indices: np.ndarray) -> 'StringColumn':
+        """按下标取出若干字符串组成新列（向量化拷贝字节）"""
+        indices = np.asarray(indices, dtype=np.int64)
+        starts = self.offsets[indices]
+        lengths = self.offsets[indices + 1] - starts
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return StringColumn(np.asarray(self.data)[positions], offsets)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + self.offsets.nbytes
+
+
+def _string_field(name: str) -> property:
+    def get(row):
+        return row.table.columns[name][row.index]
+    return property(get, doc=f"{name}（只读）")
+
+
+def _score_field(name: str) -> property:
+    def get(row):
+        return float(row.table.scores[name][row.index])
+
+    def set_(row, value):
+        row.table.scores[name][row.index] = value
+    return property(get, set_, doc=f"{name}，写入时直接更新表中的分数列")
+
+
+class PaperRow:
+    """PaperTable 中一篇论文的轻量视图，只保存表和下标"""
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table: 'PaperTable', index: int):
+        self.table = table
+        self.index = index
+
+    title = _string_field('title')
+    authors = _string_field('authors')
+    abstract = _string_field('abstract')
+    url = _string_field('url')
+    similarity_score = _score_field('similarity_score')
+    rule_score = _score_field('rule_score')
+    final_score = _score_field('final_score')
+    lexical_score = _score_field('lexical_score')
+
+    @property
+    def rerank_score(self) -> Optional[float]:
+        """交叉编码器分数，表中以 NaN 表示 None"""
+        value = self.table.scores['rerank_score'][self.index]
+        return None if np.isnan(value) else float(value)
+
+    @rerank_score.setter
+    def rerank_score(self, value: Optional[float]):
+        self.table.scores['rerank_score'][self.index] = np.nan if value is None else value
+
+    def __repr__(self) -> str:
+        return f"PaperRow({self.index}, title={self.title!r})"
+
+
+class PaperTable:
+    """
+    列式论文表
+
+    columns: 文本列（title, authors, abstract, url）
+    scores: 分数列（float64 数组，与论文一一对应）
+    """
+
+    def __init__(self, columns: Dict[str, StringColumn], scores: Optional[Dict[str, np.ndarray]] = None):
+        self.columns = columns
+        size = len(columns['title'])
+        self.scores = scores or {}
+        for name in SCORE_FIELDS:
+            if name not in self.scores:
+                self.scores[name] = np.full(size, np.nan if name == 'rerank_score' else 0.0, dtype=np.float64)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> 'PaperTable':
+        """
+        由字典记录（论文 JSON 中的条目）构造
+
+        Args:
+            records: 含 title / authors / abstract / url 的字典，缺少的字段为空字符串
+        """
+        # 单次遍历，记录可以来自生成器；每列的字节直接追加到一个 bytearray 中
+        arenas = {name: bytearray() for name in STRING_FIELDS}
+        lengths: Dict[str, List[int]] = {name: [] for name in STRING_FIELDS}
+        for record in records:
+            for name in STRING_FIELDS:
+                encoded = (record.get(name, '') or '').encode('utf-8')
+                arenas[name] += encoded
+                lengths[name].append(len(encoded))
+
+        columns = {}
+        for name in STRING_FIELDS:
+            offsets = np.zeros(len(lengths[name]) + 1, dtype=np.int64)
+            np.cumsum(lengths[name], out=offsets[1:])
+            columns[name] = StringColumn(np.frombuffer(arenas[name], dtype=np.uint8), offsets)
+        return cls(columns)
+
+    @classmethod
+    def from_papers(cls, papers: Sequence) -> 'PaperTable':
+        """由 Paper 对象（或任何有相同属性的对象）构造，保留分数"""
+        table = cls({name: StringColumn.from_strings(getattr(paper, name) for paper in papers)
+                     for name in STRING_FIELDS})
+        for name in SCORE_FIELDS:
+            table.scores[name][:] = [np.nan if getattr(paper, name) is None else getattr(paper, name)
+                                     for paper in papers]
+        return table
+
+    def __len__(self) -> int:
+        return len(self.columns['title'])
+
+    def __getitem__(self, i: int) -> PaperRow:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return PaperRow(self, i)
+
+    def __iter__(self) -> Iterator[PaperRow]:
+        return (PaperRow(self, i) for i in range(len(self)))
+
+    def take(self, indices: np.ndarray) -> 'PaperTable':
+        """按下标取出若干论文组成新表（文本和分数都是拷贝）"""
+        indices = np.asarray(indices, dtype=np.int64)
+        return PaperTable({name: column.take(indices) for name, column in self.columns.items()},
+                          {name: scores[indices] for name, scores in self.scores.items()})
+
+    @property
+    def nbytes(self) -> int:
+        """文本列和分数列占用的字节数"""
+        return (sum(column.nbytes for column in self.columns.values())
+                + sum(scores.nbytes for scores in self.scores.values()))
+
+
+class PaperTableBuilder:
+    """
+    逐批追加论文，最后得到整张 PaperTable
+
+    文本直接追加到每列一个可增长的 bytearray 中，追加后各批的表即可释放，
+    峰值内存约为最终表的大小，而不是各批与拼接结果之和。
+    """
+
+    def __init__(self):
+        self._arenas = {name: bytearray() for name in STRING_FIELDS}
+        self._offsets = {name: [np.zeros(1, dtype=np.int64)] for name in STRING_FIELDS}
+        self._scores: Dict[str, List[np.ndarray]] = {name: [] for name in SCORE_FIELDS}
+
+    def append(self, table: PaperTable):
+        """追加一批论文（文本和分数都被拷贝）"""
+        for name in STRING_FIELDS:
+            column, arena = table.columns[name], self._arenas[name]
+            self._offsets[name].append(column.offsets[1:] + len(arena))
+            arena += memoryview(np.ascontiguousarray(column.data))
+        for name in SCORE_FIELDS:
+            self._scores[name].append(table.scores[name])
+
+    def build(self) -> PaperTable:
+        columns = {name: StringColumn(np.frombuffer(self._arenas[name], dtype=np.uint8),
+                                      np.concatenate(self._offsets[name]))
+                   for name in STRING_FIELDS}
+        scores = {name: np.concatenate(parts) if parts else np.zeros(0, dtype=np.float64)
+                  for name, parts in self._scores.items()}
+        return PaperTable(columns, scores)
+
+
+Papers = Union[List, PaperTable]
+
+
+def column_of(papers: Papers, name: str) -> Sequence[str]:
+    """论文列表或 PaperTable 的一列文本（PaperTable 直接返回文本列，不构造行视图）"""
+    if isinstance(papers, PaperTable):
+        return papers.columns[name]
+    return [getattr(paper, name) for paper in papers]
+
+
+def take(papers: Papers, indices: np.ndarray) -> Papers:
+    """论文列表或 PaperTable 的子集"""
+    if isinstance(papers, PaperTable):
+        return papers.take(indices)
+    return [papers[i] for i in indices]
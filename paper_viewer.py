@@ -11,6 +11,11 @@ import webbrowser
 import threading
 import time
 
+from corpus_binary import is_binary_corpus, open_corpus
+
+# 页面用到的字段；二进制语料只读取这些字段
+VIEWER_FIELDS = ('title', 'authors', 'abstract', 'url', 'similarity_score', 'rule_score', 'final_score')
+
 class PaperViewer:
     """论文结果查看器"""
     
@@ -19,7 +24,7 @@ class PaperViewer:
         初始化查看器
         
         Args:
-            json_file: JSON结果文件路径
+            json_file: JSON结果文件路径（也可以是 corpus_binary.py 转换的 .ndssbin 文件）
         """
         self.json_file = json_file
         self.papers = []
@@ -28,8 +33,11 @@ class PaperViewer:
     def load_papers(self):
         """加载论文数据"""
         try:
-            with open(self.json_file, 'r', encoding='utf-8') as f:
-                self.papers = json.load(f)
+            if is_binary_corpus(self.json_file):
+                self.papers = list(open_corpus(self.json_file).iter_records(VIEWER_FIELDS))
+            else:
+                with open(self.json_file, 'r', encoding='utf-8') as f:
+                    self.papers = json.load(f)
             print(f"✅ 成功加载 {len(self.papers)} 篇论文数据")
         except FileNotFoundError:
             print(f"❌ 未找到文件: {self.json_file}")
@@ -760,7 +768,10 @@ def main():
     json_files = [
         "filtered_papers_10.json",
         "filtered_papers_5.json", 
-        "filtered_papers.json"
+        "filtered_papers.json",
+        "filtered_papers_10.ndssbin",
+        "filtered_papers_5.ndssbin",
+        "filtered_papers.ndssbin"
     ]
     
     json_file = None
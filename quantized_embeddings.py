@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+量化嵌入 - 嵌入缓存的 float16 / int8（逐向量缩放）紧凑副本
+先在量化矩阵上分块做近似打分，再只对每个查询分数最高的候选用 float32 原始嵌入精确重算，
+内存占用分别降为 float32 的 1/2 和约 1/4
+"""
+
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+from embedding_store import EmbeddingStore
+
+QUANTIZATION_MODES = ('float16', 'int8')
+
+# 近似打分时每次转换为 float32 的行数，保持临时缓冲区在 CPU 缓存量级
+SCORE_CHUNK = 4096
+
+
+def quantize(matrix: np.ndarray, mode: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    量化嵌入矩阵
+
+    Args:
+        matrix: (n, dim) float32 矩阵
+        mode: 'float16' 或 'int8'
+
+    Returns:
+        (量化数据, 逐行缩放系数)；float16 没有缩放系数
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if mode == 'float16':
+        return matrix.astype(np.float16), None
+    if mode == 'int8':
+        # 对称量化：每行的最大绝对值映射到 127
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        safe = np.where(scales > 0, scales, 1.0)[:, None]
+        return np.clip(np.rint(matrix / safe), -127, 127).astype(np.int8), scales.astype(np.float32)
+    raise ValueError(f"未知的量化方式: {mode}")
+
+
+class QuantizedEmbeddings:
+    """
+    与 EmbeddingStore 行号一一对应的量化副本
+
+    量化是逐行独立的，因此和原始嵌入一样只需追加：sync() 只量化缓存中新增的行。
+    文件位于模型子目录中：embeddings.<mode>，int8 另有 scales.f32。
+    """
+
+    def __init__(self, store: EmbeddingStore, mode: str):
+        """
+        打开（必要时补齐）量化副本
+
+        Args:
+            store: 原始嵌入缓存
+            mode: 'float16' 或 'int8'
+        """
+        if mode not in QUANTIZATION_MODES:
+            raise ValueError(f"未知的量化方式: {mode}")
+        self.store = store
+        self.mode = mode
+        self.dtype = np.float16 if mode == 'float16' else np.int8
+        self.data_path = os.path.join(store.dir, f'embeddings.{mode}')
+        self.scales_path = os.path.join(store.dir, 'scales.f32') if mode == 'int8' else None
+        self._data = None
+        self._scales = None
+        self.sync()
+
+    def _stored_rows(self) -> int:
+        if not self.store.dim or not os.path.exists(self.data_path):
+            return 0
+        rows = os.path.getsize(self.data_path) // (np.dtype(self.dtype).itemsize * self.store.dim)
+        if self.scales_path is not None:
+            rows = min(rows, os.path.getsize(self.scales_path) // 4 if os.path.exists(self.scales_path) else 0)
+        return rows
+
+    def sync(self):
+        """量化并追加嵌入缓存中尚未量化的行"""
+        done, total = self._stored_rows(), len(self.store)
+        if done < total:
+            data, scales = quantize(self.store.matrix[done:total], self.mode)
+            # 截掉上次中断时可能多写的部分，再追加
+            for path, array, itemsize in ((self.data_path, data, data.itemsize * self.store.dim),
+                                          (self.scales_path, scales, 4)):
+                if path is None:
+                    continue
+                with open(path, 'ab') as f:
+                    f.truncate(done * itemsize)
+                    f.write(np.ascontiguousarray(array).tobytes())
+        self._data = None
+        self._scales = None
+
+    @property
+    def data(self) -> np.ndarray:
+        """量化矩阵的只读内存映射 (N, dim)"""
+        if self._data is None:
+            rows = len(self.store)
+            self._data = (np.memmap(self.data_path, dtype=self.dtype, mode='r', shape=(rows, self.store.dim))
+                          if rows else np.zeros((0, self.store.dim or 0), dtype=self.dtype))
+        return self._data
+
+    @property
+    def scales(self) -> Optional[np.ndarray]:
+        if self.scales_path is not None and self._scales is None:
+            rows = len(self.store)
+            self._scales = (np.memmap(self.scales_path, dtype=np.float32, mode='r', shape=(rows,))
+                            if rows else np.zeros(0, dtype=np.float32))
+        return self._scales
+
+    @property
+    def nbytes(self) -> int:
+        """量化数据占用的字节数（含缩放系数）"""
+        return self.data.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def score(self, queries: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        在量化矩阵上近似计算内积
+
+        Args:
+            queries: (m, dim) float32 查询矩阵
+            rows: 只对这些行打分，默认全部行
+
+        Returns:
+            (m, len(rows)) float32 近似分数
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        count = len(self.data) if rows is None else len(rows)
+        scores = np.empty((len(queries), count), dtype=np.float32)
+        for start in range(0, count, SCORE_CHUNK):
+            end = min(start + SCORE_CHUNK, count)
+            index = slice(start, end) if rows is None else rows[start:end]
+            block = self.data[index].astype(np.float32) @ queries.T
+            if self.scales is not None:
+                block *= self.scales[index][:, None]
+            scores[:, start:end] = block.T
+        return scores
+
+
+def rescore_top(scores: np.ndarray, queries: np.ndarray, matrix: np.ndarray, rows: np.ndarray,
+                candidates: int) -> np.ndarray:
+    """
+    用 float32 原始嵌入精确重算每个查询近似分数最高的候选
+
+    Args:
+        scores: (m, n) 近似分数，原地更新
+        queries: (m, dim) 查询矩阵
+        matrix: float32 嵌入矩阵
+        rows: 长度为 n 的数组，第 j 列对应 matrix 的行号
+        candidates: 每个查询重算的候选数
+
+    Returns:
+        更新后的 scores
+    """
+    candidates = min(candidates, scores.shape[1])
+    if candidates <= 0:
+        return scores
+    for n, query in enumerate(np.asarray(queries, dtype=np.float32)):
+        top = np.argpartition(-scores[n], candidates - 1)[:candidates]
+        order = np.argsort(rows[top])  # 按行号顺序读取内存映射
+        top = top[order]
+        scores[n, top] = np.asarray(matrix[rows[top]]) @ query
+    return scores
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+交叉编码器重排 - 对融合排序的前 M 篇论文按 (研究兴趣, 标题+摘要) 成对打分
+按融合排名从高到低分批打分，预计超出时间预算时提前停止；已打分的论文按交叉编码器分数重排，
+未打分的论文保持融合分数的顺序排在其后
+"""
+
+import time
+from typing import List
+
+import numpy as np
+
+DEFAULT_RERANK_MODEL = 'cross-encoder/ms-marco-MiniLM-L-6-v2'
+# 默认重排融合排序的前多少篇
+RERANK_CANDIDATES = 50
+# 每个研究兴趣的重排时间预算（秒，不含模型加载）
+RERANK_BUDGET = 2.0
+RERANK_BATCH_SIZE = 16
+
+
+def paper_text(title: str, abstract: str) -> str:
+    """交叉编码器的文档输入：标题 + 摘要"""
+    return f"{title}. {abstract}" if title else abstract
+
+
+def rerank_order(scores: np.ndarray) -> np.ndarray:
+    """
+    重排后的顺序
+
+    Args:
+        scores: 按融合排名排列的交叉编码器分数，未打分的为 NaN（打分按排名进行，NaN 只出现在末尾）
+
+    Returns:
+        下标排列：已打分的部分按分数降序（同分保持融合顺序），未打分的部分保持原顺序
+    """
+    scored = int(np.isfinite(scores).sum())
+    head = np.argsort(-scores[:scored], kind='stable')
+    return np.concatenate([head, np.arange(scored, len(scores))]).astype(np.int64)
+
+
+class CrossEncoderReranker:
+    """CPU 交叉编码器重排器，模型在第一次打分时才加载"""
+
+    def __init__(self, model_name: str = DEFAULT_RERANK_MODEL, budget: float = RERANK_BUDGET,
+                 batch_size: int = RERANK_BATCH_SIZE):
+        """
+        初始化重排器
+
+        Args:
+            model_name: 交叉编码器模型名称或路径
+            budget: 每次打分的时间预算（秒），<= 0 表示不打分、全部保持融合顺序
+            batch_size: 批大小
+        """
+        self.model_name = model_name
+        self.budget = budget
+        self.batch_size = batch_size
+        self._model = None
+
+    @property
+    def model(self):
+        """交叉编码器模型，第一次访问时才导入 sentence_transformers 并加载"""
+        if self._model is None:
+            print(f"正在加载交叉编码器: {self.model_name}")
+            from sentence_transformers import CrossEncoder
+            self._model = CrossEncoder(self.model_name, device='cpu')
+        return self._model
+
+    @property
+    def loaded(self) -> bool:
+        """模型是否已经加载"""
+        return self._model is not None
+
+    def load(self):
+        """加载模型（已加载时什么也不做），用于把加载耗时与打分的时间预算分开"""
+        self.model
+
+    def score(self, query: str, documents: List[str]) -> np.ndarray:
+        """
+        按顺序分批为 (query, 文档) 打分，直到全部完成或下一批预计超出时间预算
+
+        Args:
+            query: 研究兴趣
+            documents: 按融合排名排列的文档文本
+
+        Returns:
+            (文档数,) float32 分数，未在预算内打分的为 NaN
+        """
+        scores = np.full(len(documents), np.nan, dtype=np.float32)
+        if self.budget <= 0 or not documents:
+            return scores
+        model = self.model
+
+        start = time.perf_counter()
+        batch_time = 0.0
+        for offset in range(0, len(documents), self.batch_size):
+            # 以上一批的耗时估计下一批，避免最后一批把总耗时拖出预算太多
+            if time.perf_counter() - start + batch_time > self.budget:
+                break
+            batch_start = time.perf_counter()
+            batch = documents[offset:offset + self.batch_size]
+            scores[offset:offset + len(batch)] = model.predict(
+                [(query, document) for document in batch], batch_size=self.batch_size, show_progress_bar=False)
+            batch_time = time.perf_counter() - batch_start
+        return scores
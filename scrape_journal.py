@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+抓取断点日志 - 追加写入的 JSONL 文件
+每解析完一篇论文就写入一行，中断后重新运行时跳过已完成的 URL，
+全部完成后再压缩为最终的 JSON 文件
+"""
+
+import json
+import os
+from typing import Dict, List
+
+
+class ScrapeJournal:
+    """追加写入的 JSONL 断点日志"""
+
+    def __init__(self, path: str):
+        """
+        初始化日志
+
+        Args:
+            path: JSONL 日志文件路径
+        """
+        self.path = path
+
+    def load(self) -> Dict[str, Dict]:
+        """
+        读取已完成的记录
+
+        崩溃时最后一行可能只写了一半，这样的行会被忽略（对应的 URL 会重新抓取），
+        并补上换行符，保证之后追加的记录从新的一行开始。
+
+        Returns:
+            以 url 为键的记录字典，同一 URL 出现多次时以最后一条为准
+        """
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and record.get('url'):
+                records[record['url']] = record
+
+        if data and not data.endswith(b'\n'):
+            with open(self.path, 'ab') as f:
+                f.write(b'\n')
+
+        return records
+
+    def append(self, record: Dict):
+        """追加一条记录并立即落盘"""
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def compact(self, urls: List[str], output_file: str, remove: bool = True) -> List[Dict]:
+        """
+        将日志压缩为最终的 JSON 文件
+
+        Args:
+            urls: 论文链接，决定输出顺序；日志中不在列表里的记录会被丢弃
+            output_file: 输出 JSON 文件路径
+            remove: 所有 URL 都已完成时是否删除日志，使下一次运行重新抓取
+
+        Returns:
+            按 urls 顺序排列的记录列表
+        """
+        records = self.load()
+        papers = [records[url] for url in dict.fromkeys(urls) if url in records]
+
+        tmp_path = output_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(papers, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, output_file)
+
+        if remove and len(papers) == len(dict.fromkeys(urls)):
+            os.remove(self.path)
+        return papers
+
+    def discard(self):
+        """删除日志，下一次运行从头开始"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
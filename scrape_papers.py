@@ -1,8 +1,18 @@
 import requests
-from bs4 import BeautifulSoup
+import argparse
+import functools
 import json
 import os
-import time  # 添加时间模块用于延时
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fetch_engine import FetchEngine
+from extraction_rules import ExtractionRule, RuleCascade, RuleSet
+from html_backends import BACKENDS, default_backend, parse_document
+from http_cache import HttpCache, cached_get, create_session
+from index_stream import iter_paper_links
+from page_store import PageStore
+from scrape_journal import ScrapeJournal
 
 # --- 配置 ---
 # 包含论文列表的本地 HTML 文件路径
@@ -12,20 +22,36 @@ LOCAL_HTML_FILE = '.\\NDSS Symposium 2025 Accepted Papers - NDSS Symposium.html'
 # 保存提取数据的文件名
 OUTPUT_FILE = 'ndss_papers_2025.json'
 
+# 断点日志：每篇论文解析完成后追加一行，中断后重新运行会跳过其中已有的 URL
+JOURNAL_FILE = 'ndss_papers_2025.jsonl'
+
+# 并发抓取配置：最大同时请求数（实际并发由 AIMD 控制器自适应调整）、
+# 每个主机每秒请求数、允许的突发请求数、可重试错误的最大重试次数
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 2.0
+DEFAULT_RETRIES = 4
+
+# 重试耗尽后仍失败的 URL 列表，便于之后补抓
+FAILED_FILE = 'failed_papers.json'
+
+# 条件 GET 缓存目录（保存 ETag/Last-Modified）
+CACHE_DIR = '.http_cache'
+
+# 原始页面存储目录：所有抓取到的详情页按内容哈希压缩保存，供 --reparse 离线重新解析
+STORE_DIR = '.page_store'
+
+# 提取规则命中统计，决定下次运行时各规则的尝试顺序
+RULE_STATS_FILE = 'extraction_rules_stats.json'
+
+# 使用 User-Agent 伪装成浏览器
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+
 def get_paper_links(html_file_path):
     """解析本地 HTML 文件以查找所有论文详情页面的 URL。"""
-    paper_links = []
     try:
-        with open(html_file_path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f, 'html.parser')
-        
-        # 查找所有 class 为 'paper-link-abs' 的 'a' 标签
-        links = soup.find_all('a', class_='paper-link-abs')
-        for link in links:
-            url = link.get('href')
-            if url:
-                paper_links.append(url)
-        
+        # 流式查找所有 class 为 'paper-link-abs' 的 'a' 标签（已去重）
+        paper_links = list(iter_paper_links([html_file_path]))
         print(f"找到了 {len(paper_links)} 个论文链接。")
         return paper_links
     except FileNotFoundError:
@@ -35,162 +61,401 @@ def get_paper_links(html_file_path):
         print(f"解析 HTML 文件时出错: {e}")
         return []
 
+# 所有详情页请求共享的连接池会话，首次使用时创建
+_session = None
+
+def get_session(pool_size=DEFAULT_CONCURRENCY):
+    """返回共享的 keep-alive 会话。"""
+    global _session
+    if _session is None:
+        _session = create_session(pool_size, HEADERS)
+    return _session
+
+def fetch_page(url, cache=None, store=None):
+    """下载论文详情页面，返回原始 HTML 字节。提供 cache 时使用条件 GET，提供 store 时保存原始页面。请求失败时抛出异常。"""
+    content = cached_get(get_session(), url, cache, timeout=30)
+    # 缓存使用同一个页面存储时，下载的内容已由 HttpCache.put 写入，304 的内容本来就在存储中
+    if store is not None and (cache is None or cache.store is not store):
+        store.put(url, content)
+    return content
+
+# 标题选择器，按顺序尝试
+TITLE_SELECTORS = ['h1.entry-title', 'h1.wp-block-heading', 'h1', 'title',
+                   '.entry-title', '.page-title', '.post-title']
+
+def _paragraph_texts(container):
+    """返回容器内去重后的非空段落文本（嵌套的 <p> 在不同解析器下结构不同，按文本去重）。"""
+    texts = []
+    for p in container.select('p'):
+        text = p.text()
+        if text and text not in texts:
+            texts.append(text)
+    return texts
+
+def _select_text(selector):
+    """生成“取第一个匹配元素的文本”的提取函数。"""
+    def extract(doc, cache):
+        node = doc.select_one(selector)
+        return node.text() if node else None
+    return extract
+
+def _paper_data_texts(doc, cache):
+    """paper-data div 下的段落文本，同一页面的多条规则共享一次查找。"""
+    if 'paper_data' not in cache:
+        paper_data_div = doc.select_one('div.paper-data')
+        cache['paper_data'] = _paragraph_texts(paper_data_div) if paper_data_div else []
+    return cache['paper_data']
+
+def _paper_data_paragraph(n):
+    """生成“取 paper-data 第 n 个段落”的提取函数（第一个通常是作者，第二个是摘要）。"""
+    def extract(doc, cache):
+        texts = _paper_data_texts(doc, cache)
+        return texts[n] if len(texts) > n else None
+    return extract
+
+def _longest_entry_paragraph(doc, cache):
+    """entry-content 中最长的、不像作者信息的段落。"""
+    entry_content = doc.select_one('div.entry-content')
+    if not entry_content:
+        return None
+    longest_text = ""
+    for p in entry_content.select('p'):
+        text = p.text()
+        # 跳过作者信息（通常包含大学名称或简短）
+        if (len(text) > len(longest_text) and 
+            len(text) > 200 and  # 摘要通常比较长
+            'University' not in text[:100] and  # 作者信息通常包含University
+            not any(name in text for name in ['Institute', 'College', 'Ltd', 'Inc', 'Corp'])):
+            longest_text = text
+    return longest_text or None
+
+def _abstract_headings(doc, cache):
+    """包含 "Abstract" 文本的标题元素。"""
+    if 'abstract_headings' not in cache:
+        cache['abstract_headings'] = [heading for heading in doc.select('h2, h3, h4, strong, b')
+                                      if 'abstract' in heading.text().lower()]
+    return cache['abstract_headings']
+
+def _abstract_heading_sibling(doc, cache):
+    """"Abstract" 标题后紧随的段落。"""
+    for heading in _abstract_headings(doc, cache):
+        next_element = heading.next_sibling(('p', 'div'))
+        if next_element:
+            return next_element.text()
+    return None
+
+def _abstract_heading_parent_sibling(doc, cache):
+    """"Abstract" 标题没有兄弟元素时，取其父元素的下一个兄弟。"""
+    for heading in _abstract_headings(doc, cache):
+        parent = heading.parent()
+        next_element = parent.next_sibling(('p', 'div')) if parent else None
+        if next_element:
+            return next_element.text()
+    return None
+
+def build_extraction_rules():
+    """
+    构建标题、作者、摘要的提取规则级联。
+
+    列表顺序是没有统计数据时的初始顺序；标记为兜底的通用规则（裸 h1、title 标签、
+    启发式摘要查找）永远排在特定规则之后，只在特定规则之间按命中率调整顺序。
+    """
+    return RuleSet([
+        RuleCascade('title', [ExtractionRule(selector, _select_text(selector),
+                                             fallback=selector in ('h1', 'title'))
+                              for selector in TITLE_SELECTORS]),
+        RuleCascade('authors', [ExtractionRule('paper-data:p1', _paper_data_paragraph(0))]),
+        RuleCascade('abstract', [
+            ExtractionRule('paper-data:p2', _paper_data_paragraph(1)),
+            ExtractionRule('entry-content:longest-p', _longest_entry_paragraph, fallback=True),
+            ExtractionRule('abstract-heading:sibling', _abstract_heading_sibling, fallback=True),
+            ExtractionRule('abstract-heading:parent-sibling', _abstract_heading_parent_sibling, fallback=True),
+        ]),
+    ])
+
+# 本进程共享的提取规则，运行中自动调整顺序
+EXTRACTION_RULES = build_extraction_rules()
+
+# 未命中时的默认值和打印用的字段名
+FIELD_DEFAULTS = {'title': "未找到标题", 'authors': "未找到作者", 'abstract': "未找到摘要"}
+FIELD_LABELS = {'title': "标题", 'authors': "作者", 'abstract': "摘要"}
+
+def _extract_paper_details(doc, url, verbose, rules):
+    """在已解析的文档上运行提取规则，返回 (论文字典, 级联轨迹, 是否有字段缺失)。"""
+    values, trace = rules.extract(doc)
+    paper = {}
+    for field, default in FIELD_DEFAULTS.items():
+        paper[field] = values.get(field) or default
+        winner = trace[field][1]
+        if verbose and winner:
+            print(f"  找到{FIELD_LABELS[field]}使用规则 {winner}: {paper[field][:50]}...")
+    paper['url'] = url
+    missing = any(values.get(field) is None for field in FIELD_DEFAULTS)
+    return paper, trace, missing
+
+def _parse_with_trace(content, url, verbose, backend, rules):
+    """解析页面并返回 (论文字典, 级联轨迹)，不更新规则统计。"""
+    scoped = backend != 'selectolax'
+    paper, trace, missing = _extract_paper_details(parse_document(content, backend, scoped=scoped),
+                                                   url, verbose, rules)
+    if scoped and missing:
+        paper, trace, _ = _extract_paper_details(parse_document(content, backend), url, verbose, rules)
+    return paper, trace
+
+def parse_paper_details(content, url, verbose=True, backend=None, rules=None):
+    """
+    从详情页面 HTML 中提取标题、作者和摘要（不涉及网络 I/O）。
+
+    默认使用可用后端中最快的一个（selectolax > lxml > html.parser）。BeautifulSoup 后端先只解析
+    标题和 paper-data/entry-content 区域，有字段缺失时再完整解析一次，以便使用全文档的兜底规则。
+    每次解析都会更新 rules（默认为 EXTRACTION_RULES）的命中统计。verbose 为 False 时不打印匹配过程。
+    """
+    backend = backend or default_backend()
+    rules = rules or EXTRACTION_RULES
+    try:
+        paper, trace = _parse_with_trace(content, url, verbose, backend, rules)
+    except Exception as e:
+        print(f"解析 {url} 时出错: {e}")
+        return None
+
+    for notice in rules.record(trace):
+        print(f"⚠️ {notice}")
+    return paper
+
 def fetch_and_parse_paper_details(url):
     """获取论文详情页面并提取标题和摘要。"""
     try:
         print(f"正在获取: {url}")
-        # 使用 User-Agent 伪装成浏览器
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()  # 如果请求失败则抛出异常
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 调试：保存第一个页面的HTML到文件
-        if "a-key-driven-framework" in url:
-            with open('debug_page.html', 'w', encoding='utf-8') as f:
-                f.write(soup.prettify())
-            print("已保存调试页面到 debug_page.html")
-        
-        # --- 尝试多种选择器来查找标题 ---
-        title = "未找到标题"
-        # 尝试不同的标题选择器
-        title_selectors = [
-            ('h1', {'class': 'entry-title'}),
-            ('h1', {'class': 'wp-block-heading'}),
-            ('h1', {}),
-            ('title', {}),
-            ('.entry-title', {}),
-            ('.page-title', {}),
-            ('.post-title', {})
-        ]
-        
-        for tag, attrs in title_selectors:
-            if attrs:
-                title_element = soup.find(tag, attrs)
-            else:
-                title_element = soup.find(tag)
-            if title_element:
-                title = title_element.get_text(strip=True)
-                print(f"  找到标题使用选择器 {tag} {attrs}: {title[:50]}...")
-                break
-        
-        # --- 查找作者信息 ---
-        authors = "未找到作者"
-        paper_data_div = soup.find('div', class_='paper-data')
-        if paper_data_div:
-            # 第一个 p 标签通常是作者信息
-            p_tags = paper_data_div.find_all('p')
-            if len(p_tags) >= 1:
-                first_p = p_tags[0]
-                authors = first_p.get_text(strip=True)
-                print(f"  找到作者: {authors[:50]}...")
-        
-        # --- 查找摘要 ---
-        abstract = "未找到摘要"
-        
-        # 方法1: 查找 paper-data div 下的段落
-        if paper_data_div:
-            # 查找第二个 p 标签（第一个通常是作者信息）
-            p_tags = paper_data_div.find_all('p')
-            if len(p_tags) >= 2:
-                # 获取第二个 p 标签下的第一个 p 标签内容
-                second_p = p_tags[1]
-                inner_p = second_p.find('p')
-                if inner_p:
-                    abstract = inner_p.get_text(strip=True)
-                    print(f"  找到摘要在 paper-data div: {abstract[:50]}...")
-        
-        # 方法2: 如果方法1失败，尝试在 entry-content 中查找较长的段落
-        if abstract == "未找到摘要":
-            entry_content = soup.find('div', class_='entry-content')
-            if entry_content:
-                # 查找所有 p 标签，选择最长的作为摘要
-                all_paragraphs = entry_content.find_all('p')
-                longest_text = ""
-                for p in all_paragraphs:
-                    text = p.get_text(strip=True)
-                    # 跳过作者信息（通常包含大学名称或简短）
-                    if (len(text) > len(longest_text) and 
-                        len(text) > 200 and  # 摘要通常比较长
-                        'University' not in text[:100] and  # 作者信息通常包含University
-                        not any(name in text for name in ['Institute', 'College', 'Ltd', 'Inc', 'Corp'])):
-                        longest_text = text
-                if longest_text:
-                    abstract = longest_text
-                    print(f"  找到摘要在 entry-content (最长段落): {abstract[:50]}...")
-        
-        # 方法3: 如果还没找到，尝试查找包含 "Abstract" 文本的标题
-        if abstract == "未找到摘要":
-            abstract_patterns = ['abstract', 'Abstract', 'ABSTRACT']
-            for pattern in abstract_patterns:
-                abstract_heading = soup.find(['h2', 'h3', 'h4', 'strong', 'b'], string=lambda text: text and pattern in text)
-                if abstract_heading:
-                    # 查找紧随其后的段落
-                    next_element = abstract_heading.find_next_sibling(['p', 'div'])
-                    if next_element:
-                        abstract = next_element.get_text(strip=True)
-                        print(f"  找到摘要使用模式 '{pattern}': {abstract[:50]}...")
-                        break
-                    # 如果没有兄弟元素，尝试父元素的下一个兄弟
-                    parent = abstract_heading.parent
-                    if parent:
-                        next_element = parent.find_next_sibling(['p', 'div'])
-                        if next_element:
-                            abstract = next_element.get_text(strip=True)
-                            print(f"  找到摘要使用父元素方法: {abstract[:50]}...")
-                            break
-
-        return {'title': title, 'authors': authors, 'abstract': abstract, 'url': url}
-        
+        content = fetch_page(url)
     except requests.exceptions.RequestException as e:
         print(f"获取 {url} 时出错: {e}")
         return None
+    return parse_paper_details(content, url)
+
+def print_paper_summary(paper_data):
+    """打印单篇论文的提取结果摘要。"""
+    print(f"  -> 标题: {paper_data['title']}")
+    print(f"  -> 作者: {paper_data['authors'][:50]}...")
+    print(f"  -> 摘要: {paper_data['abstract'][:100]}...")
+    print(f"  -> 链接: {paper_data['url']}")
+    print("-" * 50)
+
+def scrape_papers(paper_urls, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                  max_retries=DEFAULT_RETRIES, failed=None, cache_dir=CACHE_DIR, journal=None,
+                  store_dir=STORE_DIR, backend=None, stats=None, collected=None):
+    """
+    并发抓取并解析所有论文详情页面。
+
+    paper_urls 可以是列表，也可以是 iter_paper_links 这样的流式迭代器：抓取引擎按需读取链接，
+    索引页还没解析完时就开始下载详情页。网络请求在抓取引擎的线程池中进行，
+    解析在当前线程中随结果到达依次完成，返回的列表与 paper_urls 的原始顺序一致。429/5xx/网络错误会自动退避重试，
+    重试耗尽后仍失败或下载成功但解析失败的 URL 追加到 failed 列表（如果提供）中，不会被静默丢弃。
+    cache_dir 不为 None 时启用条件 GET 缓存，未变化的页面只消耗一次 304 响应。
+    提供 journal 时，日志中已有的 URL 直接复用，新解析的记录立即追加到日志中。
+    store_dir 不为 None 时每个抓取到的页面都会保存到内容寻址存储中。
+    backend 指定 HTML 解析后端，默认自动选择。
+    提供 stats 字典时，每次抓取的耗时和解析耗时分别追加到其中的 'fetch_latencies' 和 'parse_times' 列表。
+    提供 collected 列表时，读取到的链接按原始顺序记录在其中（这也是整理结果顺序所用的唯一一份链接列表）。
+    """
+    results = journal.load() if journal is not None else {}
+    ordered_urls = collected if collected is not None else []
+    resumed = 0
+
+    def pending_urls():
+        nonlocal resumed
+        for url in paper_urls:
+            ordered_urls.append(url)
+            if url in results:
+                resumed += 1
+            else:
+                yield url
+
+    get_session(concurrency)
+    store = PageStore(store_dir) if store_dir else None
+    cache = HttpCache(cache_dir, store) if cache_dir else None
+    engine = FetchEngine(functools.partial(fetch_page, cache=cache, store=store), concurrency=concurrency,
+                         rate=rate, burst=burst, max_retries=max_retries)
+    for done, result in enumerate(engine.fetch_all(pending_urls()), 1):
+        print(f"已完成 {done}: {result.url} ({result.elapsed:.2f}s, 第 {result.attempts} 次尝试)")
+        if result.error is not None:
+            print(f"获取 {result.url} 时出错: {result.error}")
+            if failed is not None:
+                failed.append({'url': result.url, 'error': str(result.error), 'attempts': result.attempts})
+            continue
+        parse_start = time.perf_counter()
+        paper_data = parse_paper_details(result.content, result.url, backend=backend)
+        if stats is not None:
+            stats.setdefault('fetch_latencies', []).append(result.elapsed)
+            stats.setdefault('parse_times', []).append(time.perf_counter() - parse_start)
+        if paper_data:
+            results[result.url] = paper_data
+            if journal is not None:
+                journal.append(paper_data)
+            print_paper_summary(paper_data)
+        elif failed is not None:
+            # 下载成功但解析失败的页面同样记入失败列表，之后可以补抓
+            failed.append({'url': result.url, 'error': 'parse failed', 'attempts': result.attempts})
+
+    if resumed:
+        print(f"从断点日志恢复了 {resumed} 篇论文。")
+    print(f"抓取统计: {engine.controller.summary()}")
+    if cache is not None:
+        print(f"缓存统计: {cache.summary()}")
+    return [results[url] for url in dict.fromkeys(ordered_urls) if url in results]
+
+# 每个离线解析进程各自持有一个 PageStore 实例和解析后端名称；
+# 规则顺序从统计文件加载，命中轨迹返回给主进程统一记录
+_worker_store = None
+_worker_backend = None
+
+def _init_reparse_worker(store_dir, backend, rule_stats_file):
+    global _worker_store, _worker_backend
+    _worker_store = PageStore(store_dir)
+    _worker_backend = backend or default_backend()
+    if rule_stats_file:
+        EXTRACTION_RULES.load(rule_stats_file)
+
+def _reparse_page(job):
+    url, digest = job
+    try:
+        content = _worker_store.get(digest)
+        return _parse_with_trace(content, url, False, _worker_backend, EXTRACTION_RULES)
+    except (KeyError, RuntimeError) as e:
+        print(f"读取 {url} 的存储页面时出错: {e}")
     except Exception as e:
         print(f"解析 {url} 时出错: {e}")
-        return None
+    return None, None
+
+def reparse_stored_pages(store_dir=STORE_DIR, paper_urls=None, workers=None, backend=None,
+                         rule_stats_file=None):
+    """
+    离线重新解析已存储的页面（不访问网络）。
+
+    解析在进程池中并行进行。提供 paper_urls 时只解析其中已存储的页面并保持其顺序，
+    否则按存储顺序解析全部页面。各进程的规则命中轨迹汇总到本进程的 EXTRACTION_RULES。
+    """
+    index = PageStore(store_dir).urls()
+    if paper_urls:
+        urls = [url for url in dict.fromkeys(paper_urls) if url in index]
+    else:
+        urls = list(index)
+    jobs = [(url, index[url]) for url in urls]
+
+    print(f"正在离线解析 {len(jobs)} 个已存储页面...")
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_reparse_worker,
+                             initargs=(store_dir, backend, rule_stats_file)) as pool:
+        results = list(pool.map(_reparse_page, jobs, chunksize=16))
+    elapsed = time.perf_counter() - start
+
+    papers = []
+    for paper, trace in results:
+        if paper:
+            papers.append(paper)
+            for notice in EXTRACTION_RULES.record(trace):
+                print(f"⚠️ {notice}")
+    print(f"离线解析完成: {len(papers)}/{len(jobs)} 篇, 用时 {elapsed:.2f}s")
+    return papers
+
+def save_rule_stats():
+    """打印提取规则的命中统计并保存，供下次运行决定规则顺序。"""
+    print("提取规则命中统计:")
+    print(EXTRACTION_RULES.report())
+    EXTRACTION_RULES.save(RULE_STATS_FILE)
+
+def parse_args():
+    """解析命令行参数。"""
+    parser = argparse.ArgumentParser(description="抓取 NDSS 2025 论文标题、作者和摘要")
+    parser.add_argument('--index', nargs='+', default=[LOCAL_HTML_FILE],
+                        help="一个或多个论文索引页（本地文件或 URL），按顺序流式解析并去重 (默认本地 NDSS 2025 页面)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"最大同时请求数，实际并发在此范围内自适应调整 (默认 {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help=f"每个主机每秒最多请求数，<= 0 表示不限速 (默认 {DEFAULT_RATE})")
+    parser.add_argument('--burst', type=float, default=DEFAULT_BURST,
+                        help=f"每个主机允许的突发请求数 (默认 {DEFAULT_BURST})")
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help=f"429/5xx/网络错误的最大重试次数 (默认 {DEFAULT_RETRIES})")
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                        help=f"条件 GET 缓存目录 (默认 {CACHE_DIR})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="禁用缓存，总是完整下载页面")
+    parser.add_argument('--journal', default=JOURNAL_FILE,
+                        help=f"断点日志文件 (默认 {JOURNAL_FILE})")
+    parser.add_argument('--fresh', action='store_true',
+                        help="忽略已有的断点日志，从头开始抓取")
+    parser.add_argument('--store-dir', default=STORE_DIR,
+                        help=f"原始页面存储目录 (默认 {STORE_DIR})")
+    parser.add_argument('--reparse', action='store_true',
+                        help="不访问网络，用当前解析规则重新解析已存储的全部页面")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="--reparse 模式使用的进程数 (默认 CPU 核数)")
+    parser.add_argument('--parser', choices=BACKENDS, default=None,
+                        help="HTML 解析后端 (默认自动选择可用的最快后端)")
+    return parser.parse_args()
 
 def main():
     """主函数，用于编排抓取过程。"""
+    args = parse_args()
+    EXTRACTION_RULES.load(RULE_STATS_FILE)
+
+    if args.reparse:
+        # 有本地索引页时按其链接顺序输出，否则按存储顺序
+        local_indexes = [path for path in args.index if os.path.exists(path)]
+        paper_urls = list(iter_paper_links(local_indexes)) if local_indexes else None
+        all_papers_data = reparse_stored_pages(args.store_dir, paper_urls, args.workers, args.parser,
+                                               RULE_STATS_FILE)
+        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+            json.dump(all_papers_data, f, indent=4, ensure_ascii=False)
+        print(f"结果已保存到 '{OUTPUT_FILE}'。")
+        save_rule_stats()
+        return
+
     # 检查本地 HTML 文件是否存在
-    if not os.path.exists(LOCAL_HTML_FILE):
-        print(f"未在以下路径找到输入文件: {LOCAL_HTML_FILE}")
-        print("请确保文件路径正确。")
+    for source in args.index:
+        if not source.startswith(('http://', 'https://')) and not os.path.exists(source):
+            print(f"未在以下路径找到输入文件: {source}")
+            print("请确保文件路径正确。")
+            return
+
+    # 链接边解析边交给抓取引擎，scrape_papers 同时按出现顺序记录在 paper_urls 中
+    paper_urls = []
+    link_stream = iter_paper_links(args.index, session=get_session(args.concurrency))
+
+    # 只处理前10篇论文进行调试
+    # link_stream = itertools.islice(link_stream, 10)
+
+    journal = ScrapeJournal(args.journal)
+    if args.fresh:
+        journal.discard()
+
+    failed = []
+    try:
+        scrape_papers(link_stream, args.concurrency, args.rate, args.burst, args.retries, failed,
+                      cache_dir=None if args.no_cache else args.cache_dir, journal=journal,
+                      store_dir=args.store_dir, backend=args.parser, collected=paper_urls)
+    except KeyboardInterrupt:
+        print(f"\n抓取已中断，进度保存在 '{args.journal}' 中，重新运行即可继续。")
+        save_rule_stats()
         return
+    save_rule_stats()
 
-    paper_urls = get_paper_links(LOCAL_HTML_FILE)
-    
+    print(f"索引页中共找到 {len(paper_urls)} 个论文链接。")
     if not paper_urls:
         print("没有找到论文链接，脚本退出。")
         return
-        
-    all_papers_data = []
-
-    # 只处理前10篇论文进行调试
-    # paper_urls = paper_urls[:10]
 
-    for i, url in enumerate(paper_urls):
-        print(f"正在处理第 {i+1}/{len(paper_urls)} 篇论文")
-        paper_data = fetch_and_parse_paper_details(url)
-        if paper_data:
-            all_papers_data.append(paper_data)
-            print(f"  -> 标题: {paper_data['title']}")
-            print(f"  -> 作者: {paper_data['authors'][:50]}...")
-            print(f"  -> 摘要: {paper_data['abstract'][:100]}...")
-            print(f"  -> 链接: {paper_data['url']}")
-            print("-" * 50)
-        
-        # 添加延时避免请求过快
-        if i < len(paper_urls) - 1:  # 最后一次不需要延时
-            time.sleep(2)  # 每次请求间隔2秒
-
-    # 将数据保存到 JSON 文件
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(all_papers_data, f, indent=4, ensure_ascii=False)
+    # 将断点日志压缩为最终的 JSON 文件（全部完成时删除日志）
+    all_papers_data = journal.compact(paper_urls, OUTPUT_FILE)
         
     print(f"\n成功提取了 {len(all_papers_data)} 篇论文的数据。")
     print(f"结果已保存到 '{OUTPUT_FILE}'。")
 
+    if failed:
+        with open(FAILED_FILE, 'w', encoding='utf-8') as f:
+            json.dump(failed, f, indent=4, ensure_ascii=False)
+        print(f"有 {len(failed)} 篇论文在重试后仍然抓取失败或无法解析，列表已保存到 '{FAILED_FILE}'。")
+
 if __name__ == '__main__':
     print("开始运行 NDSS 2025 论文抓取脚本。")
     print("本脚本将获取每篇论文的标题和摘要。")
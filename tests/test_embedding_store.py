@@ -0,0 +1,37 @@
+"""EmbeddingStore 的崩溃恢复"""
+
+import numpy as np
+
+from embedding_store import EmbeddingStore
+
+
+def test_add_after_crash_between_data_and_keys(tmp_path):
+    store = EmbeddingStore(str(tmp_path), 'model')
+    store.add(['a', 'b'], np.eye(4, dtype=np.float32)[:2])
+
+    # 模拟崩溃：数据行已写入 embeddings.f32，键还没写入 keys.txt
+    with open(store.data_path, 'ab') as f:
+        f.write(np.eye(4, dtype=np.float32)[2].tobytes())
+
+    store = EmbeddingStore(str(tmp_path), 'model')
+    assert len(store) == 2
+    store.add(['c'], np.eye(4, dtype=np.float32)[3:])
+
+    reopened = EmbeddingStore(str(tmp_path), 'model')
+    for current in (store, reopened):
+        np.testing.assert_array_equal(current.matrix[current.rows(['a', 'b', 'c'])],
+                                      np.eye(4, dtype=np.float32)[[0, 1, 3]])
+
+
+def test_extra_keys_are_dropped_on_load(tmp_path):
+    store = EmbeddingStore(str(tmp_path), 'model')
+    store.add(['a'], np.eye(4, dtype=np.float32)[:1])
+    with open(store.keys_path, 'a', encoding='utf-8') as f:
+        f.write('orphan\n')
+
+    store = EmbeddingStore(str(tmp_path), 'model')
+    store.add(['b'], np.eye(4, dtype=np.float32)[1:2])
+
+    reopened = EmbeddingStore(str(tmp_path), 'model')
+    assert 'orphan' not in reopened
+    np.testing.assert_array_equal(reopened.matrix[reopened.rows(['a', 'b'])], np.eye(4, dtype=np.float32)[:2])
@@ -0,0 +1,56 @@
+"""增量模式只为新增和修改的论文计算规则分数"""
+
+import json
+import os
+
+import numpy as np
+
+from keyword_matcher import KeywordMatcher
+from paper_filter import PaperFilter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_papers(path, papers):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(papers, f, ensure_ascii=False)
+
+
+def count_scored(monkeypatch):
+    """统计被规则打分的论文数（每篇论文的标题和摘要各匹配一次）"""
+    calls = []
+    find_ids = KeywordMatcher.find_ids
+    monkeypatch.setattr(KeywordMatcher, 'find_ids', lambda self, text: calls.append(text) or find_ids(self, text))
+    return lambda: len(calls) // 2
+
+
+def incremental_run(corpus_file):
+    """与 main() 中 --incremental 相同的加载流程"""
+    filter_system = PaperFilter(cache_dir=None)
+    papers = filter_system.stream_corpus(corpus_file, encode=False, score_rules=False)
+    filter_system.update_corpus(papers)
+    return filter_system, papers
+
+
+def test_incremental_scores_only_changed_papers(tmp_path, monkeypatch):
+    with open(os.path.join(ROOT, 'ndss_papers_2025.json'), 'r', encoding='utf-8') as f:
+        papers = json.load(f)[:20]
+    corpus_file = str(tmp_path / 'papers.json')
+    write_papers(corpus_file, papers)
+    scored = count_scored(monkeypatch)
+
+    incremental_run(corpus_file)
+    assert scored() == 20
+
+    papers[3] = dict(papers[3], abstract=papers[3]['abstract'] + ' zero-knowledge proof')
+    papers[7] = dict(papers[7], title=papers[7]['title'] + ' (extended)')
+    papers.append({'title': 'A new paper on fuzzing', 'authors': '', 'abstract': 'fuzzing', 'url': 'new'})
+    write_papers(corpus_file, papers)
+
+    before = scored()
+    filter_system, table = incremental_run(corpus_file)
+    assert scored() - before == 3
+
+    # 复用的分数与完整重算一致
+    full = PaperFilter(cache_dir=None).rule_scores(table)
+    np.testing.assert_array_equal(filter_system.rule_scores(table), full)
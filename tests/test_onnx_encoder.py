@@ -0,0 +1,47 @@
+"""ONNX 编码器与 PyTorch SentenceTransformer 的嵌入在容差内一致
+
+需要 onnxruntime、tokenizers、torch 和 sentence-transformers；模型默认为 paraphrase-MiniLM-L6-v2，
+可用环境变量 ONNX_TEST_MODEL 指定其他模型名或本地路径，模型无法加载时跳过。
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('onnxruntime')
+pytest.importorskip('tokenizers')
+pytest.importorskip('torch')
+sentence_transformers = pytest.importorskip('sentence_transformers')
+
+from onnx_encoder import FP32_MAX_ABS_DIFF, INT8_MIN_COSINE, OnnxEncoder, export_onnx  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL = os.environ.get('ONNX_TEST_MODEL', 'paraphrase-MiniLM-L6-v2')
+
+
+@pytest.fixture(scope='module')
+def exported(tmp_path_factory):
+    """(PyTorch 参考嵌入, 导出目录, 文本)"""
+    try:
+        model = sentence_transformers.SentenceTransformer(MODEL, device='cpu')
+    except Exception as e:  # 没有网络或模型不存在
+        pytest.skip(f"无法加载模型 {MODEL}: {e}")
+    with open(os.path.join(ROOT, 'ndss_papers_2025.json'), 'r', encoding='utf-8') as f:
+        texts = [paper.get('abstract', '') for paper in json.load(f)][:16] + ["short", ""]
+    reference = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+    model_dir = export_onnx(MODEL, str(tmp_path_factory.mktemp('onnx')), int8=True)
+    return reference, model_dir, texts
+
+
+def test_float32_matches_torch(exported):
+    reference, model_dir, texts = exported
+    embeddings = OnnxEncoder(model_dir).encode(texts, batch_size=4)
+    assert np.abs(embeddings - reference).max() <= FP32_MAX_ABS_DIFF
+
+
+def test_int8_matches_torch_direction(exported):
+    reference, model_dir, texts = exported
+    embeddings = OnnxEncoder(model_dir, int8=True).encode(texts, batch_size=4)
+    assert (embeddings * reference).sum(axis=1).min() >= INT8_MIN_COSINE